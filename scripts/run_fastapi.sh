@@ -6,6 +6,8 @@ echo "Starting API..."
 UVICORN_ARGS=(
     "--host" "${APP_HTTP_HOST:=0.0.0.0}"
     "--port" "${APP_HTTP_PORT:=80}"
+    "--loop" "uvloop"
+    "--http" "httptools"
 )
 
 if [ "${APP_DEV_MODE:-false}" = "true" ]; then
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
 import urllib.parse
 from abc import ABC
 from abc import abstractmethod
 from collections.abc import AsyncGenerator
+from collections.abc import Awaitable
+from collections.abc import Callable
 from collections.abc import Mapping
 from typing import Any
 from typing import Protocol
@@ -14,6 +17,8 @@ from databases import DatabaseURL
 from databases.core import Connection
 from databases.core import Transaction
 from databases.interfaces import Record
+from sqlalchemy import TextClause
+from sqlalchemy import text
 
 from soumetsu_api import settings
 from soumetsu_api.utilities import logging
@@ -21,9 +26,12 @@ from soumetsu_api.utilities import logging
 type MySQLValue = Any
 type MySQLRow = Mapping[str, MySQLValue]
 type MySQLValues = dict[str, MySQLValue]
+type AfterCommitCallback = Callable[[], Awaitable[None]]
 
 logger = logging.get_logger(__name__)
 
+STATEMENT_CACHE_SIZE = 2048
+
 
 # Databases 0.5.0 broke mapping access, raising a silent DeprecationWarning.
 # This kills CPU, so we workaround it by accessing a direct mapping.
@@ -37,26 +45,29 @@ def _mapping_list(records: list[Record]) -> list[MySQLRow]:
     return [record._mapping for record in records]  # noqa: SLF001
 
 
+# Databases parses every query string into a SQLAlchemy `text()` clause on each
+# call, scanning it for bind parameters. Our queries are static strings, so the
+# parsed clause is cached per query and only the values are bound per call.
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _parse_statement(query: str) -> TextClause:
+    return text(query)
+
+
+def _prepare(query: str, values: MySQLValues | None) -> TextClause:
+    statement = _parse_statement(query)
+    if values is None:
+        return statement
+    return statement.bindparams(**values)
+
+
 class _MySQLQueryableProtocol(Protocol):
     """A protocol defining a queryable MySQL source."""
 
-    async def execute(self, query: str, values: MySQLValues | None = None) -> Any: ...
-    async def fetch_one(
-        self,
-        query: str,
-        values: MySQLValues | None = None,
-    ) -> Record | None: ...
-    async def fetch_all(
-        self,
-        query: str,
-        values: MySQLValues | None = None,
-    ) -> list[Record]: ...
-    async def fetch_val(self, query: str, values: MySQLValues | None = None) -> Any: ...
-    async def iterate(
-        self,
-        query: str,
-        values: MySQLValues | None = None,
-    ) -> AsyncGenerator[Mapping, None]: ...
+    async def execute(self, query: TextClause) -> Any: ...
+    async def fetch_one(self, query: TextClause) -> Record | None: ...
+    async def fetch_all(self, query: TextClause) -> list[Record]: ...
+    async def fetch_val(self, query: TextClause) -> Any: ...
+    def iterate(self, query: TextClause) -> AsyncGenerator[Mapping, None]: ...
 
 
 class ImplementsMySQL(ABC):
@@ -71,7 +82,7 @@ class ImplementsMySQL(ABC):
         query: str,
         values: MySQLValues | None = None,
     ) -> MySQLRow | None:
-        res = await self._connection.fetch_one(query, values)
+        res = await self._connection.fetch_one(_prepare(query, values))
         return _mapping(res)
 
     async def fetch_all(
@@ -79,7 +90,7 @@ class ImplementsMySQL(ABC):
         query: str,
         values: MySQLValues | None = None,
     ) -> list[MySQLRow]:
-        res = await self._connection.fetch_all(query, values)
+        res = await self._connection.fetch_all(_prepare(query, values))
         return _mapping_list(res)
 
     async def fetch_val(
@@ -87,26 +98,49 @@ class ImplementsMySQL(ABC):
         query: str,
         values: MySQLValues | None = None,
     ) -> Any:
-        res = await self._connection.fetch_val(query, values)
+        res = await self._connection.fetch_val(_prepare(query, values))
         return res
 
     async def execute(self, query: str, values: MySQLValues | None = None) -> Any:
-        return await self._connection.execute(query, values)
+        return await self._connection.execute(_prepare(query, values))
 
     def iterate(
         self,
         query: str,
         values: MySQLValues | None = None,
     ) -> AsyncGenerator[MySQLRow, None]:
-        return self._connection.iterate(query, values)  # type: ignore
+        return self._connection.iterate(_prepare(query, values))  # type: ignore
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether queries run inside an open transaction, and so may read writes
+        that other connections can't see yet."""
+        return False
+
+    async def after_commit(self, callback: AfterCommitCallback) -> None:
+        """Runs `callback` once the current transaction commits. Outside of a
+        transaction every query is already committed, so it runs straight away."""
+        await callback()
 
 
 class MySQLPoolAdapter(ImplementsMySQL):
     """A pool of MySQL connections that can be used to execute queries or
     transactions."""
 
-    def __init__(self, database_url: DatabaseURL) -> None:
-        self._pool = Database(database_url)
+    def __init__(
+        self,
+        database_url: DatabaseURL,
+        *,
+        min_size: int,
+        max_size: int,
+        pool_recycle: int,
+    ) -> None:
+        self._pool = Database(
+            database_url,
+            min_size=min_size,
+            max_size=max_size,
+            pool_recycle=pool_recycle,
+        )
 
     @property
     @override
@@ -121,21 +155,55 @@ class MySQLPoolAdapter(ImplementsMySQL):
     async def disconnect(self) -> None:
         await self._pool.disconnect()
 
+    def connection(self) -> MySQLConnection:
+        return MySQLConnection(self._pool)
+
     def transaction(self) -> MySQLTransaction:
         return MySQLTransaction(self._pool)
 
 
+class MySQLConnection(ImplementsMySQL):
+    """A single connection acquired from the pool and held until exit, so that
+    every query issued within the block reuses it rather than going back to the
+    pool."""
+
+    __slots__ = ("_backend_pool", "_current_connection")
+
+    def __init__(self, backend_pool: Database) -> None:
+        self._backend_pool: Database = backend_pool
+        self._current_connection: Connection | None = None
+
+    async def __aenter__(self) -> MySQLConnection:
+        self._current_connection = await self._backend_pool.connection().__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        if self._current_connection is not None:
+            await self._current_connection.__aexit__(*args)
+
+    @property
+    @override
+    def _connection(self) -> _MySQLQueryableProtocol:
+        return self._current_connection  # type: ignore
+
+
 class MySQLTransaction(ImplementsMySQL):
     """A wrapper around a transaction that implements the same interface as
     `MySQLService`."""
 
     # Slots are justified due to the frequency of initialisation.
-    __slots__ = ("_backend_pool", "_current_connection", "_transaction")
+    __slots__ = (
+        "_after_commit",
+        "_backend_pool",
+        "_current_connection",
+        "_transaction",
+    )
 
     def __init__(self, backend_pool: Database) -> None:
         self._backend_pool: Database = backend_pool
         self._current_connection: Connection | None = None
         self._transaction: Transaction | None = None
+        self._after_commit: list[AfterCommitCallback] = []
 
     async def __aenter__(self) -> MySQLTransaction:
         self._current_connection = await self._backend_pool.connection().__aenter__()
@@ -150,20 +218,30 @@ class MySQLTransaction(ImplementsMySQL):
         if self._current_connection is not None:
             await self._current_connection.__aexit__(*args)
 
+        # Callbacks only run once the commit has gone through, so caches aren't
+        # dropped before other connections can see the write, nor for rollbacks.
+        callbacks, self._after_commit = self._after_commit, []
+        if args[0] is None:
+            for callback in callbacks:
+                await callback()
+
     @property
     @override
     def _connection(self) -> _MySQLQueryableProtocol:
         # assert self._current_connection is not None
         return self._current_connection  # type: ignore
 
+    @property
+    @override
+    def in_transaction(self) -> bool:
+        return True
+
+    @override
+    async def after_commit(self, callback: AfterCommitCallback) -> None:
+        self._after_commit.append(callback)
 
-def default() -> ImplementsMySQL:
-    """Creates a default configuration for the MySQL adapter using the `settings` module.
-    It is provided as a convenience function to avoid repeating the initialisation code.
 
-    Note:
-        The connection still has to be initialised by calling `connect()` on the returned instance.
-    """
+def _database_url(host: str) -> DatabaseURL:
     try:
         import asyncmy  # noqa: F401 # type: ignore[import]
 
@@ -173,16 +251,48 @@ def default() -> ImplementsMySQL:
         logger.debug("Using Databases' default MySQL driver.")
         protocol = "mysql"
 
-    database_url = DatabaseURL(
+    return DatabaseURL(
         "{protocol}://{username}:{password}@{host}:{port}/{db}".format(
             protocol=protocol,
             username=settings.MYSQL_USER,
             password=urllib.parse.quote(settings.MYSQL_PASSWORD),
-            host=settings.MYSQL_HOST,
+            host=host,
             port=settings.MYSQL_TCP_PORT,
             db=settings.MYSQL_DATABASE,
         ),
     )
 
-    mysql = MySQLPoolAdapter(database_url)
+
+def default() -> ImplementsMySQL:
+    """Creates a default configuration for the MySQL adapter using the `settings` module.
+    It is provided as a convenience function to avoid repeating the initialisation code.
+
+    Note:
+        The connection still has to be initialised by calling `connect()` on the returned instance.
+    """
+    mysql = MySQLPoolAdapter(
+        _database_url(settings.MYSQL_HOST),
+        min_size=settings.MYSQL_POOL_MIN_SIZE,
+        max_size=settings.MYSQL_POOL_MAX_SIZE,
+        pool_recycle=settings.MYSQL_POOL_RECYCLE,
+    )
     return mysql
+
+
+def read_only() -> MySQLPoolAdapter | None:
+    """Creates the optional pool used for heavy read-only listings, so they don't
+    hold up writes waiting on the main pool. Returns `None` when no read host is
+    configured, in which case the main pool should be used.
+
+    Note:
+        The connection still has to be initialised by calling `connect()` on the returned instance.
+    """
+    if not settings.MYSQL_READ_HOST:
+        return None
+
+    return MySQLPoolAdapter(
+        _database_url(settings.MYSQL_READ_HOST),
+        min_size=settings.MYSQL_READ_POOL_MIN_SIZE,
+        max_size=settings.MYSQL_READ_POOL_MAX_SIZE,
+        pool_recycle=settings.MYSQL_POOL_RECYCLE,
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
 from collections.abc import Awaitable
 from collections.abc import Callable
@@ -8,6 +9,7 @@ from fastapi import APIRouter
 from fastapi import FastAPI
 from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
 from fastapi_limiter import FastAPILimiter
 from starlette.responses import Response
 
@@ -18,7 +20,9 @@ from soumetsu_api.adapters import storage
 from soumetsu_api.utilities import logging
 
 from . import v2
+from .v2.response import ORJSONResponse
 from .v2.response import ServiceInterruptionException
+from .v2.response import warm_up
 
 logger = logging.get_logger(__name__)
 
@@ -28,8 +32,10 @@ def create_app() -> FastAPI:
         docs_url="/api/v2/docs",
         redoc_url="/api/v2/redoc",
         openapi_url="/api/v2/openapi.json",
+        default_response_class=ORJSONResponse,
     )
 
+    initialise_event_loop(app)
     initialise_cors(app)
     initialise_mysql(app)
     initialise_redis(app)
@@ -39,11 +45,23 @@ def create_app() -> FastAPI:
     initialise_rate_limiting(app)
 
     create_routes(app)
+    initialise_response_models(app)
 
     logger.debug("Finalised app instance.")
     return app
 
 
+def initialise_event_loop(app: FastAPI) -> None:
+    # The loop is picked by uvicorn, so log what it actually chose to make a
+    # missing uvloop visible.
+    @app.on_event("startup")
+    async def on_startup() -> None:
+        logger.info(
+            "Serving on the running event loop.",
+            extra={"event_loop": type(asyncio.get_running_loop()).__name__},
+        )
+
+
 def initialise_cors(app: FastAPI) -> None:
     if not settings.CORS_ALLOWED_ORIGINS:
         logger.debug("CORS not configured - no allowed origins specified.")
@@ -73,15 +91,32 @@ def create_routes(app: FastAPI) -> None:
     logger.debug("Attached routers to the app instance.")
 
 
+def initialise_response_models(app: FastAPI) -> None:
+    # Response schemas are otherwise built by whichever request first needs them.
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+
+        warm_up(route.response_model)
+        for documented in route.responses.values():
+            warm_up(documented.get("model"))
+
+    logger.debug("Built response model serialisers for app instance.")
+
+
 def initialise_mysql(app: FastAPI) -> None:
     database = mysql.default()
+    read_database = mysql.read_only()
 
     app.state.mysql = database
+    app.state.mysql_read = read_database or database
 
     # Lifecycle management
     @app.on_event("startup")
     async def on_startup() -> None:
         await app.state.mysql.connect()
+        if read_database is not None:
+            await read_database.connect()
         logger.info(
             "Connected to the MySQL database.",
         )
@@ -89,6 +124,8 @@ def initialise_mysql(app: FastAPI) -> None:
     @app.on_event("shutdown")
     async def on_shutdown() -> None:
         await app.state.mysql.disconnect()
+        if read_database is not None:
+            await read_database.disconnect()
 
     logger.debug(
         "Attached MySQL to the app instance.",
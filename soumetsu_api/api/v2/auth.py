@@ -10,6 +10,7 @@ from soumetsu_api.adapters import hcaptcha
 from soumetsu_api.api.v2 import response
 from soumetsu_api.api.v2.context import RequiresAuth
 from soumetsu_api.api.v2.context import RequiresContext
+from soumetsu_api.api.v2.context import RequiresTransaction
 from soumetsu_api.services import auth
 from soumetsu_api.services.auth import AuthError
 
@@ -95,7 +96,7 @@ async def logout(ctx: RequiresAuth) -> Response:
 @router.post("/register", response_model=response.BaseResponse[RegisterResponse])
 async def register(
     request: Request,
-    ctx: RequiresContext,
+    ctx: RequiresTransaction,
     body: RegisterRequest,
 ) -> Response:
     if body.captcha:
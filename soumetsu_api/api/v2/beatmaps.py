@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pydantic_core
 from fastapi import APIRouter
 from fastapi import Query
 from fastapi import Response
@@ -9,15 +10,29 @@ from soumetsu_api.api.v2 import response
 from soumetsu_api.api.v2.context import OptionalAuth
 from soumetsu_api.api.v2.context import RequiresAuth
 from soumetsu_api.api.v2.context import RequiresContext
+from soumetsu_api.api.v2.context import RequiresReadContext
 from soumetsu_api.constants import CustomMode
 from soumetsu_api.constants import GameMode
 from soumetsu_api.services import beatmaps
+from soumetsu_api.utilities.cache import AsyncTTLCache
 from soumetsu_api.utilities.mods import Mod
 from soumetsu_api.utilities.mods import mods_from_score
 
+POPULAR_CACHE_TTL = 60
+
 router = APIRouter(prefix="/beatmaps")
 
+# Popular listings sort every ranked beatmap by playcount, which barely changes
+# from one minute to the next, so the serialised pages are shared across
+# requests for a short while.
+_popular_cache = AsyncTTLCache[
+    tuple[int | None, int, int, tuple[int, int] | None],
+    bytes,
+](ttl=POPULAR_CACHE_TTL)
+
 
+# Service results mirror this model field for field, so they are serialised as
+# they are rather than copied into it first. The model documents the schema.
 class BeatmapResponse(BaseModel):
     beatmap_id: int
     beatmapset_id: int
@@ -70,57 +85,76 @@ class ScoreResponse(BaseModel):
     player: ScorePlayerResponse
 
 
-def _to_response(b: beatmaps.BeatmapResult) -> BeatmapResponse:
-    return BeatmapResponse(
-        beatmap_id=b.beatmap_id,
-        beatmapset_id=b.beatmapset_id,
-        beatmap_md5=b.beatmap_md5,
-        song_name=b.song_name,
-        ar=b.ar,
-        od=b.od,
-        mode=b.mode,
-        difficulty_std=b.difficulty_std,
-        difficulty_taiko=b.difficulty_taiko,
-        difficulty_ctb=b.difficulty_ctb,
-        difficulty_mania=b.difficulty_mania,
-        max_combo=b.max_combo,
-        hit_length=b.hit_length,
-        bpm=b.bpm,
-        playcount=b.playcount,
-        passcount=b.passcount,
-        ranked=b.ranked,
-        updated_at=b.updated_at,
-        ranked_status_frozen=b.ranked_status_frozen,
-        mapper_id=b.mapper_id,
-    )
+# Listings may continue from the playcount and id of the last beatmap a client
+# received, in which case `page` is ignored.
+def _cursor(
+    after_playcount: int | None,
+    after_id: int | None,
+) -> tuple[int, int] | None:
+    if after_playcount is None or after_id is None:
+        return None
+    return after_playcount, after_id
+
+
+# Beatmap scores may continue from the pp and id of the last score a client
+# received, in which case `page` is ignored.
+def _score_cursor(
+    after_pp: float | None,
+    after_score_id: int | None,
+) -> tuple[float, int] | None:
+    if after_pp is None or after_score_id is None:
+        return None
+    return after_pp, after_score_id
 
 
 @router.get("/", response_model=response.BaseResponse[list[BeatmapResponse]])
 async def search_beatmaps(
-    ctx: RequiresContext,
+    ctx: RequiresReadContext,
     q: str | None = Query(None),
-    mode: int | None = Query(None, ge=0, le=3),
+    mode: GameMode | None = Query(None),
     status: int | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    after_playcount: int | None = Query(None),
+    after_id: int | None = Query(None),
 ) -> Response:
-    result = await beatmaps.search_beatmaps(ctx, q, mode, status, page, limit)
+    result = await beatmaps.search_beatmaps(
+        ctx,
+        q,
+        mode,
+        status,
+        page,
+        limit,
+        _cursor(after_playcount, after_id),
+    )
     result = response.unwrap(result)
 
-    return response.create([_to_response(b) for b in result])
+    return response.create(result)
 
 
-@router.get("/popular", response_model=response.BaseResponse[list[BeatmapResponse]])
+@router.get(
+    "/popular",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[BeatmapResponse]]}},
+)
 async def get_popular(
-    ctx: RequiresContext,
-    mode: int | None = Query(None, ge=0, le=3),
+    ctx: RequiresReadContext,
+    mode: GameMode | None = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    after_playcount: int | None = Query(None),
+    after_id: int | None = Query(None),
 ) -> Response:
-    result = await beatmaps.get_popular(ctx, mode, page, limit)
-    result = response.unwrap(result)
+    cursor = _cursor(after_playcount, after_id)
+
+    async def load() -> bytes:
+        result = await beatmaps.get_popular(ctx, mode, page, limit, cursor)
+        result = response.unwrap(result)
+
+        return pydantic_core.to_json(result)
 
-    return response.create([_to_response(b) for b in result])
+    payload = await _popular_cache.get_or_load((mode, page, limit, cursor), load)
+    return response.create_raw(payload)
 
 
 @router.get("/lookup", response_model=response.BaseResponse[BeatmapResponse])
@@ -131,7 +165,7 @@ async def lookup_beatmap(
     result = await beatmaps.get_beatmap_by_md5(ctx, md5)
     result = response.unwrap(result)
 
-    return response.create(_to_response(result))
+    return response.create(result)
 
 
 class RankRequestStatusResponse(BaseModel):
@@ -296,7 +330,7 @@ async def get_beatmapset(
     result = await beatmaps.get_beatmapset(ctx, beatmapset_id)
     result = response.unwrap(result)
 
-    return response.create([_to_response(b) for b in result])
+    return response.create(result)
 
 
 @router.get("/{beatmap_id}", response_model=response.BaseResponse[BeatmapResponse])
@@ -307,7 +341,7 @@ async def get_beatmap(
     result = await beatmaps.get_beatmap(ctx, beatmap_id)
     result = response.unwrap(result)
 
-    return response.create(_to_response(result))
+    return response.create(result)
 
 
 @router.get(
@@ -321,6 +355,8 @@ async def get_beatmap_scores(
     custom_mode: CustomMode = Query(CustomMode.VANILLA),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    after_pp: float | None = Query(None),
+    after_score_id: int | None = Query(None),
 ) -> Response:
     beatmap = await beatmaps.get_beatmap(ctx, beatmap_id)
     beatmap = response.unwrap(beatmap)
@@ -335,6 +371,7 @@ async def get_beatmap_scores(
         custom_mode,
         limit,
         offset,
+        _score_cursor(after_pp, after_score_id),
     )
 
     return response.create(
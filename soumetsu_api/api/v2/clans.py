@@ -7,10 +7,12 @@ from fastapi import UploadFile
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from soumetsu_api import settings
 from soumetsu_api.api.v2 import response
 from soumetsu_api.api.v2.context import RequiresAuth
 from soumetsu_api.api.v2.context import RequiresAuthTransaction
 from soumetsu_api.api.v2.context import RequiresContext
+from soumetsu_api.api.v2.uploads import read_upload
 from soumetsu_api.constants import CustomMode
 from soumetsu_api.constants import GameMode
 from soumetsu_api.services import clans
@@ -348,7 +350,7 @@ async def upload_clan_icon(
     clan_id: int,
     file: UploadFile,
 ) -> Response:
-    image_data = await file.read()
+    image_data = await read_upload(file, settings.MAX_CLAN_ICON_SIZE)
 
     result = await clans.upload_clan_icon(ctx, ctx.user_id, clan_id, image_data)
     result = response.unwrap(result)
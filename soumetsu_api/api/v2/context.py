@@ -30,13 +30,14 @@ from soumetsu_api.services import AbstractContext
 
 
 class HTTPContext(AbstractContext):
-    def __init__(self, request: Request) -> None:
+    def __init__(self, request: Request, mysql: ImplementsMySQL) -> None:
         self.request = request
+        self._mysql_conn = mysql
 
     @property
     @override
     def _mysql(self) -> ImplementsMySQL:
-        return self.request.app.state.mysql
+        return self._mysql_conn
 
     @property
     @override
@@ -77,14 +78,24 @@ class HTTPTransactionContext(AbstractContext):
 
 
 class OptionalAuthContext(HTTPContext):
-    def __init__(self, request: Request, session: SessionData | None) -> None:
-        super().__init__(request)
+    def __init__(
+        self,
+        request: Request,
+        mysql: ImplementsMySQL,
+        session: SessionData | None,
+    ) -> None:
+        super().__init__(request, mysql)
         self.session = session
 
 
 class AuthenticatedContext(HTTPContext):
-    def __init__(self, request: Request, session: SessionData) -> None:
-        super().__init__(request)
+    def __init__(
+        self,
+        request: Request,
+        mysql: ImplementsMySQL,
+        session: SessionData,
+    ) -> None:
+        super().__init__(request, mysql)
         self.session = session
         self.user_id = session.user_id
         self.privileges = session.privileges
@@ -104,6 +115,24 @@ class AuthenticatedTransactionContext(HTTPTransactionContext):
         self.privileges = session.privileges
 
 
+# Each request holds exactly one pooled connection for its lifetime, acquired
+# here at the outermost dependency, rather than checking one out per query.
+async def _get_context(request: Request) -> AsyncGenerator[HTTPContext, None]:
+    pool: MySQLPoolAdapter = request.app.state.mysql
+
+    async with pool.connection() as connection:
+        yield HTTPContext(request, connection)
+
+
+# Heavy read-only listings may be served from a separate pool, so they don't hold
+# up writes waiting on the main one. Only routes that never write may use it.
+async def _get_read_context(request: Request) -> AsyncGenerator[HTTPContext, None]:
+    pool: MySQLPoolAdapter = request.app.state.mysql_read
+
+    async with pool.connection() as connection:
+        yield HTTPContext(request, connection)
+
+
 async def _get_transaction_context(
     request: Request,
 ) -> AsyncGenerator[HTTPTransactionContext, None]:
@@ -134,19 +163,29 @@ async def _get_session(request: Request) -> SessionData | None:
     return await sessions.get(token)
 
 
-async def _optional_auth(request: Request) -> OptionalAuthContext:
+async def _optional_auth(
+    request: Request,
+) -> AsyncGenerator[OptionalAuthContext, None]:
     session = await _get_session(request)
-    return OptionalAuthContext(request, session)
+
+    pool: MySQLPoolAdapter = request.app.state.mysql
+    async with pool.connection() as connection:
+        yield OptionalAuthContext(request, connection, session)
 
 
-async def _require_auth(request: Request) -> AuthenticatedContext:
+async def _require_auth(
+    request: Request,
+) -> AsyncGenerator[AuthenticatedContext, None]:
     session = await _get_session(request)
     if not session:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="auth.unauthenticated",
         )
-    return AuthenticatedContext(request, session)
+
+    pool: MySQLPoolAdapter = request.app.state.mysql
+    async with pool.connection() as connection:
+        yield AuthenticatedContext(request, connection, session)
 
 
 async def _require_auth_transaction(
@@ -172,7 +211,9 @@ async def _require_auth_transaction(
         )
 
 
-RequiresContext = Annotated[HTTPContext, Depends(HTTPContext)]
+RequiresContext = Annotated[HTTPContext, Depends(_get_context)]
+
+RequiresReadContext = Annotated[HTTPContext, Depends(_get_read_context)]
 
 RequiresTransaction = Annotated[
     HTTPTransactionContext,
@@ -37,13 +37,32 @@ def _to_response(f: friends.FriendResult) -> FriendResponse:
     )
 
 
+# The friend list may continue from the username and id of the last friend a
+# client received, in which case `page` is ignored.
+def _cursor(
+    after_username: str | None,
+    after_id: int | None,
+) -> tuple[str, int] | None:
+    if after_username is None or after_id is None:
+        return None
+    return after_username, after_id
+
+
 @router.get("/", response_model=response.BaseResponse[list[FriendResponse]])
 async def get_friends(
     ctx: RequiresAuth,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    after_username: str | None = Query(None),
+    after_id: int | None = Query(None),
 ) -> Response:
-    result = await friends.get_friends(ctx, ctx.user_id, page, limit)
+    result = await friends.get_friends(
+        ctx,
+        ctx.user_id,
+        page,
+        limit,
+        _cursor(after_username, after_id),
+    )
     result = response.unwrap(result)
 
     return response.create([_to_response(f) for f in result])
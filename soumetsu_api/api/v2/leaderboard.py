@@ -10,9 +10,20 @@ from soumetsu_api.api.v2.context import RequiresContext
 from soumetsu_api.constants import CustomMode
 from soumetsu_api.constants import GameMode
 from soumetsu_api.services import leaderboard
+from soumetsu_api.utilities.cache import AsyncTTLCache
+
+LEADERBOARD_CACHE_TTL = 5
 
 router = APIRouter(prefix="/leaderboard")
 
+# Leaderboard pages are hot and shared by everyone viewing them, so serialised
+# pages are kept for a few seconds and concurrent requests share one load.
+# Keyed by (country, mode, custom_mode, page, limit), with no country for the
+# global board.
+_leaderboard_cache = AsyncTTLCache[tuple[str | None, int, int, int, int], bytes](
+    ttl=LEADERBOARD_CACHE_TTL,
+)
+
 
 class LeaderboardModeStatsResponse(BaseModel):
     pp: int
@@ -82,7 +93,11 @@ def _first_to_response(f: leaderboard.FirstPlaceResult) -> FirstPlaceResponse:
     )
 
 
-@router.get("/", response_model=response.BaseResponse[list[LeaderboardEntryResponse]])
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[LeaderboardEntryResponse]]}},
+)
 async def get_global(
     ctx: RequiresContext,
     mode: GameMode = Query(GameMode.STD),
@@ -90,15 +105,26 @@ async def get_global(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
 ) -> Response:
-    result = await leaderboard.get_global(ctx, mode, custom_mode, page, limit)
-    result = response.unwrap(result)
-
-    return response.create([_to_response(e) for e in result])
+    async def load() -> bytes:
+        result = await leaderboard.get_global(ctx, mode, custom_mode, page, limit)
+        result = response.unwrap(result)
+
+        return response.dump_list(
+            LeaderboardEntryResponse,
+            [_to_response(e) for e in result],
+        )
+
+    payload = await _leaderboard_cache.get_or_load(
+        (None, mode, custom_mode, page, limit),
+        load,
+    )
+    return response.create_raw(payload)
 
 
 @router.get(
     "/country/{country}",
-    response_model=response.BaseResponse[list[LeaderboardEntryResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[LeaderboardEntryResponse]]}},
 )
 async def get_country(
     ctx: RequiresContext,
@@ -108,10 +134,27 @@ async def get_country(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
 ) -> Response:
-    result = await leaderboard.get_country(ctx, country, mode, custom_mode, page, limit)
-    result = response.unwrap(result)
-
-    return response.create([_to_response(e) for e in result])
+    async def load() -> bytes:
+        result = await leaderboard.get_country(
+            ctx,
+            country,
+            mode,
+            custom_mode,
+            page,
+            limit,
+        )
+        result = response.unwrap(result)
+
+        return response.dump_list(
+            LeaderboardEntryResponse,
+            [_to_response(e) for e in result],
+        )
+
+    payload = await _leaderboard_cache.get_or_load(
+        (country, mode, custom_mode, page, limit),
+        load,
+    )
+    return response.create_raw(payload)
 
 
 @router.get("/rank", response_model=response.BaseResponse[RankResponse])
@@ -152,6 +195,17 @@ async def get_total_ranked_users(
     return response.create(TotalUsersResponse(total=result))
 
 
+# Oldest first places may continue from the timestamp and score id of the last
+# one a client received, in which case `page` is ignored.
+def _cursor(
+    after_timestamp: int | None,
+    after_score_id: int | None,
+) -> tuple[int, int] | None:
+    if after_timestamp is None or after_score_id is None:
+        return None
+    return after_timestamp, after_score_id
+
+
 @router.get(
     "/firsts/oldest",
     response_model=response.BaseResponse[list[FirstPlaceResponse]],
@@ -162,8 +216,17 @@ async def list_oldest_firsts(
     custom_mode: CustomMode = Query(CustomMode.VANILLA),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    after_timestamp: int | None = Query(None),
+    after_score_id: int | None = Query(None),
 ) -> Response:
-    result = await leaderboard.list_oldest_firsts(ctx, mode, custom_mode, page, limit)
+    result = await leaderboard.list_oldest_firsts(
+        ctx,
+        mode,
+        custom_mode,
+        page,
+        limit,
+        _cursor(after_timestamp, after_score_id),
+    )
     result = response.unwrap(result)
 
     return response.create([_first_to_response(f) for f in result])
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import functools
+import typing
 from typing import Any
+from typing import override
 
+import orjson
+import pydantic_core
 from fastapi import status
 from fastapi.responses import Response
 from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import TypeAdapter
 
 from soumetsu_api.services import ServiceError
 from soumetsu_api.utilities import logging
@@ -12,6 +19,24 @@ from soumetsu_api.utilities import logging
 logger = logging.get_logger(__name__)
 
 
+class ORJSONResponse(Response):
+    """The default response class for routes that return plain data rather than a
+    `Response`, rendering it with orjson instead of the stdlib encoder."""
+
+    media_type = "application/json"
+
+    @override
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ResponseModel(BaseModel):
+    """A base for immutable response models whose schemas are built on first use
+    rather than at import time."""
+
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
 class BaseResponse[T](BaseModel):
     status: int
     data: T
@@ -23,17 +48,55 @@ class ServiceInterruptionException(Exception):
 
 
 def create(data: Any, *, status: int = status.HTTP_200_OK) -> Response:
+    """Serialises `data` and wraps it in the response envelope. The payload is
+    encoded in a single pass rather than through a `BaseResponse` model."""
+
+    return create_raw(pydantic_core.to_json(data), status=status)
+
+
+def create_raw(payload: bytes, *, status: int = status.HTTP_200_OK) -> Response:
+    """Wraps an already serialised JSON payload in the response envelope, without
+    building and re-serialising a `BaseResponse` around it."""
 
-    model_json = BaseResponse(status=status, data=data).model_dump_json(
-        exclude_none=False,
-    )
     return Response(
-        content=model_json,
+        content=b'{"status":%d,"data":%b}' % (status, payload),
         media_type="application/json",
         status_code=status,
     )
 
 
+@functools.cache
+def _list_adapter(item_type: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[item_type])
+
+
+def dump_list[T: BaseModel](item_type: type[T], items: list[T]) -> bytes:
+    """Serialises a list of response models to JSON through a cached adapter for
+    the item type, for use with `create_raw`."""
+
+    return _list_adapter(item_type).dump_json(items)
+
+
+def warm_up(response_model: Any) -> None:
+    """Builds the serialisers used for the payload of a `BaseResponse[...]` route
+    model ahead of time, so the first request returning it does not pay for the
+    deferred schema build."""
+
+    if not (
+        isinstance(response_model, type) and issubclass(response_model, BaseResponse)
+    ):
+        return
+
+    data_type = response_model.model_fields["data"].annotation
+    if typing.get_origin(data_type) is list:
+        (data_type,) = typing.get_args(data_type)
+        if isinstance(data_type, type) and issubclass(data_type, BaseModel):
+            _list_adapter(data_type)
+
+    if isinstance(data_type, type) and issubclass(data_type, BaseModel):
+        data_type.model_rebuild()
+
+
 def unwrap[T](service_response: ServiceError.OnSuccess[T]) -> T:
     if isinstance(service_response, ServiceError):
         logger.debug(
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+import pydantic_core
 from fastapi import APIRouter
 from fastapi import Query
 from fastapi import Response
-from pydantic import BaseModel
 
 from soumetsu_api.api.v2 import response
 from soumetsu_api.api.v2.context import RequiresAuthTransaction
@@ -11,13 +11,24 @@ from soumetsu_api.api.v2.context import RequiresContext
 from soumetsu_api.constants import CustomMode
 from soumetsu_api.constants import GameMode
 from soumetsu_api.services import scores
+from soumetsu_api.utilities.cache import AsyncTTLCache
 from soumetsu_api.utilities.mods import Mod
 from soumetsu_api.utilities.mods import mods_from_score
 
+TOP_PLAYS_CACHE_TTL = 15
+TOP_PLAYS_MIXED_CACHE_TTL = 60
+
 router = APIRouter()
 
+# Top plays are global and slow-changing, so the serialised payloads are shared
+# across requests for a short while.
+_top_plays_cache = AsyncTTLCache[tuple[int, int, int, int], bytes](
+    ttl=TOP_PLAYS_CACHE_TTL,
+)
+_top_plays_mixed_cache = AsyncTTLCache[None, bytes](ttl=TOP_PLAYS_MIXED_CACHE_TTL)
+
 
-class ScoreResponse(BaseModel):
+class ScoreResponse(response.ResponseModel):
     id: int
     beatmap_md5: str
     player_id: int
@@ -39,7 +50,7 @@ class ScoreResponse(BaseModel):
     playtime: int
 
 
-class BeatmapInfo(BaseModel):
+class BeatmapInfo(response.ResponseModel):
     beatmap_id: int
     beatmapset_id: int
     song_name: str
@@ -61,7 +72,8 @@ class ScoreTopPlayMixedResponse(ScoreTopPlayResponse):
 
 @router.get(
     "/scores/top",
-    response_model=response.BaseResponse[list[ScoreTopPlayResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreTopPlayResponse]]}},
 )
 async def get_top_plays(
     ctx: RequiresContext,
@@ -70,87 +82,101 @@ async def get_top_plays(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
 ) -> Response:
-    result = await scores.get_top_plays(ctx, mode, custom_mode, page, limit)
-    result = response.unwrap(result)
-
-    return response.create(
-        [
-            ScoreTopPlayResponse(
-                id=s.id,
-                beatmap_md5=s.beatmap_md5,
-                player_id=s.player_id,
-                score=s.score,
-                max_combo=s.max_combo,
-                full_combo=s.full_combo,
-                mods=mods_from_score(s.mods, s.playback_rate),
-                count_300=s.count_300,
-                count_100=s.count_100,
-                count_50=s.count_50,
-                count_katus=s.count_katus,
-                count_gekis=s.count_gekis,
-                count_misses=s.count_misses,
-                submitted_at=s.submitted_at,
-                play_mode=s.play_mode,
-                completed=s.completed,
-                accuracy=s.accuracy,
-                pp=s.pp,
-                playtime=s.playtime,
-                beatmap=BeatmapInfo(
-                    beatmap_id=s.beatmap_id,
-                    beatmapset_id=s.beatmapset_id,
-                    song_name=s.song_name,
-                    difficulty=s.difficulty,
-                    ranked=s.ranked,
-                ),
-                username=s.username,
-            )
-            for s in result
-        ],
+    async def load() -> bytes:
+        result = await scores.get_top_plays(ctx, mode, custom_mode, page, limit)
+        result = response.unwrap(result)
+
+        return response.dump_list(
+            ScoreTopPlayResponse,
+            [
+                ScoreTopPlayResponse(
+                    id=s.id,
+                    beatmap_md5=s.beatmap_md5,
+                    player_id=s.player_id,
+                    score=s.score,
+                    max_combo=s.max_combo,
+                    full_combo=s.full_combo,
+                    mods=mods_from_score(s.mods, s.playback_rate),
+                    count_300=s.count_300,
+                    count_100=s.count_100,
+                    count_50=s.count_50,
+                    count_katus=s.count_katus,
+                    count_gekis=s.count_gekis,
+                    count_misses=s.count_misses,
+                    submitted_at=s.submitted_at,
+                    play_mode=s.play_mode,
+                    completed=s.completed,
+                    accuracy=s.accuracy,
+                    pp=s.pp,
+                    playtime=s.playtime,
+                    beatmap=BeatmapInfo(
+                        beatmap_id=s.beatmap_id,
+                        beatmapset_id=s.beatmapset_id,
+                        song_name=s.song_name,
+                        difficulty=s.difficulty,
+                        ranked=s.ranked,
+                    ),
+                    username=s.username,
+                )
+                for s in result
+            ],
+        )
+
+    payload = await _top_plays_cache.get_or_load(
+        (mode, custom_mode, page, limit),
+        load,
     )
+    return response.create_raw(payload)
 
 
 @router.get(
     "/scores/top/mixed",
-    response_model=response.BaseResponse[list[ScoreTopPlayMixedResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreTopPlayMixedResponse]]}},
 )
 async def get_top_plays_mixed(ctx: RequiresContext) -> Response:
-    result = await scores.get_top_plays_all_modes(ctx)
-
-    return response.create(
-        [
-            ScoreTopPlayMixedResponse(
-                id=s.id,
-                beatmap_md5=s.beatmap_md5,
-                player_id=s.player_id,
-                score=s.score,
-                max_combo=s.max_combo,
-                full_combo=s.full_combo,
-                mods=mods_from_score(s.mods, s.playback_rate),
-                count_300=s.count_300,
-                count_100=s.count_100,
-                count_50=s.count_50,
-                count_katus=s.count_katus,
-                count_gekis=s.count_gekis,
-                count_misses=s.count_misses,
-                submitted_at=s.submitted_at,
-                play_mode=s.play_mode,
-                completed=s.completed,
-                accuracy=s.accuracy,
-                pp=s.pp,
-                playtime=s.playtime,
-                beatmap=BeatmapInfo(
-                    beatmap_id=s.beatmap_id,
-                    beatmapset_id=s.beatmapset_id,
-                    song_name=s.song_name,
-                    difficulty=s.difficulty,
-                    ranked=s.ranked,
-                ),
-                username=s.username,
-                custom_mode=s.custom_mode,
-            )
-            for s in result
-        ],
-    )
+    async def load() -> bytes:
+        result = await scores.get_top_plays_all_modes(ctx)
+
+        return response.dump_list(
+            ScoreTopPlayMixedResponse,
+            [
+                ScoreTopPlayMixedResponse(
+                    id=s.id,
+                    beatmap_md5=s.beatmap_md5,
+                    player_id=s.player_id,
+                    score=s.score,
+                    max_combo=s.max_combo,
+                    full_combo=s.full_combo,
+                    mods=mods_from_score(s.mods, s.playback_rate),
+                    count_300=s.count_300,
+                    count_100=s.count_100,
+                    count_50=s.count_50,
+                    count_katus=s.count_katus,
+                    count_gekis=s.count_gekis,
+                    count_misses=s.count_misses,
+                    submitted_at=s.submitted_at,
+                    play_mode=s.play_mode,
+                    completed=s.completed,
+                    accuracy=s.accuracy,
+                    pp=s.pp,
+                    playtime=s.playtime,
+                    beatmap=BeatmapInfo(
+                        beatmap_id=s.beatmap_id,
+                        beatmapset_id=s.beatmapset_id,
+                        song_name=s.song_name,
+                        difficulty=s.difficulty,
+                        ranked=s.ranked,
+                    ),
+                    username=s.username,
+                    custom_mode=s.custom_mode,
+                )
+                for s in result
+            ],
+        )
+
+    payload = await _top_plays_mixed_cache.get_or_load(None, load)
+    return response.create_raw(payload)
 
 
 @router.get("/scores/{score_id}", response_model=response.BaseResponse[ScoreResponse])
@@ -162,29 +188,28 @@ async def get_score(
     result = await scores.get_score(ctx, score_id, custom_mode)
     result = response.unwrap(result)
 
-    return response.create(
-        ScoreResponse(
-            id=result.id,
-            beatmap_md5=result.beatmap_md5,
-            player_id=result.player_id,
-            score=result.score,
-            max_combo=result.max_combo,
-            full_combo=result.full_combo,
-            mods=mods_from_score(result.mods, result.playback_rate),
-            count_300=result.count_300,
-            count_100=result.count_100,
-            count_50=result.count_50,
-            count_katus=result.count_katus,
-            count_gekis=result.count_gekis,
-            count_misses=result.count_misses,
-            submitted_at=result.submitted_at,
-            play_mode=result.play_mode,
-            completed=result.completed,
-            accuracy=result.accuracy,
-            pp=result.pp,
-            playtime=result.playtime,
-        ),
+    score = ScoreResponse(
+        id=result.id,
+        beatmap_md5=result.beatmap_md5,
+        player_id=result.player_id,
+        score=result.score,
+        max_combo=result.max_combo,
+        full_combo=result.full_combo,
+        mods=mods_from_score(result.mods, result.playback_rate),
+        count_300=result.count_300,
+        count_100=result.count_100,
+        count_50=result.count_50,
+        count_katus=result.count_katus,
+        count_gekis=result.count_gekis,
+        count_misses=result.count_misses,
+        submitted_at=result.submitted_at,
+        play_mode=result.play_mode,
+        completed=result.completed,
+        accuracy=result.accuracy,
+        pp=result.pp,
+        playtime=result.playtime,
     )
+    return response.create_raw(pydantic_core.to_json(score))
 
 
 @router.post("/scores/{score_id}/pin", response_model=response.BaseResponse[None])
@@ -243,7 +268,8 @@ def _to_response(s: scores.ScoreWithBeatmapResult) -> ScoreWithBeatmapResponse:
 
 @router.get(
     "/users/{user_id}/scores/best",
-    response_model=response.BaseResponse[list[ScoreWithBeatmapResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreWithBeatmapResponse]]}},
 )
 async def get_player_best(
     ctx: RequiresContext,
@@ -256,12 +282,18 @@ async def get_player_best(
     result = await scores.get_player_best(ctx, user_id, mode, custom_mode, page, limit)
     result = response.unwrap(result)
 
-    return response.create([_to_response(s) for s in result])
+    return response.create_raw(
+        response.dump_list(
+            ScoreWithBeatmapResponse,
+            [_to_response(s) for s in result],
+        ),
+    )
 
 
 @router.get(
     "/users/{user_id}/scores/recent",
-    response_model=response.BaseResponse[list[ScoreWithBeatmapResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreWithBeatmapResponse]]}},
 )
 async def get_player_recent(
     ctx: RequiresContext,
@@ -281,12 +313,18 @@ async def get_player_recent(
     )
     result = response.unwrap(result)
 
-    return response.create([_to_response(s) for s in result])
+    return response.create_raw(
+        response.dump_list(
+            ScoreWithBeatmapResponse,
+            [_to_response(s) for s in result],
+        ),
+    )
 
 
 @router.get(
     "/users/{user_id}/scores/firsts",
-    response_model=response.BaseResponse[list[ScoreWithBeatmapResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreWithBeatmapResponse]]}},
 )
 async def get_player_firsts(
     ctx: RequiresContext,
@@ -306,12 +344,18 @@ async def get_player_firsts(
     )
     result = response.unwrap(result)
 
-    return response.create([_to_response(s) for s in result])
+    return response.create_raw(
+        response.dump_list(
+            ScoreWithBeatmapResponse,
+            [_to_response(s) for s in result],
+        ),
+    )
 
 
 @router.get(
     "/users/{user_id}/scores/pinned",
-    response_model=response.BaseResponse[list[ScoreWithBeatmapResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[ScoreWithBeatmapResponse]]}},
 )
 async def get_player_pinned(
     ctx: RequiresContext,
@@ -331,4 +375,9 @@ async def get_player_pinned(
     )
     result = response.unwrap(result)
 
-    return response.create([_to_response(s) for s in result])
+    return response.create_raw(
+        response.dump_list(
+            ScoreWithBeatmapResponse,
+            [_to_response(s) for s in result],
+        ),
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pydantic_core
 from fastapi import APIRouter
 from fastapi import Response
 from pydantic import BaseModel
@@ -41,30 +42,31 @@ async def get_team(ctx: RequiresContext) -> Response:
     result = await team.get_team(ctx)
     result = response.unwrap(result)
 
-    return response.create(
-        TeamResponse(
-            groups=[
-                TeamGroupResponse(
-                    badge_id=group.badge_id,
-                    name=group.name,
-                    members=[
-                        TeamMemberResponse(
-                            id=m.id,
-                            username=m.username,
-                            country=m.country,
-                            privileges=m.privileges,
-                            global_rank=m.global_rank,
-                            country_rank=m.country_rank,
-                            is_online=m.is_online,
-                            pp=m.pp,
-                            accuracy=m.accuracy,
-                            mode=m.mode,
-                            custom_mode=m.custom_mode,
-                        )
-                        for m in group.members
-                    ],
-                )
-                for group in result.groups
-            ],
-        ),
+    # The service results are already typed, so the tree is assembled without
+    # re-validating every member.
+    team_response = TeamResponse.model_construct(
+        groups=[
+            TeamGroupResponse.model_construct(
+                badge_id=group.badge_id,
+                name=group.name,
+                members=[
+                    TeamMemberResponse.model_construct(
+                        id=m.id,
+                        username=m.username,
+                        country=m.country,
+                        privileges=m.privileges,
+                        global_rank=m.global_rank,
+                        country_rank=m.country_rank,
+                        is_online=m.is_online,
+                        pp=m.pp,
+                        accuracy=m.accuracy,
+                        mode=m.mode,
+                        custom_mode=m.custom_mode,
+                    )
+                    for m in group.members
+                ],
+            )
+            for group in result.groups
+        ],
     )
+    return response.create_raw(pydantic_core.to_json(team_response))
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def read_upload(file: UploadFile, max_size: int) -> bytes:
+    """Read an uploaded file in chunks, stopping once it exceeds `max_size`.
+
+    Oversized uploads are cut short just past the limit, so the services'
+    existing size checks still reject them without the whole body ever being
+    held in memory.
+    """
+    data = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        data += chunk
+        if len(data) > max_size:
+            break
+
+    return bytes(data)
@@ -6,10 +6,13 @@ from fastapi import Response
 from fastapi import UploadFile
 from pydantic import BaseModel
 
+from soumetsu_api import settings
 from soumetsu_api.api.v2 import response
 from soumetsu_api.api.v2.context import RequiresAuth
 from soumetsu_api.api.v2.context import RequiresAuthTransaction
 from soumetsu_api.api.v2.context import RequiresContext
+from soumetsu_api.api.v2.context import RequiresReadContext
+from soumetsu_api.api.v2.uploads import read_upload
 from soumetsu_api.constants import CustomMode
 from soumetsu_api.constants import GameMode
 from soumetsu_api.services import achievements
@@ -18,9 +21,25 @@ from soumetsu_api.services import comments
 from soumetsu_api.services import friends
 from soumetsu_api.services import user_history
 from soumetsu_api.services import users
+from soumetsu_api.utilities.cache import AsyncTTLCache
+from soumetsu_api.utilities.validation import safe_username
+
+USER_CARD_CACHE_TTL = 30
+RESOLVE_USERNAME_CACHE_TTL = 60
 
 router = APIRouter(prefix="/users")
 
+# Hover cards and username lookups are requested in bursts for the same users, so
+# successful results are kept briefly. Errors are never cached.
+_user_card_cache = AsyncTTLCache[int, users.UserCard](
+    ttl=USER_CARD_CACHE_TTL,
+    max_size=4096,
+)
+_resolve_username_cache = AsyncTTLCache[str, int](
+    ttl=RESOLVE_USERNAME_CACHE_TTL,
+    max_size=4096,
+)
+
 
 class ClanInfoResponse(BaseModel):
     id: int
@@ -52,16 +71,6 @@ class DiscordProfileInfo(BaseModel):
     avatar: str
 
 
-def _discord_to_response(discord: users.DiscordLink | None) -> DiscordProfileInfo | None:
-    if discord is None:
-        return None
-    return DiscordProfileInfo(
-        id=discord.discord_id,
-        username=discord.discord_username,
-        avatar=discord.discord_avatar,
-    )
-
-
 class UserProfileResponse(BaseModel):
     id: int
     username: str
@@ -75,6 +84,54 @@ class UserProfileResponse(BaseModel):
     stats: UserStatsResponse
 
 
+def _profile_to_response(profile: users.UserProfile) -> UserProfileResponse:
+    # The profile comes from the typed service layer, so validation is skipped.
+    clan = None
+    if profile.clan:
+        clan = ClanInfoResponse.model_construct(
+            id=profile.clan.id,
+            name=profile.clan.name,
+            tag=profile.clan.tag,
+        )
+
+    discord = None
+    if profile.discord:
+        discord = DiscordProfileInfo.model_construct(
+            id=profile.discord.discord_id,
+            username=profile.discord.discord_username,
+            avatar=profile.discord.discord_avatar,
+        )
+
+    return UserProfileResponse.model_construct(
+        id=profile.id,
+        username=profile.username,
+        country=profile.country,
+        privileges=profile.privileges,
+        registered_at=profile.registered_at,
+        latest_activity=profile.latest_activity,
+        is_online=profile.is_online,
+        clan=clan,
+        discord=discord,
+        stats=UserStatsResponse.model_construct(
+            mode=profile.stats.mode,
+            custom_mode=profile.stats.custom_mode,
+            global_rank=profile.stats.global_rank,
+            country_rank=profile.stats.country_rank,
+            pp=profile.stats.pp,
+            accuracy=profile.stats.accuracy,
+            playcount=profile.stats.playcount,
+            total_score=profile.stats.total_score,
+            ranked_score=profile.stats.ranked_score,
+            total_hits=profile.stats.total_hits,
+            playtime=profile.stats.playtime,
+            max_combo=profile.stats.max_combo,
+            replays_watched=profile.stats.replays_watched,
+            level=profile.stats.level,
+            first_places=profile.stats.first_places,
+        ),
+    )
+
+
 class UserCompactResponse(BaseModel):
     id: int
     username: str
@@ -165,7 +222,11 @@ class LinkDiscordRequest(BaseModel):
     redirect_uri: str
 
 
-@router.get("/search", response_model=response.BaseResponse[list[UserCompactResponse]])
+@router.get(
+    "/search",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[UserCompactResponse]]}},
+)
 async def search_users(
     ctx: RequiresContext,
     q: str = Query(..., min_length=1),
@@ -175,31 +236,33 @@ async def search_users(
     result = await users.search_users(ctx, q, page, limit)
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            UserCompactResponse(
-                id=u.id,
-                username=u.username,
-                country=u.country,
-                privileges=u.privileges,
-            )
-            for u in result
-        ],
-    )
+    # `UserCompact` has the same fields as `UserCompactResponse`, so it is
+    # serialised directly rather than copied into response models.
+    return response.create(result)
 
 
-@router.get("/resolve", response_model=response.BaseResponse[int])
+@router.get(
+    "/resolve",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[int]}},
+)
 async def resolve_username(
     ctx: RequiresContext,
     username: str = Query(..., min_length=1),
 ) -> Response:
-    result = await users.resolve_username(ctx, username)
-    result = response.unwrap(result)
+    async def load() -> int:
+        result = await users.resolve_username(ctx, username)
+        return response.unwrap(result)
 
+    result = await _resolve_username_cache.get_or_load(safe_username(username), load)
     return response.create(result)
 
 
-@router.get("/me", response_model=response.BaseResponse[UserProfileResponse])
+@router.get(
+    "/me",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserProfileResponse]}},
+)
 async def get_me(
     ctx: RequiresAuth,
     mode: GameMode = Query(GameMode.STD),
@@ -208,47 +271,14 @@ async def get_me(
     result = await users.get_profile(ctx, ctx.user_id, mode, custom_mode)
     result = response.unwrap(result)
 
-    clan = None
-    if result.clan:
-        clan = ClanInfoResponse(
-            id=result.clan.id,
-            name=result.clan.name,
-            tag=result.clan.tag,
-        )
-
-    return response.create(
-        UserProfileResponse(
-            id=result.id,
-            username=result.username,
-            country=result.country,
-            privileges=result.privileges,
-            registered_at=result.registered_at,
-            latest_activity=result.latest_activity,
-            is_online=result.is_online,
-            clan=clan,
-            discord=_discord_to_response(result.discord),
-            stats=UserStatsResponse(
-                mode=result.stats.mode,
-                custom_mode=result.stats.custom_mode,
-                global_rank=result.stats.global_rank,
-                country_rank=result.stats.country_rank,
-                pp=result.stats.pp,
-                accuracy=result.stats.accuracy,
-                playcount=result.stats.playcount,
-                total_score=result.stats.total_score,
-                ranked_score=result.stats.ranked_score,
-                total_hits=result.stats.total_hits,
-                playtime=result.stats.playtime,
-                max_combo=result.stats.max_combo,
-                replays_watched=result.stats.replays_watched,
-                level=result.stats.level,
-                first_places=result.stats.first_places,
-            ),
-        ),
-    )
+    return response.create(_profile_to_response(result))
 
 
-@router.get("/me/settings", response_model=response.BaseResponse[UserSettingsResponse])
+@router.get(
+    "/me/settings",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserSettingsResponse]}},
+)
 async def get_settings(ctx: RequiresAuth) -> Response:
     result = await users.get_settings(ctx, ctx.user_id)
     result = response.unwrap(result)
@@ -272,7 +302,11 @@ async def get_settings(ctx: RequiresAuth) -> Response:
     )
 
 
-@router.put("/me/settings", response_model=response.BaseResponse[None])
+@router.put(
+    "/me/settings",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def update_settings(
     ctx: RequiresAuthTransaction,
     body: UpdateSettingsRequest,
@@ -295,7 +329,11 @@ async def update_settings(
     return response.create(None)
 
 
-@router.get("/me/userpage", response_model=response.BaseResponse[UserpageResponse])
+@router.get(
+    "/me/userpage",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserpageResponse]}},
+)
 async def get_my_userpage(ctx: RequiresAuth) -> Response:
     result = await users.get_userpage(ctx, ctx.user_id)
     result = response.unwrap(result)
@@ -303,7 +341,11 @@ async def get_my_userpage(ctx: RequiresAuth) -> Response:
     return response.create(UserpageResponse(content=result))
 
 
-@router.put("/me/userpage", response_model=response.BaseResponse[None])
+@router.put(
+    "/me/userpage",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def update_my_userpage(
     ctx: RequiresAuthTransaction,
     body: UpdateUserpageRequest,
@@ -314,18 +356,36 @@ async def update_my_userpage(
     return response.create(None)
 
 
-@router.put("/me/username", response_model=response.BaseResponse[None])
+@router.put(
+    "/me/username",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def change_username(
     ctx: RequiresAuthTransaction,
     body: ChangeUsernameRequest,
 ) -> Response:
     result = await users.change_username(ctx, ctx.user_id, body.username)
-    response.unwrap(result)
+    old_username = response.unwrap(result)
+
+    # Both names now resolve differently, and the card shows the new one. They are
+    # dropped once the rename commits, so a concurrent lookup can't cache the old
+    # values again in between.
+    async def invalidate() -> None:
+        _user_card_cache.invalidate(ctx.user_id)
+        _resolve_username_cache.invalidate(safe_username(old_username))
+        _resolve_username_cache.invalidate(safe_username(body.username))
+
+    await ctx.after_commit(invalidate)
 
     return response.create(None)
 
 
-@router.get("/me/discord", response_model=response.BaseResponse[DiscordLinkResponse])
+@router.get(
+    "/me/discord",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[DiscordLinkResponse]}},
+)
 async def get_discord(ctx: RequiresAuth) -> Response:
     link = await users.get_discord_link(ctx, ctx.user_id)
     if not link:
@@ -339,7 +399,11 @@ async def get_discord(ctx: RequiresAuth) -> Response:
     )
 
 
-@router.post("/me/discord", response_model=response.BaseResponse[DiscordLinkResponse])
+@router.post(
+    "/me/discord",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[DiscordLinkResponse]}},
+)
 async def link_discord(
     ctx: RequiresAuthTransaction,
     body: LinkDiscordRequest,
@@ -361,7 +425,11 @@ async def link_discord(
     )
 
 
-@router.delete("/me/discord", response_model=response.BaseResponse[None])
+@router.delete(
+    "/me/discord",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def unlink_discord(ctx: RequiresAuthTransaction) -> Response:
     result = await users.unlink_discord(ctx, ctx.user_id)
     response.unwrap(result)
@@ -369,7 +437,11 @@ async def unlink_discord(ctx: RequiresAuthTransaction) -> Response:
     return response.create(None)
 
 
-@router.get("/me/email", response_model=response.BaseResponse[EmailResponse])
+@router.get(
+    "/me/email",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[EmailResponse]}},
+)
 async def get_email(ctx: RequiresAuth) -> Response:
     result = await users.get_email(ctx, ctx.user_id)
     result = response.unwrap(result)
@@ -377,7 +449,11 @@ async def get_email(ctx: RequiresAuth) -> Response:
     return response.create(EmailResponse(email=result))
 
 
-@router.put("/me/password", response_model=response.BaseResponse[None])
+@router.put(
+    "/me/password",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def change_password(
     ctx: RequiresAuthTransaction,
     body: ChangePasswordRequest,
@@ -398,9 +474,13 @@ class UploadResponse(BaseModel):
     path: str
 
 
-@router.post("/me/avatar", response_model=response.BaseResponse[UploadResponse])
+@router.post(
+    "/me/avatar",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UploadResponse]}},
+)
 async def upload_avatar(ctx: RequiresAuth, file: UploadFile) -> Response:
-    image_data = await file.read()
+    image_data = await read_upload(file, settings.MAX_AVATAR_SIZE)
 
     result = await users.upload_avatar(ctx, ctx.user_id, image_data)
     result = response.unwrap(result)
@@ -408,7 +488,11 @@ async def upload_avatar(ctx: RequiresAuth, file: UploadFile) -> Response:
     return response.create(UploadResponse(path=result))
 
 
-@router.delete("/me/avatar", response_model=response.BaseResponse[None])
+@router.delete(
+    "/me/avatar",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def delete_avatar(ctx: RequiresAuth) -> Response:
     result = await users.delete_avatar(ctx, ctx.user_id)
     response.unwrap(result)
@@ -416,9 +500,13 @@ async def delete_avatar(ctx: RequiresAuth) -> Response:
     return response.create(None)
 
 
-@router.post("/me/banner", response_model=response.BaseResponse[UploadResponse])
+@router.post(
+    "/me/banner",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UploadResponse]}},
+)
 async def upload_banner(ctx: RequiresAuth, file: UploadFile) -> Response:
-    image_data = await file.read()
+    image_data = await read_upload(file, settings.MAX_BANNER_SIZE)
 
     result = await users.upload_banner(ctx, ctx.user_id, image_data)
     result = response.unwrap(result)
@@ -426,7 +514,11 @@ async def upload_banner(ctx: RequiresAuth, file: UploadFile) -> Response:
     return response.create(UploadResponse(path=result))
 
 
-@router.delete("/me/banner", response_model=response.BaseResponse[None])
+@router.delete(
+    "/me/banner",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[None]}},
+)
 async def delete_banner(ctx: RequiresAuth) -> Response:
     result = await users.delete_banner(ctx, ctx.user_id)
     response.unwrap(result)
@@ -434,33 +526,32 @@ async def delete_banner(ctx: RequiresAuth) -> Response:
     return response.create(None)
 
 
-@router.get("/{user_id}/card", response_model=response.BaseResponse[UserCardResponse])
+@router.get(
+    "/{user_id}/card",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserCardResponse]}},
+)
 async def get_user_card(
     ctx: RequiresContext,
     user_id: int,
 ) -> Response:
     """Get minimal user info for hover cards. Optimized for fast loading."""
-    result = await users.get_card(ctx, user_id)
-    result = response.unwrap(result)
 
-    return response.create(
-        UserCardResponse(
-            id=result.id,
-            username=result.username,
-            country=result.country,
-            privileges=result.privileges,
-            global_rank=result.global_rank,
-            country_rank=result.country_rank,
-            is_online=result.is_online,
-            pp=result.pp,
-            accuracy=result.accuracy,
-            mode=result.mode,
-            custom_mode=result.custom_mode,
-        ),
-    )
+    async def load() -> users.UserCard:
+        result = await users.get_card(ctx, user_id)
+        return response.unwrap(result)
+
+    result = await _user_card_cache.get_or_load(user_id, load)
+
+    # `UserCard` mirrors `UserCardResponse` field for field.
+    return response.create(result)
 
 
-@router.get("/{user_id}", response_model=response.BaseResponse[UserProfileResponse])
+@router.get(
+    "/{user_id}",
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserProfileResponse]}},
+)
 async def get_user(
     ctx: RequiresContext,
     user_id: int,
@@ -470,49 +561,13 @@ async def get_user(
     result = await users.get_profile(ctx, user_id, mode, custom_mode)
     result = response.unwrap(result)
 
-    clan = None
-    if result.clan:
-        clan = ClanInfoResponse(
-            id=result.clan.id,
-            name=result.clan.name,
-            tag=result.clan.tag,
-        )
-
-    return response.create(
-        UserProfileResponse(
-            id=result.id,
-            username=result.username,
-            country=result.country,
-            privileges=result.privileges,
-            registered_at=result.registered_at,
-            latest_activity=result.latest_activity,
-            is_online=result.is_online,
-            clan=clan,
-            discord=_discord_to_response(result.discord),
-            stats=UserStatsResponse(
-                mode=result.stats.mode,
-                custom_mode=result.stats.custom_mode,
-                global_rank=result.stats.global_rank,
-                country_rank=result.stats.country_rank,
-                pp=result.stats.pp,
-                accuracy=result.stats.accuracy,
-                playcount=result.stats.playcount,
-                total_score=result.stats.total_score,
-                ranked_score=result.stats.ranked_score,
-                total_hits=result.stats.total_hits,
-                playtime=result.stats.playtime,
-                max_combo=result.stats.max_combo,
-                replays_watched=result.stats.replays_watched,
-                level=result.stats.level,
-                first_places=result.stats.first_places,
-            ),
-        ),
-    )
+    return response.create(_profile_to_response(result))
 
 
 @router.get(
     "/{user_id}/userpage",
-    response_model=response.BaseResponse[UserpageResponse],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[UserpageResponse]}},
 )
 async def get_userpage(
     ctx: RequiresContext,
@@ -533,9 +588,21 @@ class CommentResponse(BaseModel):
     created_at: int
 
 
+def _comment_to_response(c: comments.CommentResult) -> CommentResponse:
+    return CommentResponse.model_construct(
+        id=c.id,
+        author_id=c.author_id,
+        author_username=c.author_username,
+        profile_id=c.profile_id,
+        message=c.message,
+        created_at=c.created_at,
+    )
+
+
 @router.get(
     "/{user_id}/comments",
-    response_model=response.BaseResponse[list[CommentResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[CommentResponse]]}},
 )
 async def list_profile_comments(
     ctx: RequiresContext,
@@ -546,18 +613,11 @@ async def list_profile_comments(
     result = await comments.list_profile_comments(ctx, user_id, page, limit)
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            CommentResponse(
-                id=c.id,
-                author_id=c.author_id,
-                author_username=c.author_username,
-                profile_id=c.profile_id,
-                message=c.message,
-                created_at=c.created_at,
-            )
-            for c in result
-        ],
+    return response.create_raw(
+        response.dump_list(
+            CommentResponse,
+            [_comment_to_response(c) for c in result],
+        ),
     )
 
 
@@ -568,7 +628,8 @@ class FollowerStatsResponse(BaseModel):
 
 @router.get(
     "/{user_id}/followers",
-    response_model=response.BaseResponse[FollowerStatsResponse],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[FollowerStatsResponse]}},
 )
 async def get_user_followers(
     ctx: RequiresContext,
@@ -594,9 +655,23 @@ class AchievementResponse(BaseModel):
     achieved_at: int | None
 
 
+def _achievement_to_response(
+    a: achievements.AchievementResult,
+) -> AchievementResponse:
+    return AchievementResponse.model_construct(
+        id=a.id,
+        name=a.name,
+        description=a.description,
+        file=a.file,
+        achieved=a.achieved,
+        achieved_at=a.achieved_at,
+    )
+
+
 @router.get(
     "/{user_id}/achievements",
-    response_model=response.BaseResponse[list[AchievementResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[AchievementResponse]]}},
 )
 async def get_user_achievements(
     ctx: RequiresContext,
@@ -605,18 +680,11 @@ async def get_user_achievements(
     result = await achievements.get_user_achievements(ctx, user_id)
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            AchievementResponse(
-                id=a.id,
-                name=a.name,
-                description=a.description,
-                file=a.file,
-                achieved=a.achieved,
-                achieved_at=a.achieved_at,
-            )
-            for a in result
-        ],
+    return response.create_raw(
+        response.dump_list(
+            AchievementResponse,
+            [_achievement_to_response(a) for a in result],
+        ),
     )
 
 
@@ -633,7 +701,8 @@ class PPHistoryResponse(BaseModel):
 
 @router.get(
     "/{user_id}/history/rank",
-    response_model=response.BaseResponse[list[RankHistoryResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[RankHistoryResponse]]}},
 )
 async def get_user_rank_history(
     ctx: RequiresContext,
@@ -644,21 +713,25 @@ async def get_user_rank_history(
     result = await user_history.get_rank_history(ctx, user_id, mode, custom_mode)
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            RankHistoryResponse(
-                overall=h.overall,
-                country=h.country,
-                captured_at=h.captured_at,
-            )
-            for h in result
-        ],
+    return response.create_raw(
+        response.dump_list(
+            RankHistoryResponse,
+            [
+                RankHistoryResponse.model_construct(
+                    overall=h.overall,
+                    country=h.country,
+                    captured_at=h.captured_at,
+                )
+                for h in result
+            ],
+        ),
     )
 
 
 @router.get(
     "/{user_id}/history/pp",
-    response_model=response.BaseResponse[list[PPHistoryResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[PPHistoryResponse]]}},
 )
 async def get_user_pp_history(
     ctx: RequiresContext,
@@ -669,14 +742,14 @@ async def get_user_pp_history(
     result = await user_history.get_pp_history(ctx, user_id, mode, custom_mode)
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            PPHistoryResponse(
-                pp=h.pp,
-                captured_at=h.captured_at,
-            )
-            for h in result
-        ],
+    return response.create_raw(
+        response.dump_list(
+            PPHistoryResponse,
+            [
+                PPHistoryResponse.model_construct(pp=h.pp, captured_at=h.captured_at)
+                for h in result
+            ],
+        ),
     )
 
 
@@ -691,12 +764,24 @@ class MostPlayedResponse(BaseModel):
     playcount: int
 
 
+def _most_played_to_response(mp: beatmaps.MostPlayedResult) -> MostPlayedResponse:
+    return MostPlayedResponse.model_construct(
+        beatmap=MostPlayedBeatmapResponse.model_construct(
+            beatmap_id=mp.beatmap.beatmap_id,
+            beatmapset_id=mp.beatmap.beatmapset_id,
+            song_name=mp.beatmap.song_name,
+        ),
+        playcount=mp.playcount,
+    )
+
+
 @router.get(
     "/{user_id}/beatmaps/most-played",
-    response_model=response.BaseResponse[list[MostPlayedResponse]],
+    response_model=None,
+    responses={200: {"model": response.BaseResponse[list[MostPlayedResponse]]}},
 )
 async def get_user_most_played(
-    ctx: RequiresContext,
+    ctx: RequiresReadContext,
     user_id: int,
     mode: GameMode = Query(GameMode.STD),
     custom_mode: CustomMode = Query(CustomMode.VANILLA),
@@ -713,16 +798,9 @@ async def get_user_most_played(
     )
     result = response.unwrap(result)
 
-    return response.create(
-        [
-            MostPlayedResponse(
-                beatmap=MostPlayedBeatmapResponse(
-                    beatmap_id=mp.beatmap.beatmap_id,
-                    beatmapset_id=mp.beatmap.beatmapset_id,
-                    song_name=mp.beatmap.song_name,
-                ),
-                playcount=mp.playcount,
-            )
-            for mp in result
-        ],
+    return response.create_raw(
+        response.dump_list(
+            MostPlayedResponse,
+            [_most_played_to_response(mp) for mp in result],
+        ),
     )
@@ -22,20 +22,14 @@ class CustomMode(IntEnum):
     AUTOPILOT = 2
 
 
-# Database column suffixes for mode-specific stats
-MODE_SUFFIXES: dict[int, str] = {
-    GameMode.STD: "std",
-    GameMode.TAIKO: "taiko",
-    GameMode.CTB: "ctb",
-    GameMode.MANIA: "mania",
-}
-
-# Database table names for custom mode-specific stats
-STATS_TABLES: dict[int, str] = {
-    CustomMode.VANILLA: "users_stats",
-    CustomMode.RELAX: "rx_stats",
-    CustomMode.AUTOPILOT: "ap_stats",
-}
+# Database column suffixes for mode-specific stats, indexed by `GameMode`
+MODE_SUFFIXES: tuple[str, ...] = ("std", "taiko", "ctb", "mania")
+
+# Database table names for custom mode-specific stats, indexed by `CustomMode`
+STATS_TABLES: tuple[str, ...] = ("users_stats", "rx_stats", "ap_stats")
+
+_VALID_MODES = frozenset(GameMode)
+_VALID_CUSTOM_MODES = frozenset(CustomMode)
 
 # Level calculation constants
 LEVEL_100_THRESHOLD = 100
@@ -49,12 +43,12 @@ LEVEL_100_INCREMENT = 100000000000
 
 def is_valid_mode(mode: int) -> bool:
     """Check if mode is a valid game mode (0-3)."""
-    return 0 <= mode <= 3
+    return mode in _VALID_MODES
 
 
 def is_valid_custom_mode(custom_mode: int) -> bool:
     """Check if custom mode is valid (0-2)."""
-    return 0 <= custom_mode <= 2
+    return custom_mode in _VALID_CUSTOM_MODES
 
 
 def get_mode_suffix(mode: int) -> str:
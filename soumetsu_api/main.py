@@ -10,7 +10,8 @@ loop.install_optimal_loop()
 
 match settings.APP_COMPONENT:
     case "fastapi":
-        # Will be ran by the uvicorn CLI.
+        # Will be ran by the uvicorn CLI, with `--loop uvloop --http httptools`
+        # (see `scripts/run_fastapi.sh`).
         asgi_app = api.create_app()
     case _:
         raise ValueError(f"Invalid app component: {settings.APP_COMPONENT}")
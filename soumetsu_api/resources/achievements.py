@@ -30,7 +30,7 @@ class AchievementsRepository:
                ORDER BY id ASC""",
             {},
         )
-        return [AchievementData(**row) for row in rows]
+        return [AchievementData.model_construct(**row) for row in rows]
 
     async def get_user_achievements(
         self,
@@ -43,4 +43,4 @@ class AchievementsRepository:
                ORDER BY achievement_id ASC""",
             {"user_id": user_id},
         )
-        return [UserAchievementData(**row) for row in rows]
+        return [UserAchievementData.model_construct(**row) for row in rows]
@@ -1,12 +1,73 @@
 from __future__ import annotations
 
-import time
+import functools
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
 from soumetsu_api.constants import MODE_SUFFIXES
 from soumetsu_api.constants import STATS_TABLES
 from soumetsu_api.utilities.validation import safe_username
 
+# Per-mode stat columns and the values they are reset to on a wipe.
+_WIPE_COLUMN_DEFAULTS: tuple[tuple[str, int], ...] = (
+    ("pp", 0),
+    ("ranked_score", 0),
+    ("total_score", 0),
+    ("playcount", 0),
+    ("avg_accuracy", 0),
+    ("total_hits", 0),
+    ("playtime", 0),
+    ("max_combo", 0),
+    ("replays_watched", 0),
+    ("level", 1),
+)
+
+
+def _wipe_assignments(suffix: str) -> str:
+    return ", ".join(
+        f"{column}_{suffix} = {value}" for column, value in _WIPE_COLUMN_DEFAULTS
+    )
+
+
+# Wipe queries are fixed per table and mode, so they are built once here. Wiping
+# every mode resets all suffixed column groups in a single statement.
+_WIPE_MODE_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): (
+        f"UPDATE {table} SET {_wipe_assignments(suffix)} WHERE id = :user_id"
+    )
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+_WIPE_ALL_MODES_QUERIES: dict[int, str] = {
+    custom_mode: (
+        f"UPDATE {table} SET "
+        + ", ".join(_wipe_assignments(suffix) for suffix in MODE_SUFFIXES)
+        + " WHERE id = :user_id"
+    )
+    for custom_mode, table in enumerate(STATS_TABLES)
+}
+
+# Columns set by `update_user`, in the order of its arguments and mask bits. The
+# first column of each group takes the argument itself; a username change also
+# updates its safe form.
+_UPDATE_USER_COLUMNS: tuple[tuple[str, ...], ...] = (
+    ("username", "username_safe"),
+    ("email",),
+    ("country",),
+    ("silence_end",),
+    ("notes",),
+)
+
+
+@functools.lru_cache(maxsize=1 << len(_UPDATE_USER_COLUMNS))
+def _update_user_query(mask: int) -> str:
+    assignments = ", ".join(
+        f"{column} = :{column}"
+        for bit, columns in enumerate(_UPDATE_USER_COLUMNS)
+        if mask & (1 << bit)
+        for column in columns
+    )
+    return f"UPDATE users SET {assignments} WHERE id = :user_id"
+
 
 class AdminRepository:
     __slots__ = ("_mysql",)
@@ -22,11 +83,10 @@ class AdminRepository:
     ) -> int:
         return await self._mysql.execute(
             """INSERT INTO rap_logs (userid, text, datetime, through)
-               VALUES (:user_id, :text, :datetime, :through)""",
+               VALUES (:user_id, :text, UNIX_TIMESTAMP(), :through)""",
             {
                 "user_id": user_id,
                 "text": text,
-                "datetime": int(time.time()),
                 "through": through,
             },
         )
@@ -34,27 +94,19 @@ class AdminRepository:
     async def ban_user(self, user_id: int, reason: str = "") -> None:
         await self._mysql.execute(
             """UPDATE users SET privileges = privileges & ~3,
-                               ban_datetime = :ban_time,
+                               ban_datetime = CAST(UNIX_TIMESTAMP() AS CHAR),
                                ban_reason = :reason
                WHERE id = :user_id""",
-            {
-                "user_id": user_id,
-                "ban_time": str(int(time.time())),
-                "reason": reason,
-            },
+            {"user_id": user_id, "reason": reason},
         )
 
     async def restrict_user(self, user_id: int, reason: str = "") -> None:
         await self._mysql.execute(
             """UPDATE users SET privileges = privileges & ~1,
-                               ban_datetime = :ban_time,
+                               ban_datetime = CAST(UNIX_TIMESTAMP() AS CHAR),
                                ban_reason = :reason
                WHERE id = :user_id""",
-            {
-                "user_id": user_id,
-                "ban_time": str(int(time.time())),
-                "reason": reason,
-            },
+            {"user_id": user_id, "reason": reason},
         )
 
     async def unrestrict_user(self, user_id: int) -> None:
@@ -75,36 +127,22 @@ class AdminRepository:
         silence_end: int | None = None,
         notes: str | None = None,
     ) -> None:
-        updates = []
+        fields = (username, email, country, silence_end, notes)
         params: dict[str, int | str] = {"user_id": user_id}
+        mask = 0
 
-        if username is not None:
-            updates.append("username = :username")
-            updates.append("username_safe = :username_safe")
-            params["username"] = username
-            params["username_safe"] = safe_username(username)
+        for bit, (columns, value) in enumerate(zip(_UPDATE_USER_COLUMNS, fields)):
+            if value is not None:
+                mask |= 1 << bit
+                params[columns[0]] = value
 
-        if email is not None:
-            updates.append("email = :email")
-            params["email"] = email
-
-        if country is not None:
-            updates.append("country = :country")
-            params["country"] = country
-
-        if silence_end is not None:
-            updates.append("silence_end = :silence_end")
-            params["silence_end"] = silence_end
-
-        if notes is not None:
-            updates.append("notes = :notes")
-            params["notes"] = notes
-
-        if not updates:
+        if not mask:
             return
 
-        query = f"UPDATE users SET {', '.join(updates)} WHERE id = :user_id"
-        await self._mysql.execute(query, params)
+        if username is not None:
+            params["username_safe"] = safe_username(username)
+
+        await self._mysql.execute(_update_user_query(mask), params)
 
     async def wipe_user_stats(
         self,
@@ -112,40 +150,9 @@ class AdminRepository:
         mode: int | None = None,
         custom_mode: int = 0,
     ) -> None:
-        table = STATS_TABLES[custom_mode]
-
-        if mode is not None:
-            suffix = MODE_SUFFIXES[mode]
-            await self._mysql.execute(
-                f"""UPDATE {table} SET
-                    pp_{suffix} = 0,
-                    ranked_score_{suffix} = 0,
-                    total_score_{suffix} = 0,
-                    playcount_{suffix} = 0,
-                    avg_accuracy_{suffix} = 0,
-                    total_hits_{suffix} = 0,
-                    playtime_{suffix} = 0,
-                    max_combo_{suffix} = 0,
-                    replays_watched_{suffix} = 0,
-                    level_{suffix} = 1
-                    WHERE id = :user_id""",
-                {"user_id": user_id},
-            )
+        if mode is None:
+            query = _WIPE_ALL_MODES_QUERIES[custom_mode]
         else:
-            for m in range(4):
-                suffix = MODE_SUFFIXES[m]
-                await self._mysql.execute(
-                    f"""UPDATE {table} SET
-                        pp_{suffix} = 0,
-                        ranked_score_{suffix} = 0,
-                        total_score_{suffix} = 0,
-                        playcount_{suffix} = 0,
-                        avg_accuracy_{suffix} = 0,
-                        total_hits_{suffix} = 0,
-                        playtime_{suffix} = 0,
-                        max_combo_{suffix} = 0,
-                        replays_watched_{suffix} = 0,
-                        level_{suffix} = 1
-                        WHERE id = :user_id""",
-                    {"user_id": user_id},
-                )
+            query = _WIPE_MODE_QUERIES[custom_mode, mode]
+
+        await self._mysql.execute(query, {"user_id": user_id})
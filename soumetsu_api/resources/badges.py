@@ -31,7 +31,7 @@ class BadgesRepository:
         if not row:
             return None
 
-        return BadgeData(**row)
+        return BadgeData.model_construct(**row)
 
     async def get_all(
         self,
@@ -44,7 +44,7 @@ class BadgesRepository:
                LIMIT :limit OFFSET :offset""",
             {"limit": limit, "offset": offset},
         )
-        return [BadgeData(**row) for row in rows]
+        return [BadgeData.model_construct(**row) for row in rows]
 
     async def get_members(
         self,
@@ -62,7 +62,7 @@ class BadgesRepository:
                LIMIT :limit OFFSET :offset""",
             {"badge_id": badge_id, "limit": limit, "offset": offset},
         )
-        return [BadgeMemberData(**row) for row in rows]
+        return [BadgeMemberData.model_construct(**row) for row in rows]
 
     async def get_member_count(self, badge_id: int) -> int:
         result = await self._mysql.fetch_val(
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import functools
 import time as time_module
-
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
+from soumetsu_api.adapters.mysql import MySQLRow
+from soumetsu_api.utilities.cache import AsyncTTLCache
+
+BEATMAP_CACHE_TTL = 60
 
 
-class BeatmapData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class BeatmapData:
     beatmap_id: int
     beatmapset_id: int
     beatmap_md5: str
@@ -30,14 +35,16 @@ class BeatmapData(BaseModel):
     mapper_id: int
 
 
-class MostPlayedBeatmapData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MostPlayedBeatmapData:
     beatmap_id: int
     beatmapset_id: int
     song_name: str
     playcount: int
 
 
-class RankRequestData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RankRequestData:
     id: int
     requester_id: int
     beatmap_id: int
@@ -46,7 +53,8 @@ class RankRequestData(BaseModel):
     blacklisted: bool
 
 
-class RankRequestWithBeatmapData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RankRequestWithBeatmapData:
     request_id: int
     request_type: str
     requested_at: int
@@ -67,6 +75,125 @@ class RankRequestWithBeatmapData(BaseModel):
     mapper_id: int
 
 
+def _today_start(now: int | None = None) -> int:
+    """The unix timestamp of the most recent UTC midnight."""
+    if now is None:
+        now = int(time_module.time())
+    return now - (now % 86400)
+
+
+# Playcount ordered listings can continue from the last beatmap of a previous
+# page instead of an offset, so deep pages don't make MySQL scan and discard
+# every row before them.
+_AFTER_CONDITION = (
+    "(playcount < :after_playcount"
+    " OR (playcount = :after_playcount AND beatmap_id < :after_beatmap_id))"
+)
+
+
+def _listing_query(conditions: tuple[str, ...]) -> str:
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    return f"""SELECT beatmap_id, beatmapset_id, beatmap_md5, song_name,
+                      ar, od, mode, difficulty_std, difficulty_taiko,
+                      difficulty_ctb, difficulty_mania, max_combo,
+                      hit_length, bpm, playcount, passcount, ranked,
+                      latest_update as updated_at,
+                      ranked_status_freezed as ranked_status_frozen, mapper_id
+               FROM beatmaps
+               WHERE {where_clause}
+               ORDER BY playcount DESC, beatmap_id DESC
+               LIMIT :limit OFFSET :offset"""
+
+
+# Filters accepted by `search` and `list_popular`, in the order of their mask
+# bits. Listings only differ in which filters are applied, so each combination's
+# SQL is assembled once rather than on every request.
+_SEARCH_CONDITIONS = (
+    "song_name LIKE :query",
+    "mode = :mode",
+    "ranked = :status",
+    _AFTER_CONDITION,
+)
+_POPULAR_CONDITIONS = ("mode = :mode", _AFTER_CONDITION)
+
+
+@functools.lru_cache(maxsize=1 << len(_SEARCH_CONDITIONS))
+def _search_query(mask: int) -> str:
+    return _listing_query(
+        tuple(
+            condition
+            for bit, condition in enumerate(_SEARCH_CONDITIONS)
+            if mask & (1 << bit)
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=1 << len(_POPULAR_CONDITIONS))
+def _popular_query(mask: int) -> str:
+    return _listing_query(
+        (
+            "ranked IN (2, 3, 4, 5)",
+            *(
+                condition
+                for bit, condition in enumerate(_POPULAR_CONDITIONS)
+                if mask & (1 << bit)
+            ),
+        ),
+    )
+
+
+# Plays are counted from the scores table alone and paginated before joining, so
+# only the rows on the requested page are looked up in `beatmaps`. Scores on
+# beatmaps we have no row for are filtered out before paginating, so they can't
+# take up a place on the page. This keeps an offset rather than a cursor, as the
+# counts are aggregated per request and every group has to be counted before any
+# page can be taken, wherever it starts.
+_MOST_PLAYED_QUERIES = tuple(
+    f"""SELECT b.beatmap_id, b.beatmapset_id, b.song_name, p.playcount
+        FROM (
+            SELECT s.beatmap_md5, COUNT(*) as playcount
+            FROM {scores_table} s
+            WHERE s.userid = :user_id
+            AND s.play_mode = :mode
+            AND EXISTS (
+                SELECT 1 FROM beatmaps b WHERE b.beatmap_md5 = s.beatmap_md5
+            )
+            GROUP BY s.beatmap_md5
+            ORDER BY playcount DESC, s.beatmap_md5
+            LIMIT :limit OFFSET :offset
+        ) p
+        INNER JOIN beatmaps b ON b.beatmap_md5 = p.beatmap_md5
+        ORDER BY p.playcount DESC, p.beatmap_md5"""
+    for scores_table in ("scores", "scores_relax", "scores_ap")
+)
+
+
+# Beatmaps are read far more often than they change, so lookups by id or md5 are
+# shared across requests for a short while. Only hits are cached, as a beatmap
+# missing now may be added by the server at any point.
+_beatmaps_by_id = AsyncTTLCache[int, BeatmapData](
+    ttl=BEATMAP_CACHE_TTL,
+    max_size=10_000,
+)
+_beatmaps_by_md5 = AsyncTTLCache[str, BeatmapData](
+    ttl=BEATMAP_CACHE_TTL,
+    max_size=10_000,
+)
+
+
+def _cache_beatmap(beatmap: BeatmapData) -> None:
+    _beatmaps_by_id.set(beatmap.beatmap_id, beatmap)
+    _beatmaps_by_md5.set(beatmap.beatmap_md5, beatmap)
+
+
+# Rows come straight from our own schema, so they are unpacked into plain
+# dataclasses without validation. Only TINYINT flags need turning into bools.
+def _beatmap_from_row(row: MySQLRow) -> BeatmapData:
+    return BeatmapData(
+        **{**row, "ranked_status_frozen": bool(row["ranked_status_frozen"])},
+    )
+
+
 class BeatmapsRepository:
     __slots__ = ("_mysql",)
 
@@ -74,6 +201,10 @@ class BeatmapsRepository:
         self._mysql = mysql
 
     async def find_by_id(self, beatmap_id: int) -> BeatmapData | None:
+        cached = _beatmaps_by_id.get(beatmap_id)
+        if cached is not None:
+            return cached
+
         row = await self._mysql.fetch_one(
             """SELECT beatmap_id, beatmapset_id, beatmap_md5, song_name,
                       ar, od, mode, difficulty_std, difficulty_taiko,
@@ -87,9 +218,15 @@ class BeatmapsRepository:
         if not row:
             return None
 
-        return BeatmapData(**row)
+        beatmap = _beatmap_from_row(row)
+        _cache_beatmap(beatmap)
+        return beatmap
 
     async def find_by_md5(self, beatmap_md5: str) -> BeatmapData | None:
+        cached = _beatmaps_by_md5.get(beatmap_md5)
+        if cached is not None:
+            return cached
+
         row = await self._mysql.fetch_one(
             """SELECT beatmap_id, beatmapset_id, beatmap_md5, song_name,
                       ar, od, mode, difficulty_std, difficulty_taiko,
@@ -103,7 +240,9 @@ class BeatmapsRepository:
         if not row:
             return None
 
-        return BeatmapData(**row)
+        beatmap = _beatmap_from_row(row)
+        _cache_beatmap(beatmap)
+        return beatmap
 
     async def search(
         self,
@@ -112,68 +251,52 @@ class BeatmapsRepository:
         status: int | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[int, int] | None = None,
     ) -> list[BeatmapData]:
-        conditions = []
         params: dict[str, str | int] = {"limit": limit, "offset": offset}
+        mask = 0
 
         if query:
-            conditions.append("song_name LIKE :query")
+            mask |= 1 << 0
             params["query"] = f"%{query}%"
 
         if mode is not None:
-            conditions.append("mode = :mode")
+            mask |= 1 << 1
             params["mode"] = mode
 
         if status is not None:
-            conditions.append("ranked = :status")
+            mask |= 1 << 2
             params["status"] = status
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        if after is not None:
+            mask |= 1 << 3
+            params["after_playcount"], params["after_beatmap_id"] = after
+            params["offset"] = 0
 
-        rows = await self._mysql.fetch_all(
-            f"""SELECT beatmap_id, beatmapset_id, beatmap_md5, song_name,
-                       ar, od, mode, difficulty_std, difficulty_taiko,
-                       difficulty_ctb, difficulty_mania, max_combo,
-                       hit_length, bpm, playcount, passcount, ranked,
-                       latest_update as updated_at,
-                       ranked_status_freezed as ranked_status_frozen, mapper_id
-                FROM beatmaps
-                WHERE {where_clause}
-                ORDER BY playcount DESC
-                LIMIT :limit OFFSET :offset""",
-            params,
-        )
-        return [BeatmapData(**row) for row in rows]
+        rows = await self._mysql.fetch_all(_search_query(mask), params)
+        return [_beatmap_from_row(row) for row in rows]
 
     async def list_popular(
         self,
         mode: int | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[int, int] | None = None,
     ) -> list[BeatmapData]:
-        conditions = ["ranked IN (2, 3, 4, 5)"]
         params: dict[str, int] = {"limit": limit, "offset": offset}
+        mask = 0
 
         if mode is not None:
-            conditions.append("mode = :mode")
+            mask |= 1 << 0
             params["mode"] = mode
 
-        where_clause = " AND ".join(conditions)
+        if after is not None:
+            mask |= 1 << 1
+            params["after_playcount"], params["after_beatmap_id"] = after
+            params["offset"] = 0
 
-        rows = await self._mysql.fetch_all(
-            f"""SELECT beatmap_id, beatmapset_id, beatmap_md5, song_name,
-                       ar, od, mode, difficulty_std, difficulty_taiko,
-                       difficulty_ctb, difficulty_mania, max_combo,
-                       hit_length, bpm, playcount, passcount, ranked,
-                       latest_update as updated_at,
-                       ranked_status_freezed as ranked_status_frozen, mapper_id
-                FROM beatmaps
-                WHERE {where_clause}
-                ORDER BY playcount DESC
-                LIMIT :limit OFFSET :offset""",
-            params,
-        )
-        return [BeatmapData(**row) for row in rows]
+        rows = await self._mysql.fetch_all(_popular_query(mask), params)
+        return [_beatmap_from_row(row) for row in rows]
 
     async def list_beatmapset(
         self,
@@ -190,7 +313,17 @@ class BeatmapsRepository:
                ORDER BY difficulty_std ASC""",
             {"beatmapset_id": beatmapset_id},
         )
-        return [BeatmapData(**row) for row in rows]
+        return [_beatmap_from_row(row) for row in rows]
+
+    async def is_beatmapset_ranked(self, beatmapset_id: int) -> bool:
+        # Only the statuses matter here, so avoid pulling every difficulty's
+        # full row just to check them.
+        all_ranked = await self._mysql.fetch_val(
+            """SELECT MIN(ranked IN (2, 3, 4, 5)) FROM beatmaps
+               WHERE beatmapset_id = :beatmapset_id""",
+            {"beatmapset_id": beatmapset_id},
+        )
+        return bool(all_ranked)
 
     async def get_user_most_played(
         self,
@@ -200,26 +333,14 @@ class BeatmapsRepository:
         limit: int = 5,
         offset: int = 0,
     ) -> list[MostPlayedBeatmapData]:
-        # Select table based on custom_mode
-        scores_tables = ["scores", "scores_relax", "scores_ap"]
-        scores_table = scores_tables[custom_mode]
-
         rows = await self._mysql.fetch_all(
-            f"""SELECT b.beatmap_id, b.beatmapset_id, b.song_name,
-                       COUNT(*) as playcount
-                FROM {scores_table} s
-                INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-                WHERE s.userid = :user_id
-                AND s.play_mode = :mode
-                GROUP BY s.beatmap_md5
-                ORDER BY playcount DESC
-                LIMIT :limit OFFSET :offset""",
+            _MOST_PLAYED_QUERIES[custom_mode],
             {"user_id": user_id, "mode": mode, "limit": limit, "offset": offset},
         )
         return [MostPlayedBeatmapData(**row) for row in rows]
 
     async def count_rank_requests_today(self) -> int:
-        today_start = int(time_module.time()) - (int(time_module.time()) % 86400)
+        today_start = _today_start()
 
         result = await self._mysql.fetch_val(
             """SELECT COUNT(*) FROM rank_requests
@@ -228,15 +349,24 @@ class BeatmapsRepository:
         )
         return result or 0
 
-    async def count_user_rank_requests_today(self, requester_id: int) -> int:
-        today_start = int(time_module.time()) - (int(time_module.time()) % 86400)
+    async def get_user_rank_requests_today(
+        self,
+        requester_id: int,
+    ) -> tuple[int, int | None]:
+        """Counts the user's rank requests since midnight, alongside the time of the
+        oldest one (`None` when there are none)."""
+        today_start = _today_start()
 
-        result = await self._mysql.fetch_val(
-            """SELECT COUNT(*) FROM rank_requests
+        row = await self._mysql.fetch_one(
+            """SELECT COUNT(*) AS submitted, MIN(time) AS oldest_time
+               FROM rank_requests
                WHERE userid = :requester_id AND time >= :today_start""",
             {"requester_id": requester_id, "today_start": today_start},
         )
-        return result or 0
+        if not row:
+            return 0, None
+
+        return row["submitted"] or 0, row["oldest_time"]
 
     async def find_rank_request_by_beatmap(
         self,
@@ -252,7 +382,7 @@ class BeatmapsRepository:
         )
         if not row:
             return None
-        return RankRequestData(**row)
+        return RankRequestData(**{**row, "blacklisted": bool(row["blacklisted"])})
 
     async def create_rank_request(
         self,
@@ -261,7 +391,7 @@ class BeatmapsRepository:
         request_type: str,
     ) -> int:
         requested_at = int(time_module.time())
-        await self._mysql.execute(
+        return await self._mysql.execute(
             """INSERT INTO rank_requests (userid, bid, type, time, blacklisted)
                VALUES (:requester_id, :beatmap_id, :request_type, :requested_at, 0)""",
             {
@@ -271,8 +401,6 @@ class BeatmapsRepository:
                 "requested_at": requested_at,
             },
         )
-        result = await self._mysql.fetch_val("SELECT LAST_INSERT_ID()")
-        return result or 0
 
     async def create_rank_request_with_atomic_limit(
         self,
@@ -284,11 +412,13 @@ class BeatmapsRepository:
         """Atomically create a rank request only if the user is below the daily limit.
 
         Returns the request ID if created, None if the daily limit was reached.
+        The limit is enforced by the insert itself, so callers should not count
+        the user's requests beforehand.
         """
         requested_at = int(time_module.time())
-        today_start = requested_at - (requested_at % 86400)
+        today_start = _today_start(requested_at)
 
-        result = await self._mysql.execute(
+        request_id = await self._mysql.execute(
             """INSERT INTO rank_requests (userid, bid, type, time, blacklisted)
                SELECT :requester_id, :beatmap_id, :request_type, :requested_at, 0
                FROM dual
@@ -306,30 +436,18 @@ class BeatmapsRepository:
             },
         )
 
-        if result == 0:
-            return None
-
-        request_id = await self._mysql.fetch_val("SELECT LAST_INSERT_ID()")
+        # `execute` returns the inserted row's id, which is 0 when the limit
+        # stopped the insert.
         return request_id or None
 
-    async def find_user_oldest_rank_request_today(
-        self,
-        requester_id: int,
-    ) -> int | None:
-        today_start = int(time_module.time()) - (int(time_module.time()) % 86400)
-
-        result = await self._mysql.fetch_val(
-            """SELECT MIN(time) FROM rank_requests
-               WHERE userid = :requester_id AND time >= :today_start""",
-            {"requester_id": requester_id, "today_start": today_start},
-        )
-        return result
-
     async def list_pending_rank_requests(
         self,
         limit: int = 100,
         offset: int = 0,
     ) -> list[RankRequestWithBeatmapData]:
+        # Each request spans a row per difficulty, so a cursor could end a page
+        # part way through one. The pending queue is small and listed with a total,
+        # so it keeps paging by offset.
         rows = await self._mysql.fetch_all(
             """SELECT
                 r.id as request_id,
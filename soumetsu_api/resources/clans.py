@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import functools
+
 from pydantic import BaseModel
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
-from soumetsu_api.constants import get_mode_suffix
-from soumetsu_api.constants import get_stats_table
+from soumetsu_api.adapters.redis import RedisClient
+from soumetsu_api.constants import MODE_SUFFIXES
+from soumetsu_api.constants import STATS_TABLES
+from soumetsu_api.resources.scores import DIFFICULTY_COLUMNS
 from soumetsu_api.resources.scores import SCORE_TABLES
+from soumetsu_api.utilities.cache import AsyncTTLCache
 
 CLAN_PERM_MEMBER = 1
 CLAN_PERM_OWNER = 2
+CLAN_CACHE_TTL = 60
+MEMBER_COUNT_CACHE_TTL = 300
+
+MEMBER_COUNT_KEY_PREFIX = "soumetsuapi:clan_member_count:"
 
 
 class ClanData(BaseModel):
@@ -35,6 +44,11 @@ class ClanMemberStats(BaseModel):
     total_hits: int
 
 
+class ClanWithMemberStats(BaseModel):
+    clan: ClanData
+    members: list[ClanMemberStats]
+
+
 class ClanTopScore(BaseModel):
     id: int
     player_id: int
@@ -63,13 +77,165 @@ class ClanMemberLeaderboardEntry(BaseModel):
     total_score: int
 
 
+# Columns set by `update`, in the order of its arguments and mask bits.
+_UPDATE_CLAN_COLUMNS = ("name", "description", "tag")
+
+
+@functools.lru_cache(maxsize=1 << len(_UPDATE_CLAN_COLUMNS))
+def _update_clan_query(mask: int) -> str:
+    assignments = ", ".join(
+        f"{column} = :{column}"
+        for bit, column in enumerate(_UPDATE_CLAN_COLUMNS)
+        if mask & (1 << bit)
+    )
+    return f"UPDATE clans SET {assignments} WHERE id = :clan_id"
+
+
+def _member_stats_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT s.pp_{suffix} as pp,
+               s.ranked_score_{suffix} as ranked_score,
+               s.total_score_{suffix} as total_score,
+               s.playcount_{suffix} as playcount,
+               s.replays_watched_{suffix} as replays_watched,
+               s.total_hits_{suffix} as total_hits
+        FROM user_clans uc
+        INNER JOIN {table} s ON uc.user = s.id
+        INNER JOIN users u ON uc.user = u.id
+        WHERE uc.clan = :clan_id
+        AND u.privileges & 1 > 0
+        ORDER BY s.pp_{suffix} DESC
+    """
+
+
+# The stats queries only vary by the mode's table and column suffix, so one query
+# is built per stats table and mode at import, rather than formatted per call.
+_MEMBER_STATS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _member_stats_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
+def _all_member_stats_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT uc.clan, c.name, c.description, c.tag, c.mlimit as member_limit,
+               s.pp_{suffix} as pp,
+               s.ranked_score_{suffix} as ranked_score,
+               s.total_score_{suffix} as total_score,
+               s.playcount_{suffix} as playcount,
+               s.replays_watched_{suffix} as replays_watched,
+               s.total_hits_{suffix} as total_hits
+        FROM user_clans uc
+        INNER JOIN clans c ON uc.clan = c.id
+        INNER JOIN {table} s ON uc.user = s.id
+        INNER JOIN users u ON uc.user = u.id
+        WHERE u.privileges & 1 > 0
+        ORDER BY uc.clan, s.pp_{suffix} DESC
+    """
+
+
+_ALL_MEMBER_STATS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _all_member_stats_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
+def _member_leaderboard_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT s.id, u.username, u.country,
+               s.pp_{suffix} as pp,
+               s.avg_accuracy_{suffix} as accuracy,
+               s.playcount_{suffix} as playcount,
+               s.total_score_{suffix} as total_score
+        FROM user_clans uc
+        INNER JOIN {table} s ON uc.user = s.id
+        INNER JOIN users u ON uc.user = u.id
+        WHERE uc.clan = :clan_id
+        AND u.privileges & 1 > 0
+        ORDER BY s.pp_{suffix} DESC
+    """
+
+
+_MEMBER_LEADERBOARD_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _member_leaderboard_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
+def _top_scores_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT s.id, s.userid as player_id, s.score, s.max_combo,
+               s.full_combo, s.mods, s.accuracy, s.pp, s.playback_rate,
+               b.beatmap_id, b.beatmapset_id, b.song_name,
+               b.{difficulty_column} as difficulty, b.ranked,
+               u.username
+        FROM {table} s
+        INNER JOIN user_clans uc ON s.userid = uc.user
+        INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+        INNER JOIN users u ON s.userid = u.id
+        WHERE uc.clan = :clan_id
+        AND s.play_mode = :mode
+        AND s.completed = 3
+        AND s.pp > 0
+        AND b.ranked = 2
+        AND u.privileges & 1 > 0
+        ORDER BY s.pp DESC
+        LIMIT :limit
+    """
+
+
+_TOP_SCORES_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _top_scores_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Clan lookups by id are shared across requests for a short while. Only hits are
+# cached, and every write to a clan drops its cached entry once it commits. The
+# cache lives in each worker, so the others may serve a clan up to
+# `CLAN_CACHE_TTL` seconds stale after it changes. Reads inside a transaction may
+# see its uncommitted writes, so they neither use nor fill the cache.
+_clans_by_id = AsyncTTLCache[int, ClanData](ttl=CLAN_CACHE_TTL, max_size=10_000)
+
+# Every clan's member stats back both the clan leaderboard and each clan's rank,
+# so they are shared per mode for a short while. Membership changes drop them
+# once they commit.
+_all_member_stats = AsyncTTLCache[tuple[int, int], dict[int, ClanWithMemberStats]](
+    ttl=CLAN_CACHE_TTL,
+    max_size=len(STATS_TABLES) * len(MODE_SUFFIXES),
+)
+
+
+def _cache_clan(clan: ClanData) -> None:
+    _clans_by_id.set(clan.id, clan)
+
+
+async def _invalidate_clan(clan_id: int) -> None:
+    _clans_by_id.invalidate(clan_id)
+
+
 class ClansRepository:
-    __slots__ = ("_mysql",)
+    __slots__ = ("_mysql", "_redis")
 
-    def __init__(self, mysql: ImplementsMySQL) -> None:
+    def __init__(self, mysql: ImplementsMySQL, redis: RedisClient) -> None:
         self._mysql = mysql
+        self._redis = redis
 
     async def get_by_id(self, clan_id: int) -> ClanData | None:
+        cacheable = not self._mysql.in_transaction
+        if cacheable:
+            cached = _clans_by_id.get(clan_id)
+            if cached is not None:
+                return cached
+
         row = await self._mysql.fetch_one(
             """SELECT id, name, description, tag, mlimit as member_limit
                FROM clans WHERE id = :clan_id""",
@@ -78,18 +244,68 @@ class ClansRepository:
         if not row:
             return None
 
-        return ClanData(**row)
+        clan = ClanData(**row)
+        if cacheable:
+            _cache_clan(clan)
+        return clan
+
+    async def get_by_ids(self, clan_ids: list[int]) -> dict[int, ClanData]:
+        """Fetches many clans at once, keyed by id. Missing clans are left out."""
+        cacheable = not self._mysql.in_transaction
+        clans: dict[int, ClanData] = {}
+        missing: list[int] = []
+        for clan_id in clan_ids:
+            cached = _clans_by_id.get(clan_id) if cacheable else None
+            if cached is not None:
+                clans[clan_id] = cached
+            else:
+                missing.append(clan_id)
+
+        if not missing:
+            return clans
+
+        placeholders = ", ".join(f":id_{i}" for i in range(len(missing)))
+        params = {f"id_{i}": clan_id for i, clan_id in enumerate(missing)}
+
+        rows = await self._mysql.fetch_all(
+            f"""SELECT id, name, description, tag, mlimit as member_limit
+                FROM clans WHERE id IN ({placeholders})""",
+            params,
+        )
+        for row in rows:
+            clan = ClanData.model_construct(**row)
+            if cacheable:
+                _cache_clan(clan)
+            clans[clan.id] = clan
 
-    async def get_by_tag(self, tag: str) -> ClanData | None:
+        return clans
+
+    async def get_with_user_perms(
+        self,
+        clan_id: int,
+        user_id: int,
+    ) -> tuple[ClanData, int | None] | None:
+        """Fetches a clan along with the user's perms in it, which are `None` when
+        they are not a member."""
         row = await self._mysql.fetch_one(
-            """SELECT id, name, description, tag, mlimit as member_limit
-               FROM clans WHERE tag = :tag""",
-            {"tag": tag},
+            """SELECT c.id, c.name, c.description, c.tag,
+                      c.mlimit as member_limit, uc.perms
+               FROM clans c
+               LEFT JOIN user_clans uc ON uc.clan = c.id AND uc.user = :user_id
+               WHERE c.id = :clan_id""",
+            {"clan_id": clan_id, "user_id": user_id},
         )
         if not row:
             return None
 
-        return ClanData(**row)
+        clan = ClanData(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            tag=row["tag"],
+            member_limit=row["member_limit"],
+        )
+        return clan, row["perms"]
 
     async def search(
         self,
@@ -98,12 +314,14 @@ class ClansRepository:
         offset: int = 0,
     ) -> list[ClanData]:
         if query:
+            # Names are matched by prefix, so the search can use an index on
+            # `name` rather than scanning every clan for a substring.
             rows = await self._mysql.fetch_all(
                 """SELECT id, name, description, tag, mlimit as member_limit
                    FROM clans WHERE name LIKE :query
                    ORDER BY id DESC
                    LIMIT :limit OFFSET :offset""",
-                {"query": f"%{query}%", "limit": limit, "offset": offset},
+                {"query": f"{_escape_like(query)}%", "limit": limit, "offset": offset},
             )
         else:
             rows = await self._mysql.fetch_all(
@@ -114,7 +332,7 @@ class ClansRepository:
                 {"limit": limit, "offset": offset},
             )
 
-        return [ClanData(**row) for row in rows]
+        return [ClanData.model_construct(**row) for row in rows]
 
     async def create(
         self,
@@ -135,40 +353,34 @@ class ClansRepository:
         description: str | None = None,
         tag: str | None = None,
     ) -> None:
-        updates = []
+        fields = (name, description, tag)
         params: dict[str, int | str] = {"clan_id": clan_id}
+        mask = 0
 
-        if name is not None:
-            updates.append("name = :name")
-            params["name"] = name
+        for bit, (column, value) in enumerate(zip(_UPDATE_CLAN_COLUMNS, fields)):
+            if value is not None:
+                mask |= 1 << bit
+                params[column] = value
 
-        if description is not None:
-            updates.append("description = :description")
-            params["description"] = description
-
-        if tag is not None:
-            updates.append("tag = :tag")
-            params["tag"] = tag
-
-        if not updates:
+        if not mask:
             return
 
-        query = f"UPDATE clans SET {', '.join(updates)} WHERE id = :clan_id"
-        await self._mysql.execute(query, params)
+        await self._mysql.execute(_update_clan_query(mask), params)
+        await self._mysql.after_commit(functools.partial(_invalidate_clan, clan_id))
 
     async def delete(self, clan_id: int) -> None:
+        # The schema has no cascading foreign keys, so the clan, its members and
+        # its invites are removed together in one multi-table statement.
         await self._mysql.execute(
-            "DELETE FROM user_clans WHERE clan = :clan_id",
-            {"clan_id": clan_id},
-        )
-        await self._mysql.execute(
-            "DELETE FROM clans_invites WHERE clan = :clan_id",
-            {"clan_id": clan_id},
-        )
-        await self._mysql.execute(
-            "DELETE FROM clans WHERE id = :clan_id",
+            """DELETE c, uc, ci
+               FROM clans c
+               LEFT JOIN user_clans uc ON uc.clan = c.id
+               LEFT JOIN clans_invites ci ON ci.clan = c.id
+               WHERE c.id = :clan_id""",
             {"clan_id": clan_id},
         )
+        await self._mysql.after_commit(functools.partial(_invalidate_clan, clan_id))
+        await self._invalidate_membership(clan_id)
 
     async def get_members(
         self,
@@ -185,15 +397,67 @@ class ClansRepository:
                LIMIT :limit OFFSET :offset""",
             {"clan_id": clan_id, "limit": limit, "offset": offset},
         )
-        return [ClanMemberData(**row) for row in rows]
+        return [ClanMemberData.model_construct(**row) for row in rows]
 
     async def get_member_count(self, clan_id: int) -> int:
+        # Member counts are shown on every clan page, so they are kept in Redis to
+        # be shared between workers. Joining or leaving drops the cached count once
+        # it commits. A count taken inside a transaction may include its own
+        # uncommitted changes, so it is neither read from nor written to Redis.
+        if self._mysql.in_transaction:
+            return await self._count_members(clan_id)
+
+        key = f"{MEMBER_COUNT_KEY_PREFIX}{clan_id}"
+        cached = await self._redis.get(key)
+        if cached is not None:
+            return int(cached)
+
+        count = await self._count_members(clan_id)
+        await self._redis.set(key, count, ex=MEMBER_COUNT_CACHE_TTL)
+        return count
+
+    async def _count_members(self, clan_id: int) -> int:
         result = await self._mysql.fetch_val(
             "SELECT COUNT(*) FROM user_clans WHERE clan = :clan_id",
             {"clan_id": clan_id},
         )
         return result or 0
 
+    async def _invalidate_membership(self, clan_id: int) -> None:
+        await self._mysql.after_commit(
+            functools.partial(self._drop_membership_caches, clan_id),
+        )
+
+    async def _drop_membership_caches(self, clan_id: int) -> None:
+        _all_member_stats.clear()
+        await self._redis.delete(f"{MEMBER_COUNT_KEY_PREFIX}{clan_id}")
+
+    async def get_member_counts(self, clan_ids: list[int]) -> dict[int, int]:
+        """Counts the members of many clans at once. Clans without members are
+        left out."""
+        if not clan_ids:
+            return {}
+
+        placeholders = ", ".join(f":id_{i}" for i in range(len(clan_ids)))
+        params = {f"id_{i}": clan_id for i, clan_id in enumerate(clan_ids)}
+
+        rows = await self._mysql.fetch_all(
+            f"""SELECT clan, COUNT(*) AS member_count FROM user_clans
+                WHERE clan IN ({placeholders})
+                GROUP BY clan""",
+            params,
+        )
+        return {row["clan"]: row["member_count"] for row in rows}
+
+    async def get_all_member_counts(self) -> dict[int, int]:
+        """Counts the members of every clan in one grouped query. Clans without
+        members are left out."""
+        rows = await self._mysql.fetch_all(
+            """SELECT clan, COUNT(*) AS member_count FROM user_clans
+               GROUP BY clan""",
+        )
+        return {row["clan"]: row["member_count"] for row in rows}
+
     async def get_user_clan(self, user_id: int) -> int | None:
         result = await self._mysql.fetch_val(
             "SELECT clan FROM user_clans WHERE user = :user_id",
@@ -219,6 +483,7 @@ class ClansRepository:
                VALUES (:user_id, :clan_id, :perms)""",
             {"user_id": user_id, "clan_id": clan_id, "perms": perms},
         )
+        await self._invalidate_membership(clan_id)
 
     async def add_member_with_atomic_limit(
         self,
@@ -227,10 +492,17 @@ class ClansRepository:
         limit: int,
         perms: int = CLAN_PERM_MEMBER,
     ) -> bool:
-        """Atomically add a member only if the clan is below the limit.
+        """Atomically add a member only if the clan is below the limit. Must be
+        called within a transaction.
 
         Returns True if the member was added, False if the clan was full.
         """
+        # Locking the clan's row serialises concurrent joins to the same clan, so
+        # two of them can't both count the clan as below its limit.
+        await self._mysql.fetch_val(
+            "SELECT id FROM clans WHERE id = :clan_id FOR UPDATE",
+            {"clan_id": clan_id},
+        )
         result = await self._mysql.execute(
             """INSERT INTO user_clans (user, clan, perms)
                SELECT :user_id, :clan_id, :perms
@@ -243,27 +515,38 @@ class ClansRepository:
                 "limit": limit,
             },
         )
-        return result > 0
+        if not result:
+            return False
+
+        await self._invalidate_membership(clan_id)
+        return True
 
     async def remove_member(self, clan_id: int, user_id: int) -> None:
         await self._mysql.execute(
             "DELETE FROM user_clans WHERE user = :user_id AND clan = :clan_id",
             {"user_id": user_id, "clan_id": clan_id},
         )
+        await self._invalidate_membership(clan_id)
 
     async def name_exists(self, name: str) -> bool:
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM clans WHERE name = :name",
+        exists = await self._mysql.fetch_val(
+            "SELECT EXISTS(SELECT 1 FROM clans WHERE name = :name)",
             {"name": name},
         )
-        return count > 0
+        return bool(exists)
 
-    async def tag_exists(self, tag: str) -> bool:
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM clans WHERE tag = :tag",
-            {"tag": tag},
+    async def name_or_tag_exists(self, name: str, tag: str) -> tuple[bool, bool]:
+        """Checks whether a clan name and tag are taken in a single query."""
+        row = await self._mysql.fetch_one(
+            """SELECT COALESCE(SUM(name = :name), 0) AS name_taken,
+                      COALESCE(SUM(tag = :tag), 0) AS tag_taken
+               FROM clans WHERE name = :name OR tag = :tag""",
+            {"name": name, "tag": tag},
         )
-        return count > 0
+        if not row:
+            return False, False
+
+        return bool(row["name_taken"]), bool(row["tag_taken"])
 
     async def get_invite(self, clan_id: int) -> str | None:
         result = await self._mysql.fetch_val(
@@ -293,32 +576,66 @@ class ClansRepository:
         mode: int,
         custom_mode: int,
     ) -> list[ClanMemberStats]:
-        table = get_stats_table(custom_mode)
-        suffix = get_mode_suffix(mode)
-
-        query = f"""
-            SELECT s.pp_{suffix} as pp,
-                   s.ranked_score_{suffix} as ranked_score,
-                   s.total_score_{suffix} as total_score,
-                   s.playcount_{suffix} as playcount,
-                   s.replays_watched_{suffix} as replays_watched,
-                   s.total_hits_{suffix} as total_hits
-            FROM user_clans uc
-            INNER JOIN {table} s ON uc.user = s.id
-            INNER JOIN users u ON uc.user = u.id
-            WHERE uc.clan = :clan_id
-            AND u.privileges & 1 > 0
-            ORDER BY s.pp_{suffix} DESC
-        """
-        rows = await self._mysql.fetch_all(query, {"clan_id": clan_id})
-        return [ClanMemberStats(**row) for row in rows]
-
-    async def get_all_clan_ids(self) -> list[int]:
         rows = await self._mysql.fetch_all(
-            "SELECT id FROM clans ORDER BY id",
-            {},
+            _MEMBER_STATS_QUERIES[custom_mode, mode],
+            {"clan_id": clan_id},
         )
-        return [row["id"] for row in rows]
+        return [ClanMemberStats.model_construct(**row) for row in rows]
+
+    async def get_all_clan_member_stats(
+        self,
+        mode: int,
+        custom_mode: int,
+    ) -> dict[int, ClanWithMemberStats]:
+        """Fetches every clan along with its member stats in one query, keyed by
+        clan id in ascending order. Clans without unrestricted members are left
+        out."""
+        # Stats read inside a transaction may include its uncommitted membership
+        # changes, so they are never shared with other requests.
+        if self._mysql.in_transaction:
+            return await self._load_all_clan_member_stats(mode, custom_mode)
+
+        return await _all_member_stats.get_or_load(
+            (custom_mode, mode),
+            lambda: self._load_all_clan_member_stats(mode, custom_mode),
+        )
+
+    async def _load_all_clan_member_stats(
+        self,
+        mode: int,
+        custom_mode: int,
+    ) -> dict[int, ClanWithMemberStats]:
+        # This covers every clan member on the server, so rows are consumed as they
+        # are read rather than all materialised into a list first.
+        stats: dict[int, ClanWithMemberStats] = {}
+        async for row in self._mysql.iterate(
+            _ALL_MEMBER_STATS_QUERIES[custom_mode, mode],
+            {},
+        ):
+            clan_stats = stats.get(row["clan"])
+            if clan_stats is None:
+                clan_stats = stats[row["clan"]] = ClanWithMemberStats.model_construct(
+                    clan=ClanData.model_construct(
+                        id=row["clan"],
+                        name=row["name"],
+                        description=row["description"],
+                        tag=row["tag"],
+                        member_limit=row["member_limit"],
+                    ),
+                    members=[],
+                )
+
+            clan_stats.members.append(
+                ClanMemberStats.model_construct(
+                    pp=row["pp"],
+                    ranked_score=row["ranked_score"],
+                    total_score=row["total_score"],
+                    playcount=row["playcount"],
+                    replays_watched=row["replays_watched"],
+                    total_hits=row["total_hits"],
+                ),
+            )
+        return stats
 
     async def get_clan_top_scores(
         self,
@@ -327,38 +644,17 @@ class ClansRepository:
         custom_mode: int,
         limit: int = 4,
     ) -> list[ClanTopScore]:
-        table = SCORE_TABLES[custom_mode]
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.userid as player_id, s.score, s.max_combo,
-                   s.full_combo, s.mods, s.accuracy, s.pp, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked,
-                   u.username
-            FROM {table} s
-            INNER JOIN user_clans uc ON s.userid = uc.user
-            INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-            INNER JOIN users u ON s.userid = u.id
-            WHERE uc.clan = :clan_id
-            AND s.play_mode = :mode
-            AND s.completed = 3
-            AND s.pp > 0
-            AND b.ranked = 2
-            AND u.privileges & 1 > 0
-            ORDER BY s.pp DESC
-            LIMIT :limit
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _TOP_SCORES_QUERIES[custom_mode, mode],
             {"clan_id": clan_id, "mode": mode, "limit": limit},
         )
-        return [ClanTopScore(**row) for row in rows]
+        # Like score listings, only the TINYINT `full_combo` flag needs converting.
+        return [
+            ClanTopScore.model_construct(
+                **{**row, "full_combo": bool(row["full_combo"])},
+            )
+            for row in rows
+        ]
 
     async def get_clan_member_leaderboard(
         self,
@@ -366,24 +662,11 @@ class ClansRepository:
         mode: int,
         custom_mode: int,
     ) -> list[ClanMemberLeaderboardEntry]:
-        table = get_stats_table(custom_mode)
-        suffix = get_mode_suffix(mode)
-
-        query = f"""
-            SELECT s.id, u.username, u.country,
-                   s.pp_{suffix} as pp,
-                   s.avg_accuracy_{suffix} as accuracy,
-                   s.playcount_{suffix} as playcount,
-                   s.total_score_{suffix} as total_score
-            FROM user_clans uc
-            INNER JOIN {table} s ON uc.user = s.id
-            INNER JOIN users u ON uc.user = u.id
-            WHERE uc.clan = :clan_id
-            AND u.privileges & 1 > 0
-            ORDER BY s.pp_{suffix} DESC
-        """
-        rows = await self._mysql.fetch_all(query, {"clan_id": clan_id})
-        return [ClanMemberLeaderboardEntry(**row) for row in rows]
+        rows = await self._mysql.fetch_all(
+            _MEMBER_LEADERBOARD_QUERIES[custom_mode, mode],
+            {"clan_id": clan_id},
+        )
+        return [ClanMemberLeaderboardEntry.model_construct(**row) for row in rows]
 
     async def get_total_count(self) -> int:
         result = await self._mysql.fetch_val("SELECT COUNT(*) FROM clans")
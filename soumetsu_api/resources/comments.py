@@ -14,6 +14,15 @@ class CommentData(BaseModel):
     author_username: str
 
 
+# Comments are always read with their author's username, so every lookup shares
+# one select list and join.
+_COMMENTS_SELECT = """SELECT c.id, c.op as author_id, c.prof as profile_id,
+                             c.msg as message, c.comment_date as created_at,
+                             u.username as author_username
+                      FROM user_comments c
+                      INNER JOIN users u ON c.op = u.id"""
+
+
 class CommentsRepository:
     __slots__ = ("_mysql",)
 
@@ -22,12 +31,7 @@ class CommentsRepository:
 
     async def find_by_id(self, comment_id: int) -> CommentData | None:
         row = await self._mysql.fetch_one(
-            """SELECT c.id, c.op as author_id, c.prof as profile_id,
-                      c.msg as message, c.comment_date as created_at,
-                      u.username as author_username
-               FROM user_comments c
-               INNER JOIN users u ON c.op = u.id
-               WHERE c.id = :comment_id""",
+            f"{_COMMENTS_SELECT} WHERE c.id = :comment_id",
             {"comment_id": comment_id},
         )
         if not row:
@@ -42,17 +46,13 @@ class CommentsRepository:
         offset: int = 0,
     ) -> list[CommentData]:
         rows = await self._mysql.fetch_all(
-            """SELECT c.id, c.op as author_id, c.prof as profile_id,
-                      c.msg as message, c.comment_date as created_at,
-                      u.username as author_username
-               FROM user_comments c
-               INNER JOIN users u ON c.op = u.id
-               WHERE c.prof = :profile_id
-               ORDER BY c.comment_date DESC
-               LIMIT :limit OFFSET :offset""",
+            f"""{_COMMENTS_SELECT}
+                WHERE c.prof = :profile_id
+                ORDER BY c.comment_date DESC
+                LIMIT :limit OFFSET :offset""",
             {"profile_id": profile_id, "limit": limit, "offset": offset},
         )
-        return [CommentData(**row) for row in rows]
+        return [CommentData.model_construct(**row) for row in rows]
 
     async def create(
         self,
@@ -11,6 +11,27 @@ class FriendData(BaseModel):
     country: str
 
 
+# Friends are listed by username, with the user id breaking ties so pages never
+# overlap. A listing may continue after the last friend a client received
+# instead of skipping rows with an offset.
+_AFTER_CONDITION = (
+    "AND (u.username > :after_username"
+    " OR (u.username = :after_username AND u.id > :after_user_id))"
+)
+
+_FRIENDS_QUERIES = tuple(
+    f"""SELECT u.id as user_id, u.username, u.country
+        FROM users_relationships r
+        INNER JOIN users u ON r.user2 = u.id
+        WHERE r.user1 = :user_id
+        AND u.privileges & 1 = 1
+        {condition}
+        ORDER BY u.username ASC, u.id ASC
+        LIMIT :limit OFFSET :offset"""
+    for condition in ("", _AFTER_CONDITION)
+)
+
+
 class FriendsRepository:
     __slots__ = ("_mysql",)
 
@@ -22,18 +43,22 @@ class FriendsRepository:
         user_id: int,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[str, int] | None = None,
     ) -> list[FriendData]:
+        params: dict[str, str | int] = {
+            "user_id": user_id,
+            "limit": limit,
+            "offset": offset,
+        }
+        if after is not None:
+            params["after_username"], params["after_user_id"] = after
+            params["offset"] = 0
+
         rows = await self._mysql.fetch_all(
-            """SELECT u.id as user_id, u.username, u.country
-               FROM users_relationships r
-               INNER JOIN users u ON r.user2 = u.id
-               WHERE r.user1 = :user_id
-               AND u.privileges & 1 = 1
-               ORDER BY u.username ASC
-               LIMIT :limit OFFSET :offset""",
-            {"user_id": user_id, "limit": limit, "offset": offset},
+            _FRIENDS_QUERIES[after is not None],
+            params,
         )
-        return [FriendData(**row) for row in rows]
+        return [FriendData.model_construct(**row) for row in rows]
 
     async def get_followers(
         self,
@@ -47,19 +72,21 @@ class FriendsRepository:
                INNER JOIN users u ON r.user1 = u.id
                WHERE r.user2 = :user_id
                AND u.privileges & 1 = 1
-               ORDER BY u.username ASC
+               ORDER BY u.username ASC, u.id ASC
                LIMIT :limit OFFSET :offset""",
             {"user_id": user_id, "limit": limit, "offset": offset},
         )
-        return [FriendData(**row) for row in rows]
+        return [FriendData.model_construct(**row) for row in rows]
 
     async def is_friend(self, user_id: int, friend_id: int) -> bool:
-        count = await self._mysql.fetch_val(
-            """SELECT COUNT(*) FROM users_relationships
-               WHERE user1 = :user_id AND user2 = :friend_id""",
+        exists = await self._mysql.fetch_val(
+            """SELECT EXISTS(
+                   SELECT 1 FROM users_relationships
+                   WHERE user1 = :user_id AND user2 = :friend_id
+               )""",
             {"user_id": user_id, "friend_id": friend_id},
         )
-        return count > 0
+        return bool(exists)
 
     async def add_friend(self, user_id: int, friend_id: int) -> None:
         await self._mysql.execute(
@@ -75,30 +102,44 @@ class FriendsRepository:
             {"user_id": user_id, "friend_id": friend_id},
         )
 
-    async def is_mutual(self, user_id: int, friend_id: int) -> bool:
-        count = await self._mysql.fetch_val(
-            """SELECT COUNT(*) FROM users_relationships r1
-               INNER JOIN users_relationships r2
-               ON r1.user1 = r2.user2 AND r1.user2 = r2.user1
-               WHERE r1.user1 = :user_id AND r1.user2 = :friend_id""",
-            {"user_id": user_id, "friend_id": friend_id},
-        )
-        return count > 0
+    async def get_mutual_ids(self, user_id: int, friend_ids: list[int]) -> set[int]:
+        """Returns which of the user's friends have also added them back.
 
-    async def get_follower_count(self, user_id: int) -> int:
-        count = await self._mysql.fetch_val(
-            """SELECT COUNT(*) FROM users_relationships r
-               INNER JOIN users u ON r.user1 = u.id
-               WHERE r.user2 = :user_id AND u.privileges & 1 = 1""",
-            {"user_id": user_id},
+        The user's own side of each relationship is known from `friend_ids`, so
+        only the reverse rows are looked up, as point lookups rather than a
+        self-join.
+        """
+        if not friend_ids:
+            return set()
+
+        placeholders = ", ".join(f":id_{i}" for i in range(len(friend_ids)))
+        params = {f"id_{i}": friend_id for i, friend_id in enumerate(friend_ids)}
+        params["user_id"] = user_id
+
+        rows = await self._mysql.fetch_all(
+            f"""SELECT user1 FROM users_relationships
+                WHERE user2 = :user_id AND user1 IN ({placeholders})""",
+            params,
         )
-        return count or 0
+        return {row["user1"] for row in rows}
 
-    async def get_friend_count(self, user_id: int) -> int:
-        count = await self._mysql.fetch_val(
-            """SELECT COUNT(*) FROM users_relationships r
-               INNER JOIN users u ON r.user2 = u.id
-               WHERE r.user1 = :user_id AND u.privileges & 1 = 1""",
+    async def get_counts(self, user_id: int) -> tuple[int, int]:
+        """Counts a user's followers and friends in a single query, returned in
+        that order."""
+        row = await self._mysql.fetch_one(
+            """SELECT (
+                   SELECT COUNT(*) FROM users_relationships r
+                   INNER JOIN users u ON r.user1 = u.id
+                   WHERE r.user2 = :user_id AND u.privileges & 1 = 1
+               ) AS follower_count,
+               (
+                   SELECT COUNT(*) FROM users_relationships r
+                   INNER JOIN users u ON r.user2 = u.id
+                   WHERE r.user1 = :user_id AND u.privileges & 1 = 1
+               ) AS friend_count""",
             {"user_id": user_id},
         )
-        return count or 0
+        if not row:
+            return 0, 0
+
+        return row["follower_count"] or 0, row["friend_count"] or 0
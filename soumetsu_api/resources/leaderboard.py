@@ -4,8 +4,10 @@ from pydantic import BaseModel
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
 from soumetsu_api.adapters.redis import RedisClient
+from soumetsu_api.constants import MODE_SUFFIXES
+from soumetsu_api.constants import STATS_TABLES
 from soumetsu_api.constants import get_mode_suffix
-from soumetsu_api.constants import get_stats_table
+from soumetsu_api.utilities.levels import calculate_level
 
 
 class LeaderboardModeStats(BaseModel):
@@ -55,42 +57,88 @@ def _build_leaderboard_key(
     return base_key
 
 
-def _calculate_level(total_score: int) -> float:
-    if total_score <= 0:
-        return 1.0
-
-    level = 1
-    score_req = 0
-
-    while score_req <= total_score:
-        level += 1
-        if level <= 100:
-            score_req += (
-                5000 // 3 * (4 * (level**3) - 3 * (level**2) - level)
-                + 1250 * (1.8 ** (level - 60)) // 3
-            )
-        else:
-            score_req += 26931190829 + 100000000000 * (level - 100)
-
-        if level > 120:
-            break
-
-    progress = 0.0
-    if level > 1:
-        prev_req = 0
-        for lv in range(2, level):
-            if lv <= 100:
-                prev_req += (
-                    5000 // 3 * (4 * (lv**3) - 3 * (lv**2) - lv)
-                    + 1250 * (1.8 ** (lv - 60)) // 3
-                )
-            else:
-                prev_req += 26931190829 + 100000000000 * (lv - 100)
-
-        if score_req > prev_req:
-            progress = (total_score - prev_req) / (score_req - prev_req)
-
-    return float(level - 1) + progress
+def _rank_position(rank: int | None) -> int:
+    if rank is None:
+        return 0
+    return rank + 1
+
+
+# The service caps leaderboard pages at this many users.
+_MAX_PAGE_SIZE = 100
+
+# A page's ids are bound as parameters, with the placeholder list for every page
+# size built once at import. The same list feeds both the IN and FIELD clauses.
+_ID_PARAMS = tuple(f"id_{i}" for i in range(_MAX_PAGE_SIZE))
+_ID_PLACEHOLDERS = tuple(
+    ", ".join(f":{param}" for param in _ID_PARAMS[:size])
+    for size in range(_MAX_PAGE_SIZE + 1)
+)
+
+
+def _page_users_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT s.id, u.username, u.country, u.privileges,
+               s.pp_{suffix} as pp,
+               s.avg_accuracy_{suffix} as accuracy,
+               s.playcount_{suffix} as playcount,
+               s.total_score_{suffix} as total_score
+        FROM {table} s
+        INNER JOIN users u ON s.id = u.id
+        WHERE s.id IN ({{id_list}})
+        ORDER BY FIELD(s.id, {{id_list}})
+    """
+
+
+# The stats columns for a leaderboard page only vary by table and mode, so the
+# queries are built once at import with the page's placeholders left to fill in.
+_PAGE_USERS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _page_users_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
+def _rank_for_pp_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT COUNT(*)
+        FROM {table} s
+        INNER JOIN users u ON s.id = u.id
+        WHERE s.pp_{suffix} > :pp
+        AND u.privileges & 1 > 0
+    """
+
+
+_RANK_FOR_PP_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _rank_for_pp_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
+# First places are listed oldest first, with the score id breaking ties so pages
+# never overlap. A listing may continue after the last first place a client
+# received instead of skipping rows with an offset.
+_FIRSTS_AFTER_CONDITION = (
+    "AND (f.timestamp > :after_timestamp"
+    " OR (f.timestamp = :after_timestamp AND f.score_id > :after_score_id))"
+)
+
+_OLDEST_FIRSTS_QUERIES = tuple(
+    f"""
+        SELECT f.user_id as player_id, u.username, f.score_id, f.beatmap_md5,
+               b.song_name, f.pp, f.timestamp as achieved_at, f.mode
+        FROM first_places f
+        INNER JOIN users u ON f.user_id = u.id
+        INNER JOIN beatmaps b ON f.beatmap_md5 = b.beatmap_md5
+        WHERE f.mode = :mode
+        AND f.relax = :relax
+        AND u.privileges & 1 = 1
+        {condition}
+        ORDER BY f.timestamp ASC, f.score_id ASC
+        LIMIT :limit OFFSET :offset
+    """
+    for condition in ("", _FIRSTS_AFTER_CONDITION)
+)
 
 
 class LeaderboardRepository:
@@ -150,22 +198,22 @@ class LeaderboardRepository:
     ) -> int:
         key = _build_leaderboard_key(custom_mode, mode)
         rank = await self._redis.zrevrank(key, str(user_id))
-        if rank is None:
-            return 0
-        return rank + 1
+        return _rank_position(rank)
 
-    async def get_user_country_rank(
+    async def get_user_ranks(
         self,
         user_id: int,
         mode: int,
         custom_mode: int,
         country: str,
-    ) -> int:
-        key = _build_leaderboard_key(custom_mode, mode, country)
-        rank = await self._redis.zrevrank(key, str(user_id))
-        if rank is None:
-            return 0
-        return rank + 1
+    ) -> tuple[int, int]:
+        """Fetches a user's global and country ranks in a single round trip."""
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zrevrank(_build_leaderboard_key(custom_mode, mode), str(user_id))
+        pipe.zrevrank(_build_leaderboard_key(custom_mode, mode, country), str(user_id))
+        global_rank, country_rank = await pipe.execute()
+
+        return _rank_position(global_rank), _rank_position(country_rank)
 
     async def get_user_pp(
         self,
@@ -187,58 +235,56 @@ class LeaderboardRepository:
         if not user_ids:
             return []
 
-        table = get_stats_table(custom_mode)
-        suffix = get_mode_suffix(mode)
-
-        placeholders = ", ".join(f":id_{i}" for i in range(len(user_ids)))
-        params = {f"id_{i}": int(uid) for i, uid in enumerate(user_ids)}
-
-        query = f"""
-            SELECT s.id, u.username, u.country, u.privileges,
-                   s.pp_{suffix} as pp,
-                   s.avg_accuracy_{suffix} as accuracy,
-                   s.playcount_{suffix} as playcount,
-                   s.total_score_{suffix} as total_score
-            FROM {table} s
-            INNER JOIN users u ON s.id = u.id
-            WHERE s.id IN ({placeholders})
-        """
-
-        rows = await self._mysql.fetch_all(query, params)
-        user_data = {row["id"]: row for row in rows}
-
-        entries = []
-        for i, uid_str in enumerate(user_ids):
-            uid = int(uid_str)
-            row = user_data.get(uid)
-            if not row:
-                continue
-
-            country_rank = await self.get_user_country_rank(
-                uid,
-                mode,
-                custom_mode,
-                row["country"],
-            )
+        ids = [int(uid) for uid in user_ids]
+        query = _PAGE_USERS_QUERIES[custom_mode, mode].format(
+            id_list=_ID_PLACEHOLDERS[len(ids)],
+        )
 
-            entries.append(
-                LeaderboardEntry(
-                    id=row["id"],
-                    username=row["username"],
-                    country=row["country"],
-                    privileges=row["privileges"],
-                    chosen_mode=LeaderboardModeStats(
-                        pp=row["pp"] or 0,
-                        accuracy=row["accuracy"] or 0.0,
-                        playcount=row["playcount"] or 0,
-                        level=_calculate_level(row["total_score"] or 0),
-                    ),
-                    global_rank=base_offset + i + 1,
-                    country_rank=country_rank,
+        rows = await self._mysql.fetch_all(query, dict(zip(_ID_PARAMS, ids)))
+
+        # Rows arrive in ranking order, so they are paired with their position on
+        # the page in one pass, skipping any ranked ids without a row.
+        found = []
+        remaining = iter(rows)
+        row = next(remaining, None)
+        for i, uid in enumerate(ids):
+            if row is None:
+                break
+            if row["id"] == uid:
+                found.append((i, row))
+                row = next(remaining, None)
+
+        base_rank = base_offset + 1
+
+        # A country page is already ordered by country rank, so only global pages
+        # need to look them up, all in a single round trip.
+        if country is not None:
+            country_ranks = [base_rank + i for i, _ in found]
+        else:
+            pipe = self._redis.pipeline(transaction=False)
+            for _, row in found:
+                key = _build_leaderboard_key(custom_mode, mode, row["country"])
+                pipe.zrevrank(key, str(row["id"]))
+            country_ranks = [_rank_position(rank) for rank in await pipe.execute()]
+
+        # Stats columns and Redis ranks already have the model's types.
+        return [
+            LeaderboardEntry.model_construct(
+                id=row["id"],
+                username=row["username"],
+                country=row["country"],
+                privileges=row["privileges"],
+                chosen_mode=LeaderboardModeStats.model_construct(
+                    pp=row["pp"] or 0,
+                    accuracy=row["accuracy"] or 0.0,
+                    playcount=row["playcount"] or 0,
+                    level=calculate_level(row["total_score"] or 0),
                 ),
+                global_rank=base_rank + i,
+                country_rank=country_rank,
             )
-
-        return entries
+            for (i, row), country_rank in zip(found, country_ranks)
+        ]
 
     async def list_oldest_firsts(
         self,
@@ -246,25 +292,19 @@ class LeaderboardRepository:
         custom_mode: int,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[int, int] | None = None,
     ) -> list[FirstPlaceEntry]:
-        query = """
-            SELECT f.user_id as player_id, u.username, f.score_id, f.beatmap_md5,
-                   b.song_name, f.pp, f.timestamp as achieved_at, f.mode
-            FROM first_places f
-            INNER JOIN users u ON f.user_id = u.id
-            INNER JOIN beatmaps b ON f.beatmap_md5 = b.beatmap_md5
-            WHERE f.mode = :mode
-            AND f.relax = :relax
-            AND u.privileges & 1 = 1
-            ORDER BY f.timestamp ASC
-            LIMIT :limit OFFSET :offset
-        """
+        params = {"mode": mode, "relax": custom_mode, "limit": limit, "offset": offset}
+        if after is not None:
+            params["after_timestamp"], params["after_score_id"] = after
+            params["offset"] = 0
+
         rows = await self._mysql.fetch_all(
-            query,
-            {"mode": mode, "relax": custom_mode, "limit": limit, "offset": offset},
+            _OLDEST_FIRSTS_QUERIES[after is not None],
+            params,
         )
 
-        return [FirstPlaceEntry(**row) for row in rows]
+        return [FirstPlaceEntry.model_construct(**row) for row in rows]
 
     async def get_rank_for_pp(
         self,
@@ -273,7 +313,19 @@ class LeaderboardRepository:
         custom_mode: int,
     ) -> int:
         key = _build_leaderboard_key(custom_mode, mode)
-        count = await self._redis.zcount(key, f"({pp}", "+inf")
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcount(key, f"({pp}", "+inf")
+        pipe.zcard(key)
+        count, total = await pipe.execute()
+
+        # An empty leaderboard means it hasn't been built yet, not that nobody is
+        # ranked, so the stats table is counted instead.
+        if not total:
+            count = await self._mysql.fetch_val(
+                _RANK_FOR_PP_QUERIES[custom_mode, mode],
+                {"pp": pp},
+            )
+
         return count + 1
 
     async def get_total_ranked_users(
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import dataclasses
 import time as time_module
-
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
+from soumetsu_api.adapters.mysql import MySQLRow
 
 SCORE_TABLES = ["scores", "scores_relax", "scores_ap"]
 
+# Beatmap difficulty columns, indexed by mode.
+DIFFICULTY_COLUMNS = (
+    "difficulty_std",
+    "difficulty_taiko",
+    "difficulty_ctb",
+    "difficulty_mania",
+)
+
 
-class ScoreData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ScoreData:
     id: int
     beatmap_md5: str
     player_id: int
@@ -32,6 +42,7 @@ class ScoreData(BaseModel):
     playback_rate: float
 
 
+@dataclass(slots=True, frozen=True)
 class ScoreWithBeatmap(ScoreData):
     beatmap_id: int
     beatmapset_id: int
@@ -40,54 +51,257 @@ class ScoreWithBeatmap(ScoreData):
     ranked: int
 
 
-class ScorePlayer(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ScorePlayer:
     player_id: int
     username: str
     country: str
 
 
+@dataclass(slots=True, frozen=True)
 class ScoreWithPlayer(ScoreData):
     player: ScorePlayer
 
 
+@dataclass(slots=True, frozen=True)
 class ScoreTopPlay(ScoreWithBeatmap):
     username: str
 
 
+@dataclass(slots=True, frozen=True)
 class ScoreTopPlayWithMode(ScoreTopPlay):
     custom_mode: int = 0
 
 
+_SCORE_FIELDS = tuple(field.name for field in dataclasses.fields(ScoreData))
+
+
+# Every score listing goes through here, so `full_combo` is the one column
+# converted by hand on its way into the dataclass.
+def _score_from_row[T: ScoreData](score_type: type[T], row: MySQLRow) -> T:
+    return score_type(**{**row, "full_combo": bool(row["full_combo"])})
+
+
+def _score_with_player_from_row(row: MySQLRow) -> ScoreWithPlayer:
+    score = {field: row[field] for field in _SCORE_FIELDS}
+    score["full_combo"] = bool(score["full_combo"])
+
+    return ScoreWithPlayer(
+        **score,
+        player=ScorePlayer(
+            player_id=row["player_db_id"],
+            username=row["username"],
+            country=row["country"],
+        ),
+    )
+
+
+_SCORE_COLUMNS = """
+    s.id, s.beatmap_md5, s.userid as player_id, s.score,
+    s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
+    s.100_count as count_100, s.50_count as count_50,
+    s.katus_count as count_katus, s.gekis_count as count_gekis,
+    s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
+    s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate
+"""
+
+
+def _beatmap_columns(difficulty_column: str) -> str:
+    return f"""
+        b.beatmap_id, b.beatmapset_id, b.song_name,
+        b.{difficulty_column} as difficulty, b.ranked
+    """
+
+
+# Every query only varies by score table and mode, so they are all built once at
+# import and looked up by `(custom_mode, mode)`, or by `custom_mode` alone.
+_FIND_BY_ID_QUERIES: tuple[str, ...] = tuple(
+    f"""
+        SELECT {_SCORE_COLUMNS}
+        FROM {table} s
+        WHERE s.id = :score_id
+    """
+    for table in SCORE_TABLES
+)
+
+
+def _player_best_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS}, {_beatmap_columns(difficulty_column)}
+        FROM {table} s
+        INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+        WHERE s.userid = :player_id
+        AND s.play_mode = :mode
+        AND s.completed = 3
+        AND b.ranked = 2
+        ORDER BY s.pp DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_PLAYER_BEST_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _player_best_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+
+def _player_recent_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS}, {_beatmap_columns(difficulty_column)}
+        FROM {table} s
+        INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+        WHERE s.userid = :player_id
+        AND s.play_mode = :mode
+        ORDER BY s.time DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_PLAYER_RECENT_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _player_recent_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+
+def _player_firsts_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS}, {_beatmap_columns(difficulty_column)}
+        FROM first_places f
+        INNER JOIN {table} s ON f.score_id = s.id
+        INNER JOIN beatmaps b ON f.beatmap_md5 = b.beatmap_md5
+        WHERE f.user_id = :player_id
+        AND f.mode = :mode
+        AND f.relax = :relax
+        ORDER BY f.timestamp DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_PLAYER_FIRSTS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _player_firsts_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+
+def _player_pinned_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS}, {_beatmap_columns(difficulty_column)}
+        FROM user_pinned p
+        INNER JOIN {table} s ON p.scoreid = s.id
+        INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+        WHERE p.userid = :player_id
+        AND s.play_mode = :mode
+        ORDER BY p.pin_date DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_PLAYER_PINNED_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _player_pinned_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+
+def _top_plays_query(table: str, difficulty_column: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS}, {_beatmap_columns(difficulty_column)},
+               u.username
+        FROM {table} s
+        INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+        INNER JOIN users u ON s.userid = u.id
+        WHERE s.play_mode = :mode
+        AND s.completed = 3
+        AND s.pp > 0
+        AND b.ranked = 2
+        AND u.privileges & 1 > 0
+        ORDER BY s.pp DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_TOP_PLAYS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _top_plays_query(table, difficulty_column)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for mode, difficulty_column in enumerate(DIFFICULTY_COLUMNS)
+}
+
+# Valid combinations:
+# custom_mode 0 (vanilla): modes 0,1,2,3 (std, taiko, ctb, mania)
+# custom_mode 1 (relax): modes 0,1,2 (std, taiko, ctb)
+# custom_mode 2 (autopilot): mode 0 only (std)
+_TOP_PLAY_MODES: tuple[tuple[int, ...], ...] = ((0, 1, 2, 3), (0, 1, 2), (0,))
+
+_TOP_PLAYS_ALL_MODES_QUERY = (
+    " UNION ALL ".join(
+        f"""
+        (SELECT {_SCORE_COLUMNS}, {_beatmap_columns(DIFFICULTY_COLUMNS[mode])},
+                u.username, {custom_mode} as custom_mode
+         FROM {table} s
+         INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
+         INNER JOIN users u ON s.userid = u.id
+         WHERE s.play_mode = {mode} AND s.completed = 3 AND s.pp > 0
+           AND b.ranked = 2 AND u.privileges & 1 > 0
+         ORDER BY s.pp DESC LIMIT 1)
+        """
+        for custom_mode, table in enumerate(SCORE_TABLES)
+        for mode in _TOP_PLAY_MODES[custom_mode]
+    )
+    + " ORDER BY pp DESC"
+)
+
+# Beatmap scores are listed by pp, with the score id breaking ties so pages
+# never overlap. A listing may continue after the last score a client received
+# instead of skipping rows with an offset.
+_BEATMAP_SCORES_AFTER_CONDITION = (
+    "AND (s.pp < :after_pp OR (s.pp = :after_pp AND s.id < :after_score_id))"
+)
+
+
+def _beatmap_scores_query(table: str, condition: str) -> str:
+    return f"""
+        SELECT {_SCORE_COLUMNS},
+               u.id as player_db_id, u.username, u.country
+        FROM {table} s
+        INNER JOIN users u ON s.userid = u.id
+        WHERE s.beatmap_md5 = :beatmap_md5
+        AND s.play_mode = :mode
+        AND s.completed = 3
+        {condition}
+        ORDER BY s.pp DESC, s.id DESC
+        LIMIT :limit OFFSET :offset
+    """
+
+
+_BEATMAP_SCORES_QUERIES: dict[tuple[int, bool], str] = {
+    (custom_mode, has_after): _beatmap_scores_query(table, condition)
+    for custom_mode, table in enumerate(SCORE_TABLES)
+    for has_after, condition in ((False, ""), (True, _BEATMAP_SCORES_AFTER_CONDITION))
+}
+
+
 class ScoresRepository:
     __slots__ = ("_mysql",)
 
     def __init__(self, mysql: ImplementsMySQL) -> None:
         self._mysql = mysql
 
-    def _get_table(self, custom_mode: int) -> str:
-        return SCORE_TABLES[custom_mode]
-
     async def find_by_id(
         self,
         score_id: int,
         custom_mode: int,
     ) -> ScoreData | None:
-        table = self._get_table(custom_mode)
-        query = f"""
-            SELECT id, beatmap_md5, userid as player_id, score, max_combo,
-                   full_combo, mods, 300_count as count_300,
-                   100_count as count_100, 50_count as count_50,
-                   katus_count as count_katus, gekis_count as count_gekis,
-                   misses_count as count_misses, time as submitted_at, play_mode,
-                   completed, accuracy, pp, playtime, playback_rate
-            FROM {table}
-            WHERE id = :score_id
-        """
-        row = await self._mysql.fetch_one(query, {"score_id": score_id})
+        row = await self._mysql.fetch_one(
+            _FIND_BY_ID_QUERIES[custom_mode],
+            {"score_id": score_id},
+        )
         if not row:
             return None
 
-        return ScoreData(**row)
+        return _score_from_row(ScoreData, row)
 
     async def list_player_best(
         self,
@@ -97,37 +311,11 @@ class ScoresRepository:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScoreWithBeatmap]:
-        table = self._get_table(custom_mode)
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                   s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked
-            FROM {table} s
-            INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-            WHERE s.userid = :player_id
-            AND s.play_mode = :mode
-            AND s.completed = 3
-            AND b.ranked = 2
-            ORDER BY s.pp DESC
-            LIMIT :limit OFFSET :offset
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _PLAYER_BEST_QUERIES[custom_mode, mode],
             {"player_id": player_id, "mode": mode, "limit": limit, "offset": offset},
         )
-        return [ScoreWithBeatmap(**row) for row in rows]
+        return [_score_from_row(ScoreWithBeatmap, row) for row in rows]
 
     async def list_player_recent(
         self,
@@ -137,35 +325,11 @@ class ScoresRepository:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScoreWithBeatmap]:
-        table = self._get_table(custom_mode)
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                   s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked
-            FROM {table} s
-            INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-            WHERE s.userid = :player_id
-            AND s.play_mode = :mode
-            ORDER BY s.time DESC
-            LIMIT :limit OFFSET :offset
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _PLAYER_RECENT_QUERIES[custom_mode, mode],
             {"player_id": player_id, "mode": mode, "limit": limit, "offset": offset},
         )
-        return [ScoreWithBeatmap(**row) for row in rows]
+        return [_score_from_row(ScoreWithBeatmap, row) for row in rows]
 
     async def list_player_firsts(
         self,
@@ -175,34 +339,8 @@ class ScoresRepository:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScoreWithBeatmap]:
-        table = self._get_table(custom_mode)
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                   s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked
-            FROM first_places f
-            INNER JOIN {table} s ON f.score_id = s.id
-            INNER JOIN beatmaps b ON f.beatmap_md5 = b.beatmap_md5
-            WHERE f.user_id = :player_id
-            AND f.mode = :mode
-            AND f.relax = :relax
-            ORDER BY f.timestamp DESC
-            LIMIT :limit OFFSET :offset
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _PLAYER_FIRSTS_QUERIES[custom_mode, mode],
             {
                 "player_id": player_id,
                 "mode": mode,
@@ -211,7 +349,7 @@ class ScoresRepository:
                 "offset": offset,
             },
         )
-        return [ScoreWithBeatmap(**row) for row in rows]
+        return [_score_from_row(ScoreWithBeatmap, row) for row in rows]
 
     async def list_player_pinned(
         self,
@@ -221,43 +359,21 @@ class ScoresRepository:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScoreWithBeatmap]:
-        table = self._get_table(custom_mode)
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                   s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked
-            FROM user_pinned p
-            INNER JOIN {table} s ON p.scoreid = s.id
-            INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-            WHERE p.userid = :player_id
-            AND s.play_mode = :mode
-            ORDER BY p.pin_date DESC
-            LIMIT :limit OFFSET :offset
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _PLAYER_PINNED_QUERIES[custom_mode, mode],
             {"player_id": player_id, "mode": mode, "limit": limit, "offset": offset},
         )
-        return [ScoreWithBeatmap(**row) for row in rows]
+        return [_score_from_row(ScoreWithBeatmap, row) for row in rows]
 
     async def is_pinned(self, player_id: int, score_id: int) -> bool:
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM user_pinned WHERE userid = :player_id AND scoreid = :score_id",
+        exists = await self._mysql.fetch_val(
+            """SELECT EXISTS(
+                   SELECT 1 FROM user_pinned
+                   WHERE userid = :player_id AND scoreid = :score_id
+               )""",
             {"player_id": player_id, "score_id": score_id},
         )
-        return count > 0
+        return bool(exists)
 
     async def pin_score(self, player_id: int, score_id: int) -> None:
         pinned_at = str(int(time_module.time()))
@@ -285,87 +401,15 @@ class ScoresRepository:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScoreTopPlay]:
-        table = self._get_table(custom_mode)
-        diff_col = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ][mode]
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                   s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   b.beatmap_id, b.beatmapset_id, b.song_name,
-                   b.{diff_col} as difficulty, b.ranked,
-                   u.username
-            FROM {table} s
-            INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-            INNER JOIN users u ON s.userid = u.id
-            WHERE s.play_mode = :mode
-            AND s.completed = 3
-            AND s.pp > 0
-            AND b.ranked = 2
-            AND u.privileges & 1 > 0
-            ORDER BY s.pp DESC
-            LIMIT :limit OFFSET :offset
-        """
         rows = await self._mysql.fetch_all(
-            query,
+            _TOP_PLAYS_QUERIES[custom_mode, mode],
             {"mode": mode, "limit": limit, "offset": offset},
         )
-        return [ScoreTopPlay(**row) for row in rows]
+        return [_score_from_row(ScoreTopPlay, row) for row in rows]
 
     async def list_top_plays_all_modes(self) -> list[ScoreTopPlayWithMode]:
-        # Valid combinations:
-        # custom_mode 0 (vanilla): modes 0,1,2,3 (std, taiko, ctb, mania)
-        # custom_mode 1 (relax): modes 0,1,2 (std, taiko, ctb)
-        # custom_mode 2 (autopilot): mode 0 only (std)
-        diff_cols = [
-            "difficulty_std",
-            "difficulty_taiko",
-            "difficulty_ctb",
-            "difficulty_mania",
-        ]
-
-        mode_queries = []
-        for custom_mode, table in enumerate(SCORE_TABLES):
-            if custom_mode == 0:
-                modes = [0, 1, 2, 3]
-            elif custom_mode == 1:
-                modes = [0, 1, 2]
-            else:
-                modes = [0]
-
-            for mode in modes:
-                diff_col = diff_cols[mode]
-                mode_queries.append(
-                    f"""
-                    (SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score,
-                            s.max_combo, s.full_combo, s.mods, s.300_count as count_300,
-                            s.100_count as count_100, s.50_count as count_50,
-                            s.katus_count as count_katus, s.gekis_count as count_gekis,
-                            s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                            s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                            b.beatmap_id, b.beatmapset_id, b.song_name,
-                            b.{diff_col} as difficulty, b.ranked,
-                            u.username, {custom_mode} as custom_mode
-                     FROM {table} s
-                     INNER JOIN beatmaps b ON s.beatmap_md5 = b.beatmap_md5
-                     INNER JOIN users u ON s.userid = u.id
-                     WHERE s.play_mode = {mode} AND s.completed = 3 AND s.pp > 0
-                       AND b.ranked = 2 AND u.privileges & 1 > 0
-                     ORDER BY s.pp DESC LIMIT 1)
-                """,
-                )
-
-        query = " UNION ALL ".join(mode_queries) + " ORDER BY pp DESC"
-        rows = await self._mysql.fetch_all(query, {})
-        return [ScoreTopPlayWithMode(**row) for row in rows]
+        rows = await self._mysql.fetch_all(_TOP_PLAYS_ALL_MODES_QUERY, {})
+        return [_score_from_row(ScoreTopPlayWithMode, row) for row in rows]
 
     async def list_beatmap_scores(
         self,
@@ -374,61 +418,20 @@ class ScoresRepository:
         custom_mode: int,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[float, int] | None = None,
     ) -> list[ScoreWithPlayer]:
-        table = self._get_table(custom_mode)
-
-        query = f"""
-            SELECT s.id, s.beatmap_md5, s.userid as player_id, s.score, s.max_combo,
-                   s.full_combo, s.mods, s.300_count as count_300,
-                   s.100_count as count_100, s.50_count as count_50,
-                   s.katus_count as count_katus, s.gekis_count as count_gekis,
-                   s.misses_count as count_misses, s.time as submitted_at, s.play_mode,
-                   s.completed, s.accuracy, s.pp, s.playtime, s.playback_rate,
-                   u.id as player_db_id, u.username, u.country
-            FROM {table} s
-            INNER JOIN users u ON s.userid = u.id
-            WHERE s.beatmap_md5 = :beatmap_md5
-            AND s.play_mode = :mode
-            AND s.completed = 3
-            ORDER BY s.pp DESC
-            LIMIT :limit OFFSET :offset
-        """
+        params: dict[str, str | int | float] = {
+            "beatmap_md5": beatmap_md5,
+            "mode": mode,
+            "limit": limit,
+            "offset": offset,
+        }
+        if after is not None:
+            params["after_pp"], params["after_score_id"] = after
+            params["offset"] = 0
+
         rows = await self._mysql.fetch_all(
-            query,
-            {
-                "beatmap_md5": beatmap_md5,
-                "mode": mode,
-                "limit": limit,
-                "offset": offset,
-            },
+            _BEATMAP_SCORES_QUERIES[custom_mode, after is not None],
+            params,
         )
-        return [
-            ScoreWithPlayer(
-                id=row["id"],
-                beatmap_md5=row["beatmap_md5"],
-                player_id=row["player_id"],
-                score=row["score"],
-                max_combo=row["max_combo"],
-                full_combo=row["full_combo"],
-                mods=row["mods"],
-                count_300=row["count_300"],
-                count_100=row["count_100"],
-                count_50=row["count_50"],
-                count_katus=row["count_katus"],
-                count_gekis=row["count_gekis"],
-                count_misses=row["count_misses"],
-                submitted_at=row["submitted_at"],
-                play_mode=row["play_mode"],
-                completed=row["completed"],
-                accuracy=row["accuracy"],
-                pp=row["pp"],
-                playtime=row["playtime"],
-                playback_rate=row["playback_rate"],
-                player=ScorePlayer(
-                    player_id=row["player_db_id"],
-                    username=row["username"],
-                    country=row["country"],
-                ),
-            )
-            for row in rows
-        ]
+        return [_score_with_player_from_row(row) for row in rows]
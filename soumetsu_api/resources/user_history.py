@@ -34,4 +34,4 @@ class UserHistoryRepository:
                LIMIT :limit""",
             {"user_id": user_id, "mode": mode, "limit": limit},
         )
-        return [UserHistoryData(**row) for row in rows]
+        return [UserHistoryData.model_construct(**row) for row in rows]
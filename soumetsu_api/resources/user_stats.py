@@ -3,8 +3,8 @@ from __future__ import annotations
 from pydantic import BaseModel
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
-from soumetsu_api.constants import get_mode_suffix
-from soumetsu_api.constants import get_stats_table
+from soumetsu_api.constants import MODE_SUFFIXES
+from soumetsu_api.constants import STATS_TABLES
 
 
 class UserStatsData(BaseModel):
@@ -40,18 +40,38 @@ class PreferredModeStats(BaseModel):
     playcount: int
 
 
+def _stats_query(table: str, suffix: str) -> str:
+    return f"""
+        SELECT
+            pp_{suffix} as pp,
+            avg_accuracy_{suffix} as accuracy,
+            playcount_{suffix} as playcount,
+            total_score_{suffix} as total_score,
+            ranked_score_{suffix} as ranked_score,
+            total_hits_{suffix} as total_hits,
+            playtime_{suffix} as playtime,
+            max_combo_{suffix} as max_combo,
+            replays_watched_{suffix} as replays_watched,
+            level_{suffix} as level
+        FROM {table}
+        WHERE id = :user_id
+    """
+
+
+# One stats query is built per stats table and mode at import.
+_STATS_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _stats_query(table, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
 class UserStatsRepository:
     __slots__ = ("_mysql",)
 
     def __init__(self, mysql: ImplementsMySQL) -> None:
         self._mysql = mysql
 
-    def _get_table(self, custom_mode: int) -> str:
-        return get_stats_table(custom_mode)
-
-    def _get_mode_suffix(self, mode: int) -> str:
-        return get_mode_suffix(mode)
-
     async def initialise_all(self, user_id: int, username: str) -> None:
         await self._mysql.execute(
             """INSERT INTO users_stats (id, username) VALUES (:id, :username)""",
@@ -74,29 +94,14 @@ class UserStatsRepository:
         mode: int,
         custom_mode: int,
     ) -> UserStatsData | None:
-        table = self._get_table(custom_mode)
-        suffix = self._get_mode_suffix(mode)
-
-        query = f"""
-            SELECT
-                pp_{suffix} as pp,
-                avg_accuracy_{suffix} as accuracy,
-                playcount_{suffix} as playcount,
-                total_score_{suffix} as total_score,
-                ranked_score_{suffix} as ranked_score,
-                total_hits_{suffix} as total_hits,
-                playtime_{suffix} as playtime,
-                max_combo_{suffix} as max_combo,
-                replays_watched_{suffix} as replays_watched,
-                level_{suffix} as level
-            FROM {table}
-            WHERE id = :user_id
-        """
-        row = await self._mysql.fetch_one(query, {"user_id": user_id})
+        row = await self._mysql.fetch_one(
+            _STATS_QUERIES[custom_mode, mode],
+            {"user_id": user_id},
+        )
         if not row:
             return None
 
-        return UserStatsData(
+        return UserStatsData.model_construct(
             pp=row["pp"],
             accuracy=row["accuracy"],
             playcount=row["playcount"],
@@ -138,7 +143,8 @@ class UserStatsRepository:
         if not row:
             return None
 
-        return UserSettingsData(
+        # The TINYINT flags are the only columns validation would coerce.
+        return UserSettingsData.model_construct(
             username_aka=row["username_aka"],
             favourite_mode=row["favourite_mode"],
             prefer_relax=row["prefer_relax"],
@@ -264,7 +270,7 @@ class UserStatsRepository:
             if pc > best[4]:
                 best = (cm, m, row[pp_key] or 0, row[acc_key] or 0.0, pc)
 
-        return PreferredModeStats(
+        return PreferredModeStats.model_construct(
             custom_mode=best[0],
             mode=best[1],
             pp=best[2],
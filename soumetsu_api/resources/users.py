@@ -5,6 +5,10 @@ from dataclasses import dataclass
 from pydantic import BaseModel
 
 from soumetsu_api.adapters.mysql import ImplementsMySQL
+from soumetsu_api.constants import MODE_SUFFIXES
+from soumetsu_api.constants import STATS_TABLES
+from soumetsu_api.resources.discord_oauth import DiscordOAuthData
+from soumetsu_api.resources.user_stats import UserStatsData
 from soumetsu_api.utilities.validation import safe_username
 
 
@@ -26,6 +30,57 @@ class User(BaseModel):
     coins: int
 
 
+@dataclass
+class UserProfileData:
+    user: User
+    clan: ClanInfo | None
+    discord: DiscordOAuthData | None
+    stats: UserStatsData | None
+    first_places: int
+
+
+# The profile page needs the user, their clan, linked Discord account, stats for
+# one mode and first place count, so all of it is fetched in one statement.
+def _profile_query(custom_mode: int, table: str, mode: int, suffix: str) -> str:
+    return f"""
+        SELECT u.id, u.username, u.username_safe, u.privileges, u.country,
+               u.register_datetime AS registered_at, u.latest_activity, u.coins,
+               c.id AS clan_id, c.name AS clan_name, c.tag AS clan_tag,
+               d.discord_id, d.discord_username, d.discord_avatar,
+               s.id AS stats_id,
+               s.pp_{suffix} AS pp,
+               s.avg_accuracy_{suffix} AS accuracy,
+               s.playcount_{suffix} AS playcount,
+               s.total_score_{suffix} AS total_score,
+               s.ranked_score_{suffix} AS ranked_score,
+               s.total_hits_{suffix} AS total_hits,
+               s.playtime_{suffix} AS playtime,
+               s.max_combo_{suffix} AS max_combo,
+               s.replays_watched_{suffix} AS replays_watched,
+               s.level_{suffix} AS level,
+               (
+                   SELECT COUNT(*) FROM first_places fp
+                   WHERE fp.user_id = u.id AND fp.mode = {mode}
+                   AND fp.relax = {custom_mode}
+               ) AS first_places
+        FROM users u
+        LEFT JOIN user_clans uc ON uc.user = u.id
+        LEFT JOIN clans c ON c.id = uc.clan
+        LEFT JOIN discord_oauth d ON d.user_id = u.id
+        LEFT JOIN {table} s ON s.id = u.id
+        WHERE u.id = :user_id
+        LIMIT 1
+    """
+
+
+# One query is built per stats table and mode.
+_PROFILE_QUERIES: dict[tuple[int, int], str] = {
+    (custom_mode, mode): _profile_query(custom_mode, table, mode, suffix)
+    for custom_mode, table in enumerate(STATS_TABLES)
+    for mode, suffix in enumerate(MODE_SUFFIXES)
+}
+
+
 class UserForLogin(BaseModel):
     id: int
     username: str
@@ -81,26 +136,29 @@ class UserRepository:
 
     async def username_exists(self, username: str) -> bool:
         username_safe = safe_username(username)
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM users WHERE username_safe = :username_safe",
+        exists = await self._mysql.fetch_val(
+            "SELECT EXISTS(SELECT 1 FROM users WHERE username_safe = :username_safe)",
             {"username_safe": username_safe},
         )
-        return count > 0
+        return bool(exists)
 
     async def email_exists(self, email: str) -> bool:
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM users WHERE email = :email",
+        exists = await self._mysql.fetch_val(
+            "SELECT EXISTS(SELECT 1 FROM users WHERE email = :email)",
             {"email": email},
         )
-        return count > 0
+        return bool(exists)
 
     async def username_in_history(self, username: str) -> bool:
         username_safe = safe_username(username)
-        count = await self._mysql.fetch_val(
-            "SELECT COUNT(*) FROM user_name_history WHERE username_safe = :username_safe",
+        exists = await self._mysql.fetch_val(
+            """SELECT EXISTS(
+                   SELECT 1 FROM user_name_history
+                   WHERE username_safe = :username_safe
+               )""",
             {"username_safe": username_safe},
         )
-        return count > 0
+        return bool(exists)
 
     async def create(
         self,
@@ -171,6 +229,69 @@ class UserRepository:
 
         return ClanInfo(id=row["id"], name=row["name"], tag=row["tag"])
 
+    async def get_profile(
+        self,
+        user_id: int,
+        mode: int,
+        custom_mode: int,
+    ) -> UserProfileData | None:
+        row = await self._mysql.fetch_one(
+            _PROFILE_QUERIES[custom_mode, mode],
+            {"user_id": user_id},
+        )
+        if not row:
+            return None
+
+        user = User(
+            id=row["id"],
+            username=row["username"],
+            username_safe=row["username_safe"],
+            privileges=row["privileges"],
+            country=row["country"],
+            registered_at=row["registered_at"],
+            latest_activity=row["latest_activity"],
+            coins=row["coins"],
+        )
+
+        clan = None
+        if row["clan_id"] is not None:
+            clan = ClanInfo(
+                id=row["clan_id"],
+                name=row["clan_name"],
+                tag=row["clan_tag"],
+            )
+
+        discord = None
+        if row["discord_id"] is not None:
+            discord = DiscordOAuthData(
+                discord_id=row["discord_id"],
+                discord_username=row["discord_username"],
+                discord_avatar=row["discord_avatar"],
+            )
+
+        stats = None
+        if row["stats_id"] is not None:
+            stats = UserStatsData(
+                pp=row["pp"],
+                accuracy=row["accuracy"],
+                playcount=row["playcount"],
+                total_score=row["total_score"],
+                ranked_score=row["ranked_score"],
+                total_hits=row["total_hits"],
+                playtime=row["playtime"],
+                max_combo=row["max_combo"],
+                replays_watched=row["replays_watched"],
+                level=row["level"],
+            )
+
+        return UserProfileData(
+            user=user,
+            clan=clan,
+            discord=discord,
+            stats=stats,
+            first_places=row["first_places"] or 0,
+        )
+
     async def update_username(
         self,
         user_id: int,
@@ -190,8 +311,17 @@ class UserRepository:
             },
         )
 
+        # The stats rows are left joined so a missing row in one table does not
+        # stop the others from being renamed.
         await self._mysql.execute(
-            "UPDATE users SET username = :username, username_safe = :username_safe WHERE id = :id",
+            """UPDATE users u
+               LEFT JOIN users_stats us ON us.id = u.id
+               LEFT JOIN rx_stats rs ON rs.id = u.id
+               LEFT JOIN ap_stats aps ON aps.id = u.id
+               SET u.username = :username, u.username_safe = :username_safe,
+                   us.username = :username, rs.username = :username,
+                   aps.username = :username
+               WHERE u.id = :id""",
             {
                 "username": new_username,
                 "username_safe": new_username_safe,
@@ -199,12 +329,6 @@ class UserRepository:
             },
         )
 
-        for table in ("users_stats", "rx_stats", "ap_stats"):
-            await self._mysql.execute(
-                f"UPDATE {table} SET username = :username WHERE id = :id",
-                {"username": new_username, "id": user_id},
-            )
-
     async def get_email(self, user_id: int) -> str | None:
         result = await self._mysql.fetch_val(
             "SELECT email FROM users WHERE id = :id",
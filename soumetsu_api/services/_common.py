@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from abc import ABC
 from abc import ABCMeta
 from abc import abstractmethod
@@ -13,6 +14,7 @@ except ImportError:
 
 from fastapi import status
 
+from soumetsu_api.adapters.mysql import AfterCommitCallback
 from soumetsu_api.adapters.mysql import ImplementsMySQL
 from soumetsu_api.adapters.redis import RedisClient
 from soumetsu_api.adapters.storage import StorageAdapter
@@ -75,74 +77,81 @@ class AbstractContext(ABC):
     @abstractmethod
     def _storage(self) -> StorageAdapter: ...
 
-    @property
+    async def after_commit(self, callback: AfterCommitCallback) -> None:
+        """Runs `callback` once the context's transaction commits, or straight away
+        when it has none."""
+        await self._mysql.after_commit(callback)
+
+    # Repositories only wrap the context's connections, so each one is built once
+    # per context and reused by every service call made with it.
+    @functools.cached_property
     def examples(self) -> ExampleRepository:
         return ExampleRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def users(self) -> UserRepository:
         return UserRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def user_stats(self) -> UserStatsRepository:
         return UserStatsRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def sessions(self) -> SessionRepository:
         return SessionRepository(self._redis)
 
-    @property
+    @functools.cached_property
     def stats(self) -> StatsRepository:
         return StatsRepository(self._redis)
 
-    @property
+    @functools.cached_property
     def scores(self) -> ScoresRepository:
         return ScoresRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def beatmaps(self) -> BeatmapsRepository:
         return BeatmapsRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def leaderboard(self) -> LeaderboardRepository:
         return LeaderboardRepository(self._mysql, self._redis)
 
-    @property
+    @functools.cached_property
     def clans(self) -> ClansRepository:
-        return ClansRepository(self._mysql)
+        return ClansRepository(self._mysql, self._redis)
 
-    @property
+    @functools.cached_property
     def discord_oauth(self) -> DiscordOAuthRepository:
         return DiscordOAuthRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def friends(self) -> FriendsRepository:
         return FriendsRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def comments(self) -> CommentsRepository:
         return CommentsRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def admin(self) -> AdminRepository:
         return AdminRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def badges(self) -> BadgesRepository:
         return BadgesRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def achievements(self) -> AchievementsRepository:
         return AchievementsRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def user_history(self) -> UserHistoryRepository:
         return UserHistoryRepository(self._mysql)
 
-    @property
+    @functools.cached_property
     def user_files(self) -> UserFilesRepository:
         return UserFilesRepository(self._storage)
 
-    @property
+    @functools.cached_property
     def clan_files(self) -> ClanFilesRepository:
         return ClanFilesRepository(self._storage)
@@ -5,9 +5,19 @@ from typing import override
 
 from fastapi import status
 
+from soumetsu_api.resources.achievements import AchievementData
 from soumetsu_api.services._common import AbstractContext
 from soumetsu_api.services._common import ServiceError
 from soumetsu_api.utilities import privileges
+from soumetsu_api.utilities.cache import AsyncTTLCache
+
+ACHIEVEMENTS_CACHE_TTL = 300
+
+# The achievement catalogue only changes on deploys, so it is shared across
+# requests and only the user's own progress is queried each time.
+_catalogue_cache = AsyncTTLCache[None, list[AchievementData]](
+    ttl=ACHIEVEMENTS_CACHE_TTL,
+)
 
 
 class AchievementError(ServiceError):
@@ -51,7 +61,10 @@ async def get_user_achievements(
     if privileges.is_restricted(user_privs):
         return AchievementError.USER_RESTRICTED
 
-    all_achievements = await ctx.achievements.get_all()
+    all_achievements = await _catalogue_cache.get_or_load(
+        None,
+        ctx.achievements.get_all,
+    )
     user_achievements = await ctx.achievements.get_user_achievements(user_id)
 
     user_ach_map = {ua.achievement_id: ua.time for ua in user_achievements}
@@ -74,16 +74,17 @@ async def get_badge_members(
     page: int = 1,
     limit: int = 50,
 ) -> BadgeError.OnSuccess[list[BadgeMemberResult]]:
-    badge = await ctx.badges.get_by_id(badge_id)
-    if not badge:
-        return BadgeError.BADGE_NOT_FOUND
-
     if limit > 100:
         limit = 100
     offset = (page - 1) * limit
 
     members = await ctx.badges.get_members(badge_id, limit, offset)
 
+    # Only an empty page needs telling apart from a missing badge, so the badge
+    # lookup is skipped whenever members come back.
+    if not members and not await ctx.badges.get_by_id(badge_id):
+        return BadgeError.BADGE_NOT_FOUND
+
     return [
         BadgeMemberResult(
             user_id=m.user_id,
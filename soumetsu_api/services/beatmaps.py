@@ -118,12 +118,13 @@ async def search_beatmaps(
     status: int | None = None,
     page: int = 1,
     limit: int = 50,
+    after: tuple[int, int] | None = None,
 ) -> BeatmapError.OnSuccess[list[BeatmapResult]]:
     if limit > 100:
         limit = 100
     offset = (page - 1) * limit
 
-    beatmaps = await ctx.beatmaps.search(query, mode, status, limit, offset)
+    beatmaps = await ctx.beatmaps.search(query, mode, status, limit, offset, after)
     return [_beatmap_to_result(b) for b in beatmaps]
 
 
@@ -132,12 +133,13 @@ async def get_popular(
     mode: int | None = None,
     page: int = 1,
     limit: int = 50,
+    after: tuple[int, int] | None = None,
 ) -> BeatmapError.OnSuccess[list[BeatmapResult]]:
     if limit > 100:
         limit = 100
     offset = (page - 1) * limit
 
-    beatmaps = await ctx.beatmaps.list_popular(mode, limit, offset)
+    beatmaps = await ctx.beatmaps.list_popular(mode, limit, offset, after)
     return [_beatmap_to_result(b) for b in beatmaps]
 
 
@@ -278,14 +280,14 @@ async def get_rank_request_status(
             can_submit=False,
         )
 
-    submitted_by_user = await ctx.beatmaps.count_user_rank_requests_today(user_id)
+    submitted_by_user, oldest_time = await ctx.beatmaps.get_user_rank_requests_today(
+        user_id,
+    )
     can_submit = submitted_by_user < DAILY_RANK_REQUEST_LIMIT
 
     next_expiration = None
-    if not can_submit:
-        oldest_time = await ctx.beatmaps.find_user_oldest_rank_request_today(user_id)
-        if oldest_time:
-            next_expiration = _format_relative_time(oldest_time)
+    if not can_submit and oldest_time:
+        next_expiration = _format_relative_time(oldest_time)
 
     return RankRequestStatusResult(
         submitted=submitted_today,
@@ -370,8 +372,7 @@ async def submit_rank_request(
         if beatmap and beatmap.ranked in (2, 3, 4, 5):
             return BeatmapError.ALREADY_RANKED
     else:
-        beatmapset = await ctx.beatmaps.list_beatmapset(beatmap_id)
-        if beatmapset and all(b.ranked in (2, 3, 4, 5) for b in beatmapset):
+        if await ctx.beatmaps.is_beatmapset_ranked(beatmap_id):
             return BeatmapError.ALREADY_RANKED
 
     request_id = await ctx.beatmaps.create_rank_request_with_atomic_limit(
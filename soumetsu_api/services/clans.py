@@ -14,11 +14,11 @@ from soumetsu_api.resources.clans import CLAN_PERM_OWNER
 from soumetsu_api.resources.clans import ClanData
 from soumetsu_api.resources.clans import ClanMemberData
 from soumetsu_api.resources.clans import ClanMemberStats
-from soumetsu_api.resources.leaderboard import _calculate_level
 from soumetsu_api.services._common import AbstractContext
 from soumetsu_api.services._common import ServiceError
 from soumetsu_api.utilities import crypto
 from soumetsu_api.utilities.images import validate_image_magic
+from soumetsu_api.utilities.levels import calculate_level
 
 
 class ClanError(ServiceError):
@@ -197,12 +197,9 @@ async def search_clans(
     offset = (page - 1) * limit
 
     clans = await ctx.clans.search(query, limit, offset)
-    results = []
-    for c in clans:
-        member_count = await ctx.clans.get_member_count(c.id)
-        results.append(_clan_to_result(c, member_count))
+    member_counts = await ctx.clans.get_member_counts([c.id for c in clans])
 
-    return results
+    return [_clan_to_result(c, member_counts.get(c.id, 0)) for c in clans]
 
 
 async def create_clan(
@@ -215,10 +212,11 @@ async def create_clan(
     if await ctx.clans.get_user_clan(user_id):
         return ClanError.ALREADY_IN_CLAN
 
-    if await ctx.clans.name_exists(name):
+    name_taken, tag_taken = await ctx.clans.name_or_tag_exists(name, tag)
+    if name_taken:
         return ClanError.NAME_TAKEN
 
-    if await ctx.clans.tag_exists(tag):
+    if tag_taken:
         return ClanError.TAG_TAKEN
 
     clan_id = await ctx.clans.create(name, description, tag)
@@ -239,11 +237,11 @@ async def update_clan(
     description: str | None = None,
     tag: str | None = None,
 ) -> ClanError.OnSuccess[ClanResult]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    clan, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -253,9 +251,12 @@ async def update_clan(
 
     await ctx.clans.update(clan_id, name, description, tag)
 
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
-        return ClanError.CLAN_NOT_FOUND
+    # The clan was just read, so the update is applied to it here rather than
+    # fetching it back.
+    updates = {"name": name, "description": description, "tag": tag}
+    clan = clan.model_copy(
+        update={field: value for field, value in updates.items() if value is not None},
+    )
 
     member_count = await ctx.clans.get_member_count(clan_id)
     return _clan_to_result(clan, member_count)
@@ -266,11 +267,11 @@ async def delete_clan(
     user_id: int,
     clan_id: int,
 ) -> ClanError.OnSuccess[None]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -285,11 +286,11 @@ async def upload_clan_icon(
     clan_id: int,
     image_data: bytes,
 ) -> ClanError.OnSuccess[str]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -311,11 +312,11 @@ async def delete_clan_icon(
     user_id: int,
     clan_id: int,
 ) -> ClanError.OnSuccess[None]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -385,11 +386,11 @@ async def leave_clan(
     user_id: int,
     clan_id: int,
 ) -> ClanError.OnSuccess[None]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms is None:
         return ClanError.NOT_MEMBER
 
@@ -407,11 +408,11 @@ async def kick_member(
     clan_id: int,
     user_id: int,
 ) -> ClanError.OnSuccess[None]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, owner_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    owner_perms = await ctx.clans.get_user_perms(owner_id, clan_id)
+    _, owner_perms = membership
     if owner_perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -431,11 +432,11 @@ async def get_invite(
     user_id: int,
     clan_id: int,
 ) -> ClanError.OnSuccess[str]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -452,11 +453,11 @@ async def regenerate_invite(
     user_id: int,
     clan_id: int,
 ) -> ClanError.OnSuccess[str]:
-    clan = await ctx.clans.get_by_id(clan_id)
-    if not clan:
+    membership = await ctx.clans.get_with_user_perms(clan_id, user_id)
+    if not membership:
         return ClanError.CLAN_NOT_FOUND
 
-    perms = await ctx.clans.get_user_perms(user_id, clan_id)
+    _, perms = membership
     if perms != CLAN_PERM_OWNER:
         return ClanError.NOT_OWNER
 
@@ -497,17 +498,12 @@ async def get_clan_stats(
     total_total_score = sum(m.total_score for m in member_stats)
 
     # Compute rank by comparing against all clans
-    all_clan_ids = await ctx.clans.get_all_clan_ids()
+    all_member_stats = await ctx.clans.get_all_clan_member_stats(mode, custom_mode)
     rank = 1
-    for other_clan_id in all_clan_ids:
+    for other_clan_id, other_stats in all_member_stats.items():
         if other_clan_id == clan_id:
             continue
-        other_stats = await ctx.clans.get_clan_member_stats(
-            other_clan_id,
-            mode,
-            custom_mode,
-        )
-        other_pp = _compute_weighted_pp(other_stats)
+        other_pp = _compute_weighted_pp(other_stats.members)
         if other_pp > total_pp:
             rank += 1
 
@@ -535,27 +531,19 @@ async def get_clan_leaderboard(
     if limit > 100:
         limit = 100
 
-    all_clan_ids = await ctx.clans.get_all_clan_ids()
+    all_member_stats = await ctx.clans.get_all_clan_member_stats(mode, custom_mode)
+    member_counts = await ctx.clans.get_all_member_counts()
 
     clan_entries: list[tuple[int, ClanData, ClanMemberStats, int, int]] = []
-    for clan_id in all_clan_ids:
-        clan = await ctx.clans.get_by_id(clan_id)
-        if not clan:
-            continue
-
-        member_stats = await ctx.clans.get_clan_member_stats(
-            clan_id,
-            mode,
-            custom_mode,
-        )
-        if not member_stats:
-            continue
+    for clan_id, clan_stats in all_member_stats.items():
+        clan = clan_stats.clan
+        member_stats = clan_stats.members
 
         weighted_pp = _compute_weighted_pp(member_stats)
         total_ranked_score = sum(m.ranked_score for m in member_stats)
         total_score = sum(m.total_score for m in member_stats)
         total_playcount = sum(m.playcount for m in member_stats)
-        member_count = await ctx.clans.get_member_count(clan_id)
+        member_count = member_counts.get(clan_id, 0)
 
         total_replays_watched = sum(m.replays_watched for m in member_stats)
         total_hits = sum(m.total_hits for m in member_stats)
@@ -582,25 +570,22 @@ async def get_clan_leaderboard(
     offset = (page - 1) * limit
     paginated = clan_entries[offset : offset + limit]
 
-    results = []
-    for i, (_, clan, stats, member_count, _) in enumerate(paginated):
-        results.append(
-            ClanLeaderboardEntryResult(
-                id=clan.id,
-                name=clan.name,
-                tag=clan.tag,
-                chosen_mode=ClanModeStatsResult(
-                    pp=stats.pp,
-                    ranked_score=stats.ranked_score,
-                    total_score=stats.total_score,
-                    playcount=stats.playcount,
-                ),
-                rank=offset + i + 1,
-                member_count=member_count,
+    return [
+        ClanLeaderboardEntryResult(
+            id=clan.id,
+            name=clan.name,
+            tag=clan.tag,
+            chosen_mode=ClanModeStatsResult(
+                pp=stats.pp,
+                ranked_score=stats.ranked_score,
+                total_score=stats.total_score,
+                playcount=stats.playcount,
             ),
+            rank=offset + i + 1,
+            member_count=member_count,
         )
-
-    return results
+        for i, (_, clan, stats, member_count, _) in enumerate(paginated)
+    ]
 
 
 async def get_clan_top_scores(
@@ -671,7 +656,7 @@ async def get_clan_member_leaderboard(
             pp=e.pp,
             accuracy=e.accuracy,
             playcount=e.playcount,
-            level=_calculate_level(e.total_score),
+            level=calculate_level(e.total_score),
         )
         for e in entries
     ]
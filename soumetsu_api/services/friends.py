@@ -64,12 +64,13 @@ async def get_friends(
     user_id: int,
     page: int = 1,
     limit: int = 50,
+    after: tuple[str, int] | None = None,
 ) -> FriendError.OnSuccess[list[FriendResult]]:
     if limit > 100:
         limit = 100
     offset = (page - 1) * limit
 
-    friends = await ctx.friends.get_friends(user_id, limit, offset)
+    friends = await ctx.friends.get_friends(user_id, limit, offset, after)
     return [_friend_to_result(f) for f in friends]
 
 
@@ -143,10 +144,8 @@ async def get_relationships(
     friends = await ctx.friends.get_friends(user_id, limit, offset)
     followers = await ctx.friends.get_followers(user_id, limit, offset)
 
-    mutual_ids = []
-    for f in friends:
-        if await ctx.friends.is_mutual(user_id, f.user_id):
-            mutual_ids.append(f.user_id)
+    mutual = await ctx.friends.get_mutual_ids(user_id, [f.user_id for f in friends])
+    mutual_ids = [f.user_id for f in friends if f.user_id in mutual]
 
     return RelationshipsResult(
         friends=[_friend_to_result(f) for f in friends],
@@ -165,8 +164,7 @@ async def get_follower_stats(
     ctx: AbstractContext,
     user_id: int,
 ) -> FriendError.OnSuccess[FollowerStatsResult]:
-    follower_count = await ctx.friends.get_follower_count(user_id)
-    friend_count = await ctx.friends.get_friend_count(user_id)
+    follower_count, friend_count = await ctx.friends.get_counts(user_id)
 
     return FollowerStatsResult(
         follower_count=follower_count,
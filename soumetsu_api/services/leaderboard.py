@@ -190,6 +190,7 @@ async def list_oldest_firsts(
     custom_mode: int = 0,
     page: int = 1,
     limit: int = 50,
+    after: tuple[int, int] | None = None,
 ) -> LeaderboardError.OnSuccess[list[FirstPlaceResult]]:
     if not is_valid_mode(mode):
         return LeaderboardError.INVALID_MODE
@@ -201,5 +202,11 @@ async def list_oldest_firsts(
         limit = 100
     offset = (page - 1) * limit
 
-    entries = await ctx.leaderboard.list_oldest_firsts(mode, custom_mode, limit, offset)
+    entries = await ctx.leaderboard.list_oldest_firsts(
+        mode,
+        custom_mode,
+        limit,
+        offset,
+        after,
+    )
     return [_first_to_result(f) for f in entries]
@@ -147,8 +147,7 @@ async def get_card(
     mode = pref.mode if pref else 0
     custom_mode = pref.custom_mode if pref else 0
 
-    global_rank = await ctx.leaderboard.get_user_global_rank(user_id, mode, custom_mode)
-    country_rank = await ctx.leaderboard.get_user_country_rank(
+    global_rank, country_rank = await ctx.leaderboard.get_user_ranks(
         user_id,
         mode,
         custom_mode,
@@ -182,37 +181,29 @@ async def get_profile(
     if not is_valid_custom_mode(custom_mode):
         return UserError.INVALID_CUSTOM_MODE
 
-    user = await ctx.users.find_by_id(user_id)
-    if not user:
+    profile = await ctx.users.get_profile(user_id, mode, custom_mode)
+    if not profile:
         return UserError.USER_NOT_FOUND
 
+    user = profile.user
     user_privs = privileges.UserPrivileges(user.privileges)
     if privileges.is_restricted(user_privs):
         return UserError.USER_RESTRICTED
 
-    stats = await ctx.user_stats.get_stats(user_id, mode, custom_mode)
-    global_rank = await ctx.leaderboard.get_user_global_rank(user_id, mode, custom_mode)
-    country_rank = await ctx.leaderboard.get_user_country_rank(
+    stats = profile.stats
+    global_rank, country_rank = await ctx.leaderboard.get_user_ranks(
         user_id,
         mode,
         custom_mode,
         user.country,
     )
-    first_places = await ctx.user_stats.get_first_place_count(
-        user_id,
-        mode,
-        custom_mode,
-    )
-
-    clan_info = await ctx.users.get_clan_info(user_id)
 
-    discord_row = await ctx.discord_oauth.get_by_user(user_id)
     discord = None
-    if discord_row and discord_row.discord_id:
+    if profile.discord and profile.discord.discord_id:
         discord = DiscordLink(
-            discord_id=discord_row.discord_id,
-            discord_username=discord_row.discord_username,
-            discord_avatar=discord_row.discord_avatar,
+            discord_id=profile.discord.discord_id,
+            discord_username=profile.discord.discord_username,
+            discord_avatar=profile.discord.discord_avatar,
         )
 
     return UserProfile(
@@ -223,7 +214,7 @@ async def get_profile(
         registered_at=user.registered_at,
         latest_activity=user.latest_activity,
         is_online=False,  # TODO: check bancho presence
-        clan=clan_info,
+        clan=profile.clan,
         discord=discord,
         stats=UserStats(
             mode=mode,
@@ -240,7 +231,7 @@ async def get_profile(
             max_combo=stats.max_combo if stats else 0,
             replays_watched=stats.replays_watched if stats else 0,
             level=stats.level if stats else 1,
-            first_places=first_places,
+            first_places=profile.first_places,
         ),
     )
 
@@ -399,7 +390,8 @@ async def change_username(
     ctx: AbstractContext,
     user_id: int,
     new_username: str,
-) -> UserError.OnSuccess[None]:
+) -> UserError.OnSuccess[str]:
+    """Renames the user, returning the username they had before."""
     if not re.match(r"^[\w \[\]-]{2,15}$", new_username):
         return UserError.USERNAME_RESERVED
 
@@ -415,7 +407,7 @@ async def change_username(
         return UserError.USERNAME_RESERVED
 
     await ctx.users.update_username(user_id, new_username, user.username)
-    return None
+    return user.username
 
 
 async def get_discord_link(
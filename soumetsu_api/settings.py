@@ -14,6 +14,18 @@ MYSQL_TCP_PORT = int(os.environ["MYSQL_TCP_PORT"])
 MYSQL_USER = os.environ["MYSQL_USER"]
 MYSQL_PASSWORD = os.environ["MYSQL_PASSWORD"]
 MYSQL_DATABASE = os.environ["MYSQL_DATABASE"]
+MYSQL_POOL_MIN_SIZE = int(os.environ.get("SOUMETSUAPI_MYSQL_POOL_MIN_SIZE", 5))
+MYSQL_POOL_MAX_SIZE = int(os.environ.get("SOUMETSUAPI_MYSQL_POOL_MAX_SIZE", 40))
+MYSQL_POOL_RECYCLE = int(os.environ.get("SOUMETSUAPI_MYSQL_POOL_RECYCLE", 1800))
+
+# Optional separate pool for heavy read-only listings, e.g. against a replica
+MYSQL_READ_HOST = os.environ.get("SOUMETSUAPI_MYSQL_READ_HOST", "")
+MYSQL_READ_POOL_MIN_SIZE = int(
+    os.environ.get("SOUMETSUAPI_MYSQL_READ_POOL_MIN_SIZE", 2),
+)
+MYSQL_READ_POOL_MAX_SIZE = int(
+    os.environ.get("SOUMETSUAPI_MYSQL_READ_POOL_MAX_SIZE", 20),
+)
 
 # Redis configuration
 REDIS_HOST = os.environ["REDIS_HOST"]
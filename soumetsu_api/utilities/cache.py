@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+
+
+class AsyncTTLCache[K: Hashable, V]:
+    """A bounded in-process cache whose entries expire after a fixed TTL.
+
+    Concurrent misses for the same key are coalesced, so only one caller runs
+    the loader while the rest wait for its result. Loader exceptions are not
+    cached.
+    """
+
+    __slots__ = ("_ttl", "_max_size", "_entries", "_locks")
+
+    def __init__(self, *, ttl: float, max_size: int = 1024) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._locks: dict[K, asyncio.Lock] = {}
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+
+        async with lock:
+            # Another caller may have filled the entry while we were waiting.
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            try:
+                value = await loader()
+            finally:
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+
+            self.set(key, value)
+            return value
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import itertools
+from collections.abc import Iterator
+
+_MAX_LEVEL = 120
+_LEVEL_POLY_FACTOR = 5000 // 3
+
+
+def _level_requirements() -> Iterator[float]:
+    # Levels are walked in order, so 1.8 ** (level - 60) is carried along as a
+    # running product instead of being raised afresh for each one.
+    growth = 1.8 ** (2 - 60)
+    for level in range(2, _MAX_LEVEL + 2):
+        if level <= 100:
+            # 4l^3 - 3l^2 - l in Horner form.
+            yield (
+                _LEVEL_POLY_FACTOR * (((4 * level - 3) * level - 1) * level)
+                + 1250 * growth // 3
+            )
+            growth *= 1.8
+        else:
+            yield 26931190829 + 100000000000 * (level - 100)
+
+
+# Cumulative score needed to reach each level from 2 up to one past the cap,
+# built once so every lookup is a bisect rather than a walk over the levels.
+_LEVEL_THRESHOLDS: tuple[float, ...] = tuple(
+    itertools.accumulate(_level_requirements()),
+)
+
+
+# Many players share a total score (not least everyone still on zero), and the
+# same pages are rendered repeatedly, so recent conversions are kept.
+@functools.lru_cache(maxsize=4096)
+def calculate_level(total_score: int) -> float:
+    """Converts a total score into a level, with the progress towards the next
+    level as the fractional part."""
+
+    if total_score <= 0:
+        return 1.0
+
+    # Scores past the last threshold keep progressing within the capped level.
+    index = min(
+        bisect.bisect_right(_LEVEL_THRESHOLDS, total_score),
+        len(_LEVEL_THRESHOLDS) - 1,
+    )
+    previous = _LEVEL_THRESHOLDS[index - 1] if index else 0
+    required = _LEVEL_THRESHOLDS[index]
+
+    progress = 0.0
+    if required > previous:
+        progress = (total_score - previous) / (required - previous)
+
+    return float(index + 1) + progress
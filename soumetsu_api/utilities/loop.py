@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import sys
 
 from soumetsu_api.utilities import logging
@@ -16,7 +17,8 @@ def install_optimal_loop() -> None:
         try:
             import uvloop  # noqa: F401 # type: ignore[import]
 
-            uvloop.install()
+            # `uvloop.install()` is deprecated from Python 3.12 onwards.
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         except ImportError:
             logger.warning(
                 "uvloop is not installed, falling back to the default asyncio event loop.",
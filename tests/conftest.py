@@ -47,44 +47,45 @@ class _MockMySQLConnection:
 
     async def fetch_one(
         self,
-        query: str,
+        query: Any,
         values: dict[str, Any] | None = None,
     ) -> Any:
+        # Queries arrive either as raw strings or as prepared `text()` clauses.
         for pattern, result in self._results.items():
-            if pattern in query:
+            if pattern in str(query):
                 return result
         return None
 
     async def fetch_all(
         self,
-        query: str,
+        query: Any,
         values: dict[str, Any] | None = None,
     ) -> list[Any]:
         for pattern, result in self._results.items():
-            if pattern in query:
+            if pattern in str(query):
                 return result if isinstance(result, list) else [result]
         return []
 
     async def fetch_val(
         self,
-        query: str,
+        query: Any,
         values: dict[str, Any] | None = None,
     ) -> Any:
         for pattern, result in self._results.items():
-            if pattern in query:
+            if pattern in str(query):
                 return result
         return None
 
     async def execute(
         self,
-        query: str,
+        query: Any,
         values: dict[str, Any] | None = None,
     ) -> Any:
         return None
 
     async def iterate(
         self,
-        query: str,
+        query: Any,
         values: dict[str, Any] | None = None,
     ) -> AsyncGenerator[dict[str, Any], None]:
         results = await self.fetch_all(query, values)
@@ -93,11 +94,14 @@ class _MockMySQLConnection:
 
 
 class MockMySQLAdapter(mysql.ImplementsMySQL):
-    """A mock MySQL adapter for testing purposes."""
+    """A mock MySQL adapter for testing purposes. Every query it is given is
+    recorded in `queries`, along with its values."""
 
     def __init__(self) -> None:
         self._results: dict[str, Any] = {}
+        self._execute_results: dict[str, Any] = {}
         self._mock_connection = _MockMySQLConnection(self._results)
+        self.queries: list[tuple[str, dict[str, Any] | None]] = []
 
     @property
     def _connection(self) -> _MockMySQLConnection:  # type: ignore[override]
@@ -107,12 +111,17 @@ class MockMySQLAdapter(mysql.ImplementsMySQL):
         """Set a mock result for queries containing the given pattern."""
         self._results[query_pattern] = result
 
+    def set_execute_result(self, query_pattern: str, result: Any) -> None:
+        """Set the value `execute` returns for statements containing the pattern."""
+        self._execute_results[query_pattern] = result
+
     async def fetch_one(
         self,
         query: str,
         values: dict[str, Any] | None = None,
     ) -> dict[str, Any] | None:
         """Override to return dicts directly without _mapping."""
+        self.queries.append((query, values))
         return await self._mock_connection.fetch_one(query, values)
 
     async def fetch_all(
@@ -121,29 +130,81 @@ class MockMySQLAdapter(mysql.ImplementsMySQL):
         values: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """Override to return dicts directly without _mapping."""
+        self.queries.append((query, values))
         return await self._mock_connection.fetch_all(query, values)
 
+    @override
+    async def fetch_val(
+        self,
+        query: str,
+        values: dict[str, Any] | None = None,
+    ) -> Any:
+        self.queries.append((query, values))
+        return await super().fetch_val(query, values)
+
+    @override
+    async def execute(
+        self,
+        query: str,
+        values: dict[str, Any] | None = None,
+    ) -> Any:
+        self.queries.append((query, values))
+        for pattern, result in self._execute_results.items():
+            if pattern in query:
+                return result
+        return await super().execute(query, values)
+
+    @override
+    def iterate(
+        self,
+        query: str,
+        values: dict[str, Any] | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        self.queries.append((query, values))
+        return super().iterate(query, values)
+
     async def connect(self) -> None:
         pass
 
     async def disconnect(self) -> None:
         pass
 
+    def connection(self) -> MockMySQLTransaction:
+        # A held connection behaves like a transaction that commits every query.
+        return MockMySQLTransaction(self, in_transaction=False)
+
     def transaction(self) -> MockMySQLTransaction:
         return MockMySQLTransaction(self)
 
 
 class MockMySQLTransaction:
-    """A mock MySQL transaction for testing purposes."""
+    """A mock MySQL transaction for testing purposes. After-commit callbacks are
+    held until the block exits without an exception."""
 
-    def __init__(self, adapter: MockMySQLAdapter) -> None:
+    def __init__(
+        self,
+        adapter: MockMySQLAdapter,
+        *,
+        in_transaction: bool = True,
+    ) -> None:
         self._adapter = adapter
+        self.in_transaction = in_transaction
+        self._after_commit: list[mysql.AfterCommitCallback] = []
 
     async def __aenter__(self) -> MockMySQLTransaction:
         return self
 
     async def __aexit__(self, *args: Any) -> None:
-        pass
+        callbacks, self._after_commit = self._after_commit, []
+        if args[0] is None:
+            for callback in callbacks:
+                await callback()
+
+    async def after_commit(self, callback: mysql.AfterCommitCallback) -> None:
+        if not self.in_transaction:
+            await callback()
+            return
+        self._after_commit.append(callback)
 
     async def fetch_one(
         self,
@@ -187,7 +248,7 @@ class MockRedisClient:
     async def get(self, key: str) -> Any:
         return self._data.get(key)
 
-    async def set(self, key: str, value: Any) -> None:
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:
         self._data[key] = value
 
     async def delete(self, key: str) -> None:
@@ -0,0 +1,77 @@
+"""Unit tests for the MySQL adapter."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+from soumetsu_api.adapters import mysql
+
+
+class TestPrepare:
+    """Tests for the cached statement preparation."""
+
+    def test_parses_each_query_once(self) -> None:
+        """Repeated queries should reuse the same parsed clause."""
+        query = "SELECT id FROM users WHERE id = :user_id"
+
+        first = mysql._parse_statement(query)
+        second = mysql._parse_statement(query)
+
+        assert first is second
+
+    def test_binds_values(self) -> None:
+        """Values should be bound onto the prepared clause."""
+        statement = mysql._prepare(
+            "SELECT id FROM users WHERE id = :user_id",
+            {"user_id": 1000},
+        )
+
+        assert statement.compile().params == {"user_id": 1000}
+
+    def test_binding_does_not_mutate_cached_clause(self) -> None:
+        """Binding values should leave the cached clause untouched."""
+        query = "SELECT id FROM users WHERE username = :username"
+
+        mysql._prepare(query, {"username": "rosa"})
+        statement = mysql._prepare(query, {"username": "lily"})
+
+        assert statement.compile().params == {"username": "lily"}
+        assert mysql._parse_statement(query).compile().params == {"username": None}
+
+    def test_no_values_returns_cached_clause(self) -> None:
+        """Queries without values should return the cached clause directly."""
+        query = "SELECT COUNT(*) FROM users"
+
+        assert mysql._prepare(query, None) is mysql._parse_statement(query)
+
+
+class TestAfterCommit:
+    """Tests for callbacks deferred until a transaction commits."""
+
+    async def test_runs_once_committed(self) -> None:
+        """Callbacks should wait for the transaction to exit cleanly."""
+        ran: list[int] = []
+
+        async def _callback() -> None:
+            ran.append(1)
+
+        transaction = mysql.MySQLTransaction(mock.Mock())
+        await transaction.after_commit(_callback)
+        assert ran == []
+
+        await transaction.__aexit__(None, None, None)
+        assert ran == [1]
+
+    async def test_dropped_on_rollback(self) -> None:
+        """Callbacks should never run for a transaction that was rolled back."""
+        ran: list[int] = []
+
+        async def _callback() -> None:
+            ran.append(1)
+
+        transaction = mysql.MySQLTransaction(mock.Mock())
+        await transaction.after_commit(_callback)
+
+        error = ValueError()
+        await transaction.__aexit__(ValueError, error, None)
+        assert ran == []
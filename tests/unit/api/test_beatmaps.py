@@ -0,0 +1,49 @@
+"""Unit tests for the beatmaps API response shapes."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pydantic_core
+
+from soumetsu_api.api.v2 import beatmaps as beatmaps_api
+from soumetsu_api.services import beatmaps
+
+
+class TestServiceResultParity:
+    """Service results serialised directly must match their response models."""
+
+    def test_beatmap_result_matches_response(self) -> None:
+        """BeatmapResult should expose exactly the BeatmapResponse fields."""
+        fields = [f.name for f in dataclasses.fields(beatmaps.BeatmapResult)]
+
+        assert fields == list(beatmaps_api.BeatmapResponse.model_fields)
+
+    def test_beatmap_result_serialises_like_response(self) -> None:
+        """A serialised result should be identical to the response model's JSON."""
+        result = beatmaps.BeatmapResult(
+            beatmap_id=75,
+            beatmapset_id=1,
+            beatmap_md5="a5b99395a42bd55bc5eb1d2411cbdf8b",
+            song_name="Kenji Ninuma - DISCO PRINCE [Normal]",
+            ar=6.0,
+            od=6.0,
+            mode=0,
+            difficulty_std=2.4,
+            difficulty_taiko=0.0,
+            difficulty_ctb=0.0,
+            difficulty_mania=0.0,
+            max_combo=314,
+            hit_length=142,
+            bpm=120,
+            playcount=1000,
+            passcount=500,
+            ranked=2,
+            updated_at=1700000000,
+            ranked_status_frozen=True,
+            mapper_id=2,
+        )
+
+        expected = beatmaps_api.BeatmapResponse(**dataclasses.asdict(result))
+
+        assert pydantic_core.to_json(result) == expected.model_dump_json().encode()
@@ -7,6 +7,8 @@ from typing import override
 
 import pytest
 from fastapi import status
+from pydantic import BaseModel
+from pydantic import ValidationError
 
 from soumetsu_api.api.v2 import response
 from soumetsu_api.services._common import ServiceError
@@ -71,6 +73,87 @@ class TestCreate:
         body = json.loads(bytes(result.body))
         assert body["data"] is None
 
+    def test_body_matches_base_response_dump(self) -> None:
+        """create should produce the same bytes as dumping a BaseResponse."""
+        data = {"items": [1, 2], "name": "rosa", "nested": {"ok": True}}
+
+        result = response.create(data, status=status.HTTP_201_CREATED)
+
+        expected = response.BaseResponse(
+            status=status.HTTP_201_CREATED,
+            data=data,
+        ).model_dump_json()
+        assert bytes(result.body) == expected.encode()
+
+
+class TestCreateRaw:
+    """Tests for response.create_raw function."""
+
+    def test_wraps_payload_in_envelope(self) -> None:
+        """create_raw should place the payload under the data field."""
+        result = response.create_raw(b'{"key":"value"}')
+
+        body = json.loads(bytes(result.body))
+        assert body == {"status": status.HTTP_200_OK, "data": {"key": "value"}}
+
+    def test_matches_create_output(self) -> None:
+        """create_raw should produce the same body as create."""
+        raw = response.create_raw(b"[1,2,3]", status=status.HTTP_201_CREATED)
+        created = response.create([1, 2, 3], status=status.HTTP_201_CREATED)
+
+        assert json.loads(bytes(raw.body)) == json.loads(bytes(created.body))
+        assert raw.status_code == created.status_code
+
+    def test_response_media_type_is_json(self) -> None:
+        """Response media type should be application/json."""
+        result = response.create_raw(b"null")
+
+        assert result.media_type == "application/json"
+
+
+class _Item(BaseModel):
+    """Mock response model for list serialisation tests."""
+
+    id: int
+    name: str
+
+
+class TestDumpList:
+    """Tests for response.dump_list function."""
+
+    def test_serialises_models(self) -> None:
+        """dump_list should serialise every model in order."""
+        result = response.dump_list(
+            _Item,
+            [_Item(id=1, name="a"), _Item(id=2, name="b")],
+        )
+
+        assert json.loads(result) == [
+            {"id": 1, "name": "a"},
+            {"id": 2, "name": "b"},
+        ]
+
+    def test_serialises_empty_list(self) -> None:
+        """dump_list should handle an empty list."""
+        assert response.dump_list(_Item, []) == b"[]"
+
+
+class TestORJSONResponse:
+    """Tests for the ORJSONResponse class."""
+
+    def test_renders_json(self) -> None:
+        """ORJSONResponse should render plain data as compact JSON."""
+        result = response.ORJSONResponse({"status": 200, "data": [1, "two"]})
+
+        assert bytes(result.body) == b'{"status":200,"data":[1,"two"]}'
+        assert result.media_type == "application/json"
+
+    def test_renders_non_string_keys(self) -> None:
+        """ORJSONResponse should accept integer dictionary keys."""
+        result = response.ORJSONResponse({1: "one"})
+
+        assert json.loads(bytes(result.body)) == {"1": "one"}
+
 
 class TestUnwrap:
     """Tests for response.unwrap function."""
@@ -133,3 +216,47 @@ class TestBaseResponse:
         parsed = json.loads(result)
 
         assert parsed["data"] is None
+
+
+class _FrozenItem(response.ResponseModel):
+    """Mock deferred response model."""
+
+    id: int
+
+
+class TestResponseModel:
+    """Tests for the ResponseModel base."""
+
+    def test_validates_on_first_use(self) -> None:
+        """Deferred models should still validate when first instantiated."""
+        with pytest.raises(ValidationError):
+            _FrozenItem(id="not an int")  # type: ignore[arg-type]
+
+    def test_is_frozen(self) -> None:
+        """Response models should reject mutation."""
+        model = _FrozenItem(id=1)
+
+        with pytest.raises(ValidationError):
+            model.id = 2  # type: ignore[misc]
+
+
+class _DeferredItem(response.ResponseModel):
+    """Deferred response model for warm up tests."""
+
+    id: int
+
+
+class TestWarmUp:
+    """Tests for response.warm_up function."""
+
+    def test_builds_deferred_list_items(self) -> None:
+        """Warming a list route model should build its item serialisers."""
+        response.warm_up(response.BaseResponse[list[_DeferredItem]])
+
+        assert _DeferredItem.__pydantic_complete__
+        assert response.dump_list(_DeferredItem, [_DeferredItem(id=1)]) == b'[{"id":1}]'
+
+    def test_ignores_non_envelope_models(self) -> None:
+        """Models that are not response envelopes should be left alone."""
+        response.warm_up(None)
+        response.warm_up(_Item)
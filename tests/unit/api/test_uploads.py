@@ -0,0 +1,40 @@
+"""Unit tests for upload reading helpers."""
+
+from __future__ import annotations
+
+import io
+
+from fastapi import UploadFile
+
+from soumetsu_api.api.v2 import uploads
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="upload.png")
+
+
+class TestReadUpload:
+    """Tests for uploads.read_upload function."""
+
+    async def test_reads_whole_file_within_limit(self) -> None:
+        """Files within the limit should be read in full."""
+        data = b"\x89PNG\r\n\x1a\n" + b"x" * (uploads.UPLOAD_CHUNK_SIZE * 2)
+
+        result = await uploads.read_upload(_upload(data), len(data))
+
+        assert result == data
+
+    async def test_stops_reading_past_limit(self) -> None:
+        """Oversized files should be cut short just past the limit."""
+        data = b"x" * (uploads.UPLOAD_CHUNK_SIZE * 4)
+        max_size = uploads.UPLOAD_CHUNK_SIZE + 1
+
+        result = await uploads.read_upload(_upload(data), max_size)
+
+        assert max_size < len(result) < len(data)
+
+    async def test_handles_empty_file(self) -> None:
+        """Empty uploads should produce empty bytes."""
+        result = await uploads.read_upload(_upload(b""), 1024)
+
+        assert result == b""
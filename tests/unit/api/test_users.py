@@ -0,0 +1,125 @@
+"""Unit tests for the users API response shapes."""
+
+from __future__ import annotations
+
+import dataclasses
+
+from soumetsu_api.api.v2 import users as users_api
+from soumetsu_api.resources.users import ClanInfo
+from soumetsu_api.services import beatmaps
+from soumetsu_api.services import comments
+from soumetsu_api.services import users
+
+
+class TestServiceResultParity:
+    """Service results serialised directly must match their response models."""
+
+    def test_user_compact_matches_response(self) -> None:
+        """UserCompact should expose exactly the UserCompactResponse fields."""
+        fields = [f.name for f in dataclasses.fields(users.UserCompact)]
+
+        assert fields == list(users_api.UserCompactResponse.model_fields)
+
+    def test_user_card_matches_response(self) -> None:
+        """UserCard should expose exactly the UserCardResponse fields."""
+        fields = [f.name for f in dataclasses.fields(users.UserCard)]
+
+        assert fields == list(users_api.UserCardResponse.model_fields)
+
+
+def _make_profile(
+    *,
+    clan: ClanInfo | None = None,
+    discord: users.DiscordLink | None = None,
+) -> users.UserProfile:
+    return users.UserProfile(
+        id=1000,
+        username="rosa",
+        country="GB",
+        privileges=3,
+        registered_at=1600000000,
+        latest_activity=1700000000,
+        is_online=False,
+        clan=clan,
+        discord=discord,
+        stats=users.UserStats(
+            mode=0,
+            custom_mode=0,
+            global_rank=12,
+            country_rank=3,
+            pp=4321,
+            accuracy=98.5,
+            playcount=1000,
+            total_score=123456789,
+            ranked_score=98765432,
+            total_hits=500000,
+            playtime=360000,
+            max_combo=2000,
+            replays_watched=5,
+            level=100,
+            first_places=7,
+        ),
+    )
+
+
+class TestProfileToResponse:
+    """Tests for building profile responses without validation."""
+
+    def test_matches_validated_model(self) -> None:
+        """The constructed response should serialise like a validated one."""
+        profile = _make_profile(
+            clan=ClanInfo(id=1, name="Clan", tag="CLN"),
+            discord=users.DiscordLink(
+                discord_id="123",
+                discord_username="rosa",
+                discord_avatar="abc",
+            ),
+        )
+
+        constructed = users_api._profile_to_response(profile)
+        validated = users_api.UserProfileResponse.model_validate(
+            constructed.model_dump(),
+        )
+
+        assert constructed.model_dump_json() == validated.model_dump_json()
+
+    def test_optional_relations_are_null(self) -> None:
+        """Missing clan and discord links should serialise as null."""
+        result = users_api._profile_to_response(_make_profile())
+
+        assert result.clan is None
+        assert result.discord is None
+
+
+class TestListResponseBuilders:
+    """Tests for the per-row response builders of the list routes."""
+
+    def test_comment_to_response(self) -> None:
+        """Comment rows should carry every field across."""
+        comment = comments.CommentResult(
+            id=1,
+            author_id=1000,
+            author_username="rosa",
+            profile_id=1001,
+            message="hello",
+            created_at=1700000000,
+        )
+
+        result = users_api._comment_to_response(comment)
+
+        assert result.model_dump() == dataclasses.asdict(comment)
+
+    def test_most_played_to_response_nests_beatmap(self) -> None:
+        """Most played rows should nest the beatmap information."""
+        most_played = beatmaps.MostPlayedResult(
+            beatmap=beatmaps.MostPlayedBeatmapInfo(
+                beatmap_id=75,
+                beatmapset_id=1,
+                song_name="Kenji Ninuma - DISCO PRINCE [Normal]",
+            ),
+            playcount=12,
+        )
+
+        result = users_api._most_played_to_response(most_played)
+
+        assert result.model_dump() == dataclasses.asdict(most_played)
@@ -0,0 +1,95 @@
+"""Unit tests for the admin repository queries."""
+
+from __future__ import annotations
+
+from soumetsu_api.constants import CustomMode
+from soumetsu_api.constants import GameMode
+from soumetsu_api.resources import admin
+from tests.conftest import MockMySQLAdapter
+
+
+class TestWipeQueries:
+    """Tests for the precomputed stat wipe queries."""
+
+    def test_single_mode_query_targets_one_suffix(self) -> None:
+        """A single mode wipe should only touch that mode's columns."""
+        query = admin._WIPE_MODE_QUERIES[CustomMode.RELAX, GameMode.TAIKO]
+
+        assert query.startswith("UPDATE rx_stats SET ")
+        assert "pp_taiko = 0" in query
+        assert "level_taiko = 1" in query
+        assert "_std" not in query
+        assert query.endswith("WHERE id = :user_id")
+
+    def test_all_modes_query_resets_every_suffix(self) -> None:
+        """Wiping every mode should reset all suffixes in one statement."""
+        query = admin._WIPE_ALL_MODES_QUERIES[CustomMode.VANILLA]
+
+        assert query.startswith("UPDATE users_stats SET ")
+        for suffix in ("std", "taiko", "ctb", "mania"):
+            assert f"pp_{suffix} = 0" in query
+            assert f"level_{suffix} = 1" in query
+        assert query.count("UPDATE") == 1
+
+    def test_queries_exist_for_every_table_and_mode(self) -> None:
+        """A query should be precomputed for every table and mode pair."""
+        assert len(admin._WIPE_MODE_QUERIES) == 12
+        assert len(admin._WIPE_ALL_MODES_QUERIES) == 3
+
+
+class TestUpdateUserQuery:
+    """Tests for the cached update_user query builder."""
+
+    def test_username_sets_safe_username(self) -> None:
+        """Updating the username should also update its safe form."""
+        query = admin._update_user_query(0b00001)
+
+        assert query == (
+            "UPDATE users SET username = :username, "
+            "username_safe = :username_safe WHERE id = :user_id"
+        )
+
+    def test_columns_follow_mask_bits(self) -> None:
+        """Only the columns whose bits are set should be assigned."""
+        query = admin._update_user_query(0b10100)
+
+        assert query == (
+            "UPDATE users SET country = :country, notes = :notes WHERE id = :user_id"
+        )
+
+    def test_query_is_cached_per_mask(self) -> None:
+        """The same mask should return the same compiled string."""
+        assert admin._update_user_query(0b00110) is admin._update_user_query(0b00110)
+
+
+class TestUpdateUser:
+    """Tests for AdminRepository.update_user."""
+
+    async def test_binds_only_given_fields(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Only the given fields, and the derived safe username, should be bound."""
+        repository = admin.AdminRepository(mock_mysql)
+        await repository.update_user(1000, username="New Name", notes="renamed")
+
+        assert mock_mysql.queries == [
+            (
+                admin._update_user_query(0b10001),
+                {
+                    "user_id": 1000,
+                    "username": "New Name",
+                    "notes": "renamed",
+                    "username_safe": "new_name",
+                },
+            ),
+        ]
+
+    async def test_skips_query_without_fields(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """No query should be issued when nothing is being updated."""
+        repository = admin.AdminRepository(mock_mysql)
+
+        assert await repository.update_user(1000) is None
@@ -0,0 +1,47 @@
+"""Unit tests for the badges repository."""
+
+from __future__ import annotations
+
+from soumetsu_api.resources.badges import BadgeData
+from soumetsu_api.resources.badges import BadgesRepository
+from tests.conftest import MockMySQLAdapter
+
+
+class TestBadgesRepository:
+    """Tests for BadgesRepository row materialisation."""
+
+    async def test_get_all_builds_badges_from_rows(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Rows should be turned into BadgeData without losing fields."""
+        mock_mysql.set_result(
+            "FROM badges",
+            [
+                {"id": 1, "name": "Developer", "icon": "fa-code"},
+                {"id": 2, "name": "Supporter", "icon": "fa-heart"},
+            ],
+        )
+
+        result = await BadgesRepository(mock_mysql).get_all()
+
+        assert result == [
+            BadgeData(id=1, name="Developer", icon="fa-code"),
+            BadgeData(id=2, name="Supporter", icon="fa-heart"),
+        ]
+
+    async def test_get_members_builds_members_from_rows(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Member rows should keep their user id, username and country."""
+        mock_mysql.set_result(
+            "INNER JOIN user_badges",
+            [{"user_id": 1000, "username": "Player", "country": "GB"}],
+        )
+
+        result = await BadgesRepository(mock_mysql).get_members(1)
+
+        assert [(m.user_id, m.username, m.country) for m in result] == [
+            (1000, "Player", "GB"),
+        ]
@@ -0,0 +1,225 @@
+"""Unit tests for the beatmaps repository."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from soumetsu_api.resources import beatmaps
+from soumetsu_api.resources.beatmaps import BeatmapsRepository
+from tests.conftest import MockMySQLAdapter
+
+
+def _beatmap_row(**overrides: Any) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "beatmap_id": 75,
+        "beatmapset_id": 1,
+        "beatmap_md5": "a5b99395a42bd55bc5eb1d2411cbdf8b",
+        "song_name": "Kenji Ninuma - DISCO PRINCE [Normal]",
+        "ar": 6.0,
+        "od": 6.0,
+        "mode": 0,
+        "difficulty_std": 2.4,
+        "difficulty_taiko": 0.0,
+        "difficulty_ctb": 0.0,
+        "difficulty_mania": 0.0,
+        "max_combo": 314,
+        "hit_length": 142,
+        "bpm": 120,
+        "playcount": 1000,
+        "passcount": 500,
+        "ranked": 2,
+        "updated_at": 1700000000,
+        "ranked_status_frozen": 1,
+        "mapper_id": 2,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture(autouse=True)
+def _clear_beatmap_caches() -> Iterator[None]:
+    beatmaps._beatmaps_by_id.clear()
+    beatmaps._beatmaps_by_md5.clear()
+    yield
+    beatmaps._beatmaps_by_id.clear()
+    beatmaps._beatmaps_by_md5.clear()
+
+
+class TestBeatmapsRepository:
+    """Tests for BeatmapsRepository row unpacking."""
+
+    async def test_find_by_id_converts_flags_to_bool(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """TINYINT flags should come back as real booleans."""
+        mock_mysql.set_result("FROM beatmaps WHERE beatmap_id", _beatmap_row())
+
+        result = await BeatmapsRepository(mock_mysql).find_by_id(75)
+
+        assert result is not None
+        assert result.ranked_status_frozen is True
+        assert result.song_name == "Kenji Ninuma - DISCO PRINCE [Normal]"
+
+    async def test_find_by_id_caches_for_md5_lookups(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """A beatmap found by id should be served from cache by either key."""
+        mock_mysql.set_result("FROM beatmaps WHERE beatmap_id", _beatmap_row())
+        repository = BeatmapsRepository(mock_mysql)
+
+        found = await repository.find_by_id(75)
+        mock_mysql.set_result("FROM beatmaps WHERE beatmap_id", None)
+
+        assert await repository.find_by_id(75) is found
+        assert await repository.find_by_md5(_beatmap_row()["beatmap_md5"]) is found
+
+    async def test_find_by_id_does_not_cache_misses(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """A beatmap added after a failed lookup should be found straight away."""
+        repository = BeatmapsRepository(mock_mysql)
+
+        assert await repository.find_by_id(75) is None
+
+        mock_mysql.set_result("FROM beatmaps WHERE beatmap_id", _beatmap_row())
+        assert await repository.find_by_id(75) is not None
+
+    async def test_list_beatmapset_keeps_every_row(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Each row of a set should become its own beatmap."""
+        mock_mysql.set_result(
+            "FROM beatmaps WHERE beatmapset_id",
+            [
+                _beatmap_row(ranked_status_frozen=0),
+                _beatmap_row(beatmap_id=76, ranked_status_frozen=0),
+            ],
+        )
+
+        result = await BeatmapsRepository(mock_mysql).list_beatmapset(1)
+
+        assert [b.beatmap_id for b in result] == [75, 76]
+        assert all(b.ranked_status_frozen is False for b in result)
+
+    async def test_is_beatmapset_ranked(self, mock_mysql: MockMySQLAdapter) -> None:
+        """A set should only count as ranked when every difficulty is."""
+        repository = BeatmapsRepository(mock_mysql)
+
+        mock_mysql.set_result("MIN(ranked IN (2, 3, 4, 5))", 1)
+        assert await repository.is_beatmapset_ranked(1) is True
+
+        mock_mysql.set_result("MIN(ranked IN (2, 3, 4, 5))", 0)
+        assert await repository.is_beatmapset_ranked(1) is False
+
+    async def test_is_beatmapset_ranked_missing_set(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """An unknown set has no statuses and is not ranked."""
+        mock_mysql.set_result("MIN(ranked IN (2, 3, 4, 5))", None)
+
+        assert await BeatmapsRepository(mock_mysql).is_beatmapset_ranked(1) is False
+
+    async def test_get_user_rank_requests_today(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """The count and oldest request time should come from one row."""
+        mock_mysql.set_result(
+            "MIN(time) AS oldest_time",
+            {"submitted": 2, "oldest_time": 1700000000},
+        )
+
+        result = await BeatmapsRepository(mock_mysql).get_user_rank_requests_today(1)
+
+        assert result == (2, 1700000000)
+
+
+class TestKeysetPagination:
+    """Tests for continuing playcount ordered listings from a cursor."""
+
+    async def test_search_continues_after_cursor(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """A cursor should replace the offset with a keyset condition."""
+        repository = BeatmapsRepository(mock_mysql)
+        await repository.search(mode=0, limit=50, offset=500, after=(1000, 75))
+
+        [(query, values)] = mock_mysql.queries
+        assert beatmaps._AFTER_CONDITION in query
+        assert values == {
+            "limit": 50,
+            "offset": 0,
+            "mode": 0,
+            "after_playcount": 1000,
+            "after_beatmap_id": 75,
+        }
+
+    async def test_list_popular_without_cursor_uses_offset(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Page based listings should keep working when no cursor is given."""
+        repository = BeatmapsRepository(mock_mysql)
+        await repository.list_popular(limit=50, offset=100)
+
+        [(query, values)] = mock_mysql.queries
+        assert beatmaps._AFTER_CONDITION not in query
+        assert values == {"limit": 50, "offset": 100}
+
+
+class TestListingQuery:
+    """Tests for the memoised listing SQL."""
+
+    def test_reuses_query_for_same_filters(self) -> None:
+        """The same filters should map to the same prebuilt query."""
+        query = beatmaps._search_query(0b0110)
+
+        assert query is beatmaps._search_query(0b0110)
+        assert "WHERE mode = :mode AND ranked = :status" in query
+
+    def test_unfiltered_search(self) -> None:
+        """A search without filters should still produce valid SQL."""
+        assert "WHERE 1=1" in beatmaps._search_query(0)
+
+    def test_popular_is_always_ranked(self) -> None:
+        """Popular listings should only include ranked beatmaps."""
+        query = beatmaps._popular_query(0b01)
+
+        assert "WHERE ranked IN (2, 3, 4, 5) AND mode = :mode" in query
+
+
+class TestMostPlayedQueries:
+    """Tests for the prebuilt most played SQL."""
+
+    def test_filters_missing_beatmaps_before_paginating(self) -> None:
+        """Scores without a beatmap row should not take up a place on the page."""
+        for query in beatmaps._MOST_PLAYED_QUERIES:
+            assert query.index("AND EXISTS") < query.index("LIMIT :limit")
+            assert "ORDER BY playcount DESC, s.beatmap_md5" in query
+
+
+class TestTodayStart:
+    """Tests for the _today_start helper."""
+
+    def test_rounds_down_to_midnight(self) -> None:
+        """Any time of day should map to that day's UTC midnight."""
+        midnight = 1700006400  # 2023-11-15 00:00:00 UTC
+
+        assert beatmaps._today_start(midnight) == midnight
+        assert beatmaps._today_start(midnight + 86399) == midnight
+
+    def test_defaults_to_current_time(self) -> None:
+        """Without an explicit time, the current day should be used."""
+        now = int(time.time())
+
+        assert now - 86400 < beatmaps._today_start() <= now
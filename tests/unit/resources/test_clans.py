@@ -0,0 +1,518 @@
+"""Unit tests for the clans repository."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from soumetsu_api.resources import clans
+from soumetsu_api.resources.clans import CLAN_PERM_OWNER
+from soumetsu_api.resources.clans import ClanData
+from soumetsu_api.resources.clans import ClansRepository
+from tests.conftest import MockMySQLAdapter
+from tests.conftest import MockRedisClient
+
+
+def _clan_row(**overrides: Any) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "id": 1,
+        "name": "Clan",
+        "description": "",
+        "tag": "CLN",
+        "member_limit": 16,
+        "perms": None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture(autouse=True)
+def _clear_clan_caches() -> Iterator[None]:
+    clans._clans_by_id.clear()
+    clans._all_member_stats.clear()
+    yield
+    clans._clans_by_id.clear()
+    clans._all_member_stats.clear()
+
+
+class TestGetWithUserPerms:
+    """Tests for ClansRepository.get_with_user_perms."""
+
+    async def test_returns_clan_and_perms(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Members should get the clan alongside their perms."""
+        mock_mysql.set_result("LEFT JOIN user_clans", _clan_row(perms=CLAN_PERM_OWNER))
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_with_user_perms(1, 1000)
+
+        assert result == (
+            ClanData(id=1, name="Clan", description="", tag="CLN", member_limit=16),
+            CLAN_PERM_OWNER,
+        )
+
+    async def test_non_member_has_no_perms(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Non-members should still get the clan, with perms of None."""
+        mock_mysql.set_result("LEFT JOIN user_clans", _clan_row())
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_with_user_perms(1, 1000)
+
+        assert result is not None
+        assert result[1] is None
+
+    async def test_missing_clan_is_none(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """An unknown clan should give None."""
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_with_user_perms(404, 1000)
+
+        assert result is None
+
+
+class TestClanCache:
+    """Tests for the shared clan lookup cache."""
+
+    async def test_get_by_id_is_cached(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Repeated lookups should not go back to MySQL."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+        repository = ClansRepository(mock_mysql, mock_redis)
+
+        clan = await repository.get_by_id(1)
+        mock_mysql.set_result("FROM clans WHERE id", None)
+
+        assert await repository.get_by_id(1) is clan
+
+    async def test_update_invalidates(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Updating a clan should drop its cached entry."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+        repository = ClansRepository(mock_mysql, mock_redis)
+
+        await repository.get_by_id(1)
+        await repository.update(1, tag="NEW")
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row(tag="NEW"))
+
+        clan = await repository.get_by_id(1)
+        assert clan is not None
+        assert clan.tag == "NEW"
+
+    async def test_delete_invalidates(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A deleted clan should no longer be served from cache."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+        repository = ClansRepository(mock_mysql, mock_redis)
+
+        await repository.get_by_id(1)
+        await repository.delete(1)
+        mock_mysql.set_result("FROM clans WHERE id", None)
+
+        assert await repository.get_by_id(1) is None
+
+    async def test_transaction_reads_skip_cache(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Reads inside a transaction should not fill the shared cache."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+
+        async with mock_mysql.transaction() as transaction:
+            repository = ClansRepository(transaction, mock_redis)
+            assert await repository.get_by_id(1) is not None
+
+        assert clans._clans_by_id.get(1) is None
+
+    async def test_transaction_update_invalidates_on_commit(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """An update inside a transaction should only drop the entry once it commits."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+        clan = await ClansRepository(mock_mysql, mock_redis).get_by_id(1)
+
+        async with mock_mysql.transaction() as transaction:
+            repository = ClansRepository(transaction, mock_redis)
+            await repository.update(1, tag="NEW")
+            assert clans._clans_by_id.get(1) is clan
+
+        assert clans._clans_by_id.get(1) is None
+
+    async def test_get_by_ids_only_fetches_misses(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Cached clans should be served without being queried again."""
+        mock_mysql.set_result("FROM clans WHERE id", _clan_row())
+        repository = ClansRepository(mock_mysql, mock_redis)
+        cached = await repository.get_by_id(1)
+
+        mock_mysql.set_result("FROM clans WHERE id", [_clan_row(id=2, tag="TWO")])
+        mock_mysql.queries.clear()
+        result = await repository.get_by_ids([1, 2, 3])
+
+        assert [values for _, values in mock_mysql.queries] == [{"id_0": 2, "id_1": 3}]
+        assert result[1] is cached
+        assert result[2].tag == "TWO"
+        assert 3 not in result
+
+
+class TestUpdateClanQuery:
+    """Tests for the memoised clan update SQL."""
+
+    def test_sets_only_masked_columns(self) -> None:
+        """Only the columns whose bits are set should be assigned."""
+        assert clans._update_clan_query(0b101) == (
+            "UPDATE clans SET name = :name, tag = :tag WHERE id = :clan_id"
+        )
+
+
+class TestNameOrTagExists:
+    """Tests for ClansRepository.name_or_tag_exists."""
+
+    async def test_reports_each_clash(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """The name and tag should be reported as taken independently."""
+        mock_mysql.set_result("AS tag_taken", {"name_taken": 0, "tag_taken": 1})
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.name_or_tag_exists("Clan", "CLN")
+
+        assert result == (False, True)
+
+    async def test_nothing_taken(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """No matching clans means neither is taken."""
+        mock_mysql.set_result("AS tag_taken", {"name_taken": 0, "tag_taken": 0})
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.name_or_tag_exists("Clan", "CLN")
+
+        assert result == (False, False)
+
+
+class TestExistenceChecks:
+    """Tests for the clan name existence check."""
+
+    async def test_name_exists(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A matching name should be reported as taken."""
+        mock_mysql.set_result("SELECT EXISTS(SELECT 1 FROM clans WHERE name", 1)
+
+        assert await ClansRepository(mock_mysql, mock_redis).name_exists("Clan") is True
+
+
+class TestGetClanTopScores:
+    """Tests for ClansRepository.get_clan_top_scores."""
+
+    async def test_converts_full_combo(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """The TINYINT full combo flag should come back as a bool."""
+        mock_mysql.set_result(
+            "INNER JOIN user_clans uc ON s.userid = uc.user",
+            [
+                {
+                    "id": 1,
+                    "player_id": 1000,
+                    "username": "Player",
+                    "score": 1_000_000,
+                    "max_combo": 314,
+                    "full_combo": 1,
+                    "mods": 0,
+                    "accuracy": 99.5,
+                    "pp": 120.0,
+                    "playback_rate": 1.0,
+                    "beatmap_id": 75,
+                    "beatmapset_id": 1,
+                    "song_name": "Kenji Ninuma - DISCO PRINCE [Normal]",
+                    "difficulty": 2.4,
+                    "ranked": 2,
+                },
+            ],
+        )
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        [score] = await repository.get_clan_top_scores(1, 0, 0)
+
+        assert score.full_combo is True
+        assert score.username == "Player"
+
+
+class TestGetMemberCounts:
+    """Tests for ClansRepository.get_member_counts."""
+
+    async def test_counts_by_clan(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Counts should be keyed by clan id."""
+        mock_mysql.set_result(
+            "COUNT(*) AS member_count",
+            [{"clan": 1, "member_count": 3}, {"clan": 2, "member_count": 1}],
+        )
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_member_counts([1, 2, 3])
+
+        assert result == {1: 3, 2: 1}
+
+    async def test_no_clans(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """An empty id list should not need a query."""
+        assert await ClansRepository(mock_mysql, mock_redis).get_member_counts([]) == {}
+
+
+class TestGetAllMemberCounts:
+    """Tests for ClansRepository.get_all_member_counts."""
+
+    async def test_grouped_without_ids(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Every clan should be counted by one grouped query without bound ids."""
+        mock_mysql.set_result(
+            "COUNT(*) AS member_count",
+            [{"clan": 1, "member_count": 3}, {"clan": 2, "member_count": 1}],
+        )
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_all_member_counts()
+
+        assert result == {1: 3, 2: 1}
+        [(query, params)] = mock_mysql.queries
+        assert "IN (" not in query
+        assert not params
+
+
+class TestMemberCountCache:
+    """Tests for the Redis cache in front of ClansRepository.get_member_count."""
+
+    async def test_count_is_cached(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A cached count should be served without touching MySQL."""
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 3)
+        repository = ClansRepository(mock_mysql, mock_redis)
+
+        assert await repository.get_member_count(1) == 3
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 4)
+
+        assert await repository.get_member_count(1) == 3
+
+    async def test_membership_changes_invalidate(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Adding or removing a member should drop the cached count."""
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 3)
+        repository = ClansRepository(mock_mysql, mock_redis)
+        await repository.get_member_count(1)
+
+        await repository.add_member(1, 1000)
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 4)
+        assert await repository.get_member_count(1) == 4
+
+        await repository.remove_member(1, 1000)
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 3)
+        assert await repository.get_member_count(1) == 3
+
+    async def test_transaction_counts_skip_redis(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Counts taken inside a transaction should come from MySQL, uncached."""
+        mock_redis.set_data(f"{clans.MEMBER_COUNT_KEY_PREFIX}1", 3)
+        mock_mysql.set_result("SELECT COUNT(*) FROM user_clans", 4)
+
+        async with mock_mysql.transaction() as transaction:
+            repository = ClansRepository(transaction, mock_redis)
+            assert await repository.get_member_count(1) == 4
+
+        assert await mock_redis.get(f"{clans.MEMBER_COUNT_KEY_PREFIX}1") == 3
+
+    async def test_transaction_invalidates_on_commit(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A join inside a transaction should only drop the count once it commits."""
+        key = f"{clans.MEMBER_COUNT_KEY_PREFIX}1"
+        mock_redis.set_data(key, 3)
+
+        async with mock_mysql.transaction() as transaction:
+            await ClansRepository(transaction, mock_redis).add_member(1, 1000)
+            assert await mock_redis.get(key) == 3
+
+        assert await mock_redis.get(key) is None
+
+
+class TestGetAllClanMemberStats:
+    """Tests for ClansRepository.get_all_clan_member_stats."""
+
+    async def test_groups_by_clan(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Rows should be grouped by clan, keeping their order within each clan."""
+        stats = {
+            "name": "Clan",
+            "description": "",
+            "tag": "CLN",
+            "member_limit": 16,
+            "ranked_score": 0,
+            "total_score": 0,
+            "playcount": 0,
+            "replays_watched": 0,
+            "total_hits": 0,
+        }
+        mock_mysql.set_result(
+            "ORDER BY uc.clan",
+            [
+                {"clan": 1, "pp": 300, **stats},
+                {"clan": 1, "pp": 200, **stats},
+                {"clan": 2, "pp": 100, **stats},
+            ],
+        )
+
+        repository = ClansRepository(mock_mysql, mock_redis)
+        result = await repository.get_all_clan_member_stats(0, 0)
+
+        assert list(result) == [1, 2]
+        assert result[1].clan.id == 1
+        assert result[1].clan.tag == "CLN"
+        assert [m.pp for m in result[1].members] == [300, 200]
+        assert [m.pp for m in result[2].members] == [100]
+
+    async def test_cached_until_membership_changes(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """Stats should be shared until a member joins or leaves."""
+        stats = {
+            "name": "Clan",
+            "description": "",
+            "tag": "CLN",
+            "member_limit": 16,
+            "pp": 100,
+            "ranked_score": 0,
+            "total_score": 0,
+            "playcount": 0,
+            "replays_watched": 0,
+            "total_hits": 0,
+        }
+        mock_mysql.set_result("ORDER BY uc.clan", [{"clan": 1, **stats}])
+        repository = ClansRepository(mock_mysql, mock_redis)
+        await repository.get_all_clan_member_stats(0, 0)
+
+        mock_mysql.set_result("ORDER BY uc.clan", [{"clan": 2, **stats}])
+        assert list(await repository.get_all_clan_member_stats(0, 0)) == [1]
+
+        await repository.remove_member(1, 1000)
+        assert list(await repository.get_all_clan_member_stats(0, 0)) == [2]
+
+    async def test_transaction_clears_on_commit(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A leave inside a transaction should only drop the stats once it commits."""
+        mock_mysql.set_result("ORDER BY uc.clan", [])
+        await ClansRepository(mock_mysql, mock_redis).get_all_clan_member_stats(0, 0)
+
+        async with mock_mysql.transaction() as transaction:
+            await ClansRepository(transaction, mock_redis).remove_member(1, 1000)
+            assert clans._all_member_stats.get((0, 0)) == {}
+
+        assert clans._all_member_stats.get((0, 0)) is None
+
+
+class TestSearch:
+    """Tests for ClansRepository.search."""
+
+    async def test_matches_escaped_prefix(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """The query should be matched as a literal name prefix."""
+        repository = ClansRepository(mock_mysql, mock_redis)
+        await repository.search("100%_", limit=10, offset=0)
+
+        [(_, values)] = mock_mysql.queries
+        assert values == {"query": "100\\%\\_%", "limit": 10, "offset": 0}
+
+
+class TestStatsQueries:
+    """Tests for the prebuilt clan stats SQL."""
+
+    def test_built_for_every_mode(self) -> None:
+        """Each stats table and mode should have its own query."""
+        assert len(clans._MEMBER_STATS_QUERIES) == 12
+        assert "pp_taiko" in clans._MEMBER_STATS_QUERIES[0, 1]
+        assert "rx_stats" in clans._MEMBER_STATS_QUERIES[1, 0]
+
+
+class TestAddMemberWithAtomicLimit:
+    """Tests for ClansRepository.add_member_with_atomic_limit."""
+
+    async def test_locks_clan_before_inserting(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """The clan row should be locked before the member count is checked."""
+        mock_mysql.set_result("FOR UPDATE", 1)
+        mock_mysql.set_execute_result("INSERT INTO user_clans", 1)
+        repository = ClansRepository(mock_mysql, mock_redis)
+
+        assert await repository.add_member_with_atomic_limit(1, 1000, 16) is True
+        [(lock, _), (insert, _)] = mock_mysql.queries
+        assert lock.endswith("FOR UPDATE")
+        assert "INSERT INTO user_clans" in insert
@@ -0,0 +1,71 @@
+"""Unit tests for the friends repository."""
+
+from __future__ import annotations
+
+from soumetsu_api.resources.friends import FriendData
+from soumetsu_api.resources.friends import FriendsRepository
+from tests.conftest import MockMySQLAdapter
+
+
+class TestFriendsRepository:
+    """Tests for FriendsRepository row materialisation."""
+
+    async def test_get_friends_builds_friends_from_rows(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Rows should be turned into FriendData without losing fields."""
+        mock_mysql.set_result(
+            "INNER JOIN users u ON r.user2",
+            [{"user_id": 1000, "username": "Player", "country": "GB"}],
+        )
+
+        result = await FriendsRepository(mock_mysql).get_friends(1)
+
+        assert result == [FriendData(user_id=1000, username="Player", country="GB")]
+
+    async def test_selects_every_field(self, mock_mysql: MockMySQLAdapter) -> None:
+        """The listing queries should select a column for every model field."""
+        repository = FriendsRepository(mock_mysql)
+        await repository.get_friends(1)
+        await repository.get_followers(1)
+
+        for query, _ in mock_mysql.queries:
+            for field in FriendData.model_fields:
+                assert field in query
+
+    async def test_get_counts(self, mock_mysql: MockMySQLAdapter) -> None:
+        """Follower and friend counts should come back in that order."""
+        mock_mysql.set_result(
+            "AS friend_count",
+            {"follower_count": 4, "friend_count": 2},
+        )
+
+        assert await FriendsRepository(mock_mysql).get_counts(1) == (4, 2)
+
+    async def test_get_mutual_ids(self, mock_mysql: MockMySQLAdapter) -> None:
+        """Only friends who added the user back should be returned."""
+        mock_mysql.set_result("SELECT user1 FROM", [{"user1": 2}])
+
+        repository = FriendsRepository(mock_mysql)
+
+        assert await repository.get_mutual_ids(1, [2, 3]) == {2}
+        assert await repository.get_mutual_ids(1, []) == set()
+
+    async def test_get_friends_after_cursor(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """A cursor should continue after it rather than skipping by offset."""
+        repository = FriendsRepository(mock_mysql)
+        await repository.get_friends(1, limit=10, offset=20, after=("Player", 1000))
+
+        [(query, values)] = mock_mysql.queries
+        assert ":after_username" in query
+        assert values == {
+            "user_id": 1,
+            "limit": 10,
+            "offset": 0,
+            "after_username": "Player",
+            "after_user_id": 1000,
+        }
@@ -0,0 +1,119 @@
+"""Unit tests for the leaderboard repository."""
+
+from __future__ import annotations
+
+from soumetsu_api.resources.leaderboard import LeaderboardRepository
+from tests.conftest import MockMySQLAdapter
+from tests.conftest import MockRedisClient
+
+
+class TestGetCountry:
+    """Tests for country leaderboard pages."""
+
+    async def test_country_rank_follows_page_position(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Country ranks should come from the page, skipping ids without a row.
+        The page's ids should be bound rather than inlined."""
+
+        class _RankedRedis(MockRedisClient):
+            async def zrevrange(self, key: str, start: int, end: int) -> list[str]:
+                return ["2", "3", "1"]
+
+            def pipeline(self, transaction: bool = True) -> object:
+                raise AssertionError("country pages should not look up ranks")
+
+        mock_mysql.set_result(
+            "WHERE s.id IN",
+            [
+                {
+                    "id": uid,
+                    "username": f"Player{uid}",
+                    "country": "GB",
+                    "privileges": 3,
+                    "pp": 100,
+                    "accuracy": 99.0,
+                    "playcount": 10,
+                    "total_score": 0,
+                }
+                for uid in (2, 1)
+            ],
+        )
+
+        repository = LeaderboardRepository(mock_mysql, _RankedRedis())
+        entries = await repository.get_country("GB", 0, 0, limit=3, offset=10)
+
+        assert [(entry.id, entry.country_rank) for entry in entries] == [
+            (2, 11),
+            (1, 13),
+        ]
+
+        [(query, values)] = mock_mysql.queries
+        assert "ORDER BY FIELD(s.id, :id_0, :id_1, :id_2)" in query
+        assert values == {"id_0": 2, "id_1": 3, "id_2": 1}
+
+
+class _FakePipeline:
+    def __init__(self, results: list[int]) -> None:
+        self._results = results
+
+    def zcount(self, key: str, low: str, high: str) -> None:
+        pass
+
+    def zcard(self, key: str) -> None:
+        pass
+
+    async def execute(self) -> list[int]:
+        return self._results
+
+
+class TestGetRankForPP:
+    """Tests for ranking a pp value."""
+
+    async def test_counts_from_redis(self, mock_mysql: MockMySQLAdapter) -> None:
+        """A built leaderboard should answer from Redis alone."""
+
+        class _CountingRedis(MockRedisClient):
+            def pipeline(self, transaction: bool = True) -> _FakePipeline:
+                return _FakePipeline([41, 1000])
+
+        repository = LeaderboardRepository(mock_mysql, _CountingRedis())
+
+        assert await repository.get_rank_for_pp(500, 0, 0) == 42
+
+    async def test_falls_back_to_mysql(self, mock_mysql: MockMySQLAdapter) -> None:
+        """An empty leaderboard should be counted from the stats table."""
+
+        class _EmptyRedis(MockRedisClient):
+            def pipeline(self, transaction: bool = True) -> _FakePipeline:
+                return _FakePipeline([0, 0])
+
+        mock_mysql.set_result("WHERE s.pp_std > :pp", 9)
+        repository = LeaderboardRepository(mock_mysql, _EmptyRedis())
+
+        assert await repository.get_rank_for_pp(500, 0, 0) == 10
+
+
+class TestListOldestFirsts:
+    """Tests for listing the oldest first places."""
+
+    async def test_after_cursor(
+        self,
+        mock_mysql: MockMySQLAdapter,
+        mock_redis: MockRedisClient,
+    ) -> None:
+        """A cursor should continue after it rather than skipping by offset."""
+        repository = LeaderboardRepository(mock_mysql, mock_redis)
+        await repository.list_oldest_firsts(0, 0, limit=10, offset=20, after=(5, 7))
+
+        [(query, values)] = mock_mysql.queries
+        assert ":after_timestamp" in query
+        assert values == {
+            "mode": 0,
+            "relax": 0,
+            "limit": 10,
+            "offset": 0,
+            "after_timestamp": 5,
+            "after_score_id": 7,
+        }
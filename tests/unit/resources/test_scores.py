@@ -0,0 +1,108 @@
+"""Unit tests for the scores repository."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from soumetsu_api.resources.scores import ScorePlayer
+from soumetsu_api.resources.scores import ScoresRepository
+from tests.conftest import MockMySQLAdapter
+
+
+def _score_row(**overrides: Any) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "id": 1,
+        "beatmap_md5": "a" * 32,
+        "player_id": 1000,
+        "score": 1000000,
+        "max_combo": 500,
+        "full_combo": 1,
+        "mods": 0,
+        "count_300": 400,
+        "count_100": 10,
+        "count_50": 0,
+        "count_katus": 5,
+        "count_gekis": 50,
+        "count_misses": 0,
+        "submitted_at": 1700000000,
+        "play_mode": 0,
+        "completed": 3,
+        "accuracy": 98.5,
+        "pp": 250.0,
+        "playtime": 120,
+        "playback_rate": 1.0,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestScoresRepository:
+    """Tests for ScoresRepository row materialisation."""
+
+    async def test_list_player_best_coerces_full_combo(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """The TINYINT full combo flag should come back as a bool."""
+        mock_mysql.set_result(
+            "ORDER BY s.pp DESC",
+            [
+                _score_row(
+                    beatmap_id=1,
+                    beatmapset_id=1,
+                    song_name="Song",
+                    difficulty=5.5,
+                    ranked=2,
+                ),
+            ],
+        )
+
+        [score] = await ScoresRepository(mock_mysql).list_player_best(1000, 0, 0)
+
+        assert score.full_combo is True
+
+    async def test_list_beatmap_scores_nests_player(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """Each score should carry the player it was set by."""
+        mock_mysql.set_result(
+            "WHERE s.beatmap_md5",
+            [_score_row(player_db_id=1000, username="Player", country="GB")],
+        )
+
+        repository = ScoresRepository(mock_mysql)
+        [score] = await repository.list_beatmap_scores("a" * 32, 0, 0)
+
+        assert score.player == ScorePlayer(
+            player_id=1000,
+            username="Player",
+            country="GB",
+        )
+        assert score.full_combo is True
+
+    async def test_list_beatmap_scores_after_cursor(
+        self,
+        mock_mysql: MockMySQLAdapter,
+    ) -> None:
+        """A cursor should continue after it rather than skipping by offset."""
+        repository = ScoresRepository(mock_mysql)
+        await repository.list_beatmap_scores(
+            "a" * 32,
+            0,
+            0,
+            limit=10,
+            offset=20,
+            after=(250.0, 1),
+        )
+
+        [(query, values)] = mock_mysql.queries
+        assert ":after_pp" in query
+        assert values == {
+            "beatmap_md5": "a" * 32,
+            "mode": 0,
+            "limit": 10,
+            "offset": 0,
+            "after_pp": 250.0,
+            "after_score_id": 1,
+        }
@@ -0,0 +1,104 @@
+"""Unit tests for the users repository."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from soumetsu_api.resources import users
+from tests.conftest import MockMySQLAdapter
+
+
+def _profile_row(**overrides: Any) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "id": 1000,
+        "username": "Player",
+        "username_safe": "player",
+        "privileges": 3,
+        "country": "GB",
+        "registered_at": 1600000000,
+        "latest_activity": 1700000000,
+        "coins": 0,
+        "clan_id": None,
+        "clan_name": None,
+        "clan_tag": None,
+        "discord_id": None,
+        "discord_username": None,
+        "discord_avatar": None,
+        "stats_id": 1000,
+        "pp": 1234,
+        "accuracy": 98.5,
+        "playcount": 100,
+        "total_score": 5000000,
+        "ranked_score": 4000000,
+        "total_hits": 20000,
+        "playtime": 3600,
+        "max_combo": 800,
+        "replays_watched": 3,
+        "level": 42,
+        "first_places": 7,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestProfileQueries:
+    """Tests for the precomputed profile queries."""
+
+    def test_query_exists_for_every_table_and_mode(self) -> None:
+        """A profile query should be built for every table and mode pair."""
+        assert len(users._PROFILE_QUERIES) == 12
+
+    def test_query_targets_table_and_suffix(self) -> None:
+        """The query should read the mode's columns from the right table."""
+        query = users._PROFILE_QUERIES[1, 2]
+
+        assert "LEFT JOIN rx_stats s" in query
+        assert "s.pp_ctb AS pp" in query
+        assert "fp.mode = 2" in query
+        assert "fp.relax = 1" in query
+
+
+class TestGetProfile:
+    """Tests for UserRepository.get_profile."""
+
+    async def test_splits_row_into_parts(self, mock_mysql: MockMySQLAdapter) -> None:
+        """The joined row should be split into user, clan, discord and stats."""
+        mock_mysql.set_result(
+            "LEFT JOIN user_clans uc",
+            _profile_row(
+                clan_id=5,
+                clan_name="Clan",
+                clan_tag="CLN",
+                discord_id="123",
+                discord_username="player",
+                discord_avatar="abc",
+            ),
+        )
+
+        result = await users.UserRepository(mock_mysql).get_profile(1000, 0, 0)
+
+        assert result is not None
+        assert result.user.username == "Player"
+        assert result.clan == users.ClanInfo(id=5, name="Clan", tag="CLN")
+        assert result.discord is not None
+        assert result.discord.discord_id == "123"
+        assert result.stats is not None
+        assert result.stats.pp == 1234
+        assert result.first_places == 7
+
+    async def test_missing_joins_are_none(self, mock_mysql: MockMySQLAdapter) -> None:
+        """Users without a clan, Discord link or stats row should get None."""
+        mock_mysql.set_result("LEFT JOIN user_clans uc", _profile_row(stats_id=None))
+
+        result = await users.UserRepository(mock_mysql).get_profile(1000, 0, 0)
+
+        assert result is not None
+        assert result.clan is None
+        assert result.discord is None
+        assert result.stats is None
+
+    async def test_missing_user_is_none(self, mock_mysql: MockMySQLAdapter) -> None:
+        """An unknown user should give None."""
+        result = await users.UserRepository(mock_mysql).get_profile(1, 0, 0)
+
+        assert result is None
@@ -0,0 +1,83 @@
+"""Unit tests for the achievements service."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from soumetsu_api.services import achievements
+from soumetsu_api.utilities.privileges import UserPrivileges
+from tests.conftest import MockContext
+
+_USER_ROW = {
+    "id": 1000,
+    "username": "Player",
+    "username_safe": "player",
+    "privileges": int(UserPrivileges.NORMAL),
+    "country": "GB",
+    "registered_at": 0,
+    "latest_activity": 0,
+    "coins": 0,
+}
+
+
+def _catalogue_row(achievement_id: int) -> dict[str, object]:
+    return {
+        "id": achievement_id,
+        "name": f"Achievement {achievement_id}",
+        "description": "",
+        "file": f"achievement-{achievement_id}",
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clear_catalogue_cache() -> Iterator[None]:
+    achievements._catalogue_cache.clear()
+    yield
+    achievements._catalogue_cache.clear()
+
+
+class TestGetUserAchievements:
+    """Tests for the get_user_achievements service function."""
+
+    async def test_merges_user_progress_into_catalogue(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """Every catalogue entry should be returned with the user's progress."""
+        mock_context._mysql.set_result("FROM users WHERE id", _USER_ROW)
+        mock_context._mysql.set_result(
+            "FROM ussr_achievements",
+            [_catalogue_row(1), _catalogue_row(2)],
+        )
+        mock_context._mysql.set_result(
+            "FROM users_achievements",
+            [{"achievement_id": 2, "time": 1700000000}],
+        )
+
+        result = await achievements.get_user_achievements(mock_context, 1000)
+
+        assert isinstance(result, list)
+        assert [(a.id, a.achieved, a.achieved_at) for a in result] == [
+            (1, False, None),
+            (2, True, 1700000000),
+        ]
+
+    async def test_reuses_cached_catalogue(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """The catalogue should only be loaded once while it is cached."""
+        mock_context._mysql.set_result("FROM users WHERE id", _USER_ROW)
+        mock_context._mysql.set_result("FROM ussr_achievements", [_catalogue_row(1)])
+
+        await achievements.get_user_achievements(mock_context, 1000)
+        mock_context._mysql.set_result(
+            "FROM ussr_achievements",
+            [_catalogue_row(1), _catalogue_row(2)],
+        )
+        result = await achievements.get_user_achievements(mock_context, 1000)
+
+        assert isinstance(result, list)
+        assert [a.id for a in result] == [1]
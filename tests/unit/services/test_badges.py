@@ -0,0 +1,46 @@
+"""Unit tests for the badges service."""
+
+from __future__ import annotations
+
+from soumetsu_api.services import badges
+from tests.conftest import MockContext
+
+
+class TestGetBadgeMembers:
+    """Tests for the get_badge_members service function."""
+
+    async def test_returns_members(self, mock_context: MockContext) -> None:
+        """Members of an existing badge should be returned."""
+        mock_context._mysql.set_result(
+            "INNER JOIN user_badges",
+            [{"user_id": 1000, "username": "Player", "country": "GB"}],
+        )
+
+        result = await badges.get_badge_members(mock_context, 1)
+
+        assert result == [
+            badges.BadgeMemberResult(user_id=1000, username="Player", country="GB"),
+        ]
+
+    async def test_missing_badge_is_not_found(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """An unknown badge should still be reported as not found."""
+        result = await badges.get_badge_members(mock_context, 404)
+
+        assert result is badges.BadgeError.BADGE_NOT_FOUND
+
+    async def test_badge_without_members_is_empty(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """An existing badge with no members should give an empty list."""
+        mock_context._mysql.set_result(
+            "FROM badges WHERE id",
+            {"id": 1, "name": "Developer", "icon": "fa-code"},
+        )
+
+        result = await badges.get_badge_members(mock_context, 1)
+
+        assert result == []
@@ -0,0 +1,89 @@
+"""Unit tests for the clans service."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from soumetsu_api.resources import clans as clans_resource
+from soumetsu_api.resources.clans import CLAN_PERM_OWNER
+from soumetsu_api.services import clans
+from tests.conftest import MockContext
+
+
+@pytest.fixture(autouse=True)
+def _clear_clan_caches() -> Iterator[None]:
+    clans_resource._all_member_stats.clear()
+    yield
+    clans_resource._all_member_stats.clear()
+
+
+class TestUpdateClan:
+    """Tests for the update_clan service function."""
+
+    async def test_returns_updated_clan(self, mock_context: MockContext) -> None:
+        """The result should reflect the update without reading the clan back."""
+        mock_context._mysql.set_result(
+            "LEFT JOIN user_clans",
+            {
+                "id": 1,
+                "name": "Clan",
+                "description": "Old",
+                "tag": "CLN",
+                "member_limit": 16,
+                "perms": CLAN_PERM_OWNER,
+            },
+        )
+        mock_context._mysql.set_result("SELECT COUNT(*) FROM user_clans", 3)
+
+        result = await clans.update_clan(mock_context, 1000, 1, description="New")
+
+        assert result == clans.ClanResult(
+            id=1,
+            name="Clan",
+            description="New",
+            tag="CLN",
+            member_limit=16,
+            member_count=3,
+        )
+
+
+class TestGetClanLeaderboard:
+    """Tests for the get_clan_leaderboard service function."""
+
+    async def test_reads_clans_with_their_stats(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """Clans should come with their stats, and counts from one grouped query."""
+        stats = {
+            "description": "",
+            "member_limit": 16,
+            "ranked_score": 10,
+            "total_score": 20,
+            "playcount": 1,
+            "replays_watched": 0,
+            "total_hits": 0,
+        }
+        mock_context._mysql.set_result(
+            "ORDER BY uc.clan",
+            [
+                {"clan": 1, "name": "Low", "tag": "LOW", "pp": 100, **stats},
+                {"clan": 2, "name": "High", "tag": "HI", "pp": 500, **stats},
+            ],
+        )
+        mock_context._mysql.set_result(
+            "COUNT(*) AS member_count",
+            [{"clan": 1, "member_count": 4}, {"clan": 2, "member_count": 2}],
+        )
+
+        result = await clans.get_clan_leaderboard(mock_context)
+
+        assert isinstance(result, list)
+        assert [(e.id, e.name, e.rank, e.member_count) for e in result] == [
+            (2, "High", 1, 2),
+            (1, "Low", 2, 4),
+        ]
+        assert len(mock_context._mysql.queries) == 2
+        assert all("IN (" not in query for query, _ in mock_context._mysql.queries)
@@ -9,6 +9,7 @@ from fastapi import status
 from soumetsu_api.services._common import ServiceError
 from soumetsu_api.services._common import is_error
 from soumetsu_api.services._common import is_success
+from tests.conftest import MockContext
 
 
 class ExampleError(ServiceError):
@@ -102,3 +103,34 @@ class TestIsError:
         result: ExampleError.OnSuccess[None] = None
 
         assert is_error(result) is False
+
+
+class TestAbstractContext:
+    """Tests for the repositories exposed by a context."""
+
+    def test_repositories_are_reused(self, mock_context: MockContext) -> None:
+        """A context should build each repository once and hand back the same one."""
+        assert mock_context.users is mock_context.users
+        assert mock_context.clans is mock_context.clans
+
+    def test_repositories_are_per_context(self, mock_context: MockContext) -> None:
+        """Repositories should not be shared between contexts."""
+        assert MockContext().users is not mock_context.users
+
+
+class TestContextAfterCommit:
+    """Tests for deferring work until a context's writes commit."""
+
+    async def test_runs_immediately_without_transaction(
+        self,
+        mock_context: MockContext,
+    ) -> None:
+        """A context without a transaction has nothing to wait for."""
+        ran: list[int] = []
+
+        async def _callback() -> None:
+            ran.append(1)
+
+        await mock_context.after_commit(_callback)
+
+        assert ran == [1]
@@ -0,0 +1,42 @@
+"""Unit tests for shared constants and lookups."""
+
+from __future__ import annotations
+
+import pytest
+
+from soumetsu_api import constants
+from soumetsu_api.constants import CustomMode
+from soumetsu_api.constants import GameMode
+
+
+class TestModeLookups:
+    """Tests for mode validity checks and table/suffix lookups."""
+
+    @pytest.mark.parametrize("mode", list(GameMode))
+    def test_valid_modes(self, mode: GameMode) -> None:
+        """Every GameMode should be valid, as an enum or a plain int."""
+        assert constants.is_valid_mode(mode)
+        assert constants.is_valid_mode(int(mode))
+
+    @pytest.mark.parametrize("mode", [-1, 4, 100])
+    def test_invalid_modes(self, mode: int) -> None:
+        """Values outside GameMode should be rejected."""
+        assert not constants.is_valid_mode(mode)
+
+    @pytest.mark.parametrize("custom_mode", [-1, 3])
+    def test_invalid_custom_modes(self, custom_mode: int) -> None:
+        """Values outside CustomMode should be rejected."""
+        assert not constants.is_valid_custom_mode(custom_mode)
+
+    def test_mode_suffixes(self) -> None:
+        """Suffixes should be indexed by GameMode."""
+        assert constants.get_mode_suffix(GameMode.STD) == "std"
+        assert constants.get_mode_suffix(GameMode.TAIKO) == "taiko"
+        assert constants.get_mode_suffix(GameMode.CTB) == "ctb"
+        assert constants.get_mode_suffix(GameMode.MANIA) == "mania"
+
+    def test_stats_tables(self) -> None:
+        """Stats tables should be indexed by CustomMode."""
+        assert constants.get_stats_table(CustomMode.VANILLA) == "users_stats"
+        assert constants.get_stats_table(CustomMode.RELAX) == "rx_stats"
+        assert constants.get_stats_table(CustomMode.AUTOPILOT) == "ap_stats"
@@ -0,0 +1,100 @@
+"""Unit tests for the async TTL cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from soumetsu_api.utilities.cache import AsyncTTLCache
+
+
+class TestAsyncTTLCache:
+    """Tests for AsyncTTLCache."""
+
+    async def test_get_or_load_caches_value(self) -> None:
+        """Loader should only run once while the entry is fresh."""
+        cache = AsyncTTLCache[str, int](ttl=60)
+        loader = mock.AsyncMock(return_value=1)
+
+        first = await cache.get_or_load("key", loader)
+        second = await cache.get_or_load("key", loader)
+
+        assert first == second == 1
+        loader.assert_awaited_once()
+
+    async def test_expired_entry_is_reloaded(self) -> None:
+        """Loader should run again once the entry has expired."""
+        cache = AsyncTTLCache[str, int](ttl=10)
+        loader = mock.AsyncMock(side_effect=[1, 2])
+
+        with mock.patch.object(time, "monotonic", return_value=100.0):
+            assert await cache.get_or_load("key", loader) == 1
+
+        with mock.patch.object(time, "monotonic", return_value=111.0):
+            assert await cache.get_or_load("key", loader) == 2
+
+    async def test_concurrent_misses_are_coalesced(self) -> None:
+        """Concurrent callers for the same key should share one load."""
+        cache = AsyncTTLCache[str, int](ttl=60)
+        calls = 0
+
+        async def loader() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("key", loader) for _ in range(5)),
+        )
+
+        assert results == [1, 1, 1, 1, 1]
+        assert calls == 1
+
+    async def test_loader_errors_are_not_cached(self) -> None:
+        """A failing loader should not leave an entry behind."""
+        cache = AsyncTTLCache[str, int](ttl=60)
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("key", mock.AsyncMock(side_effect=RuntimeError))
+
+        assert cache.get("key") is None
+        assert await cache.get_or_load("key", mock.AsyncMock(return_value=3)) == 3
+
+    def test_oldest_entry_is_evicted_when_full(self) -> None:
+        """The least recently used entry should be evicted past max_size."""
+        cache = AsyncTTLCache[str, int](ttl=60, max_size=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_invalidate_removes_entry(self) -> None:
+        """invalidate should drop a single entry."""
+        cache = AsyncTTLCache[str, int](ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_clear_removes_all_entries(self) -> None:
+        """clear should drop every entry."""
+        cache = AsyncTTLCache[str, int](ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
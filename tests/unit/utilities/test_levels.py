@@ -0,0 +1,31 @@
+"""Unit tests for level utilities."""
+
+from __future__ import annotations
+
+from soumetsu_api.utilities.levels import _LEVEL_THRESHOLDS
+from soumetsu_api.utilities.levels import calculate_level
+
+
+class TestCalculateLevel:
+    """Tests for the score to level conversion."""
+
+    def test_no_score_is_level_one(self) -> None:
+        """Scores of zero or below should stay at level one."""
+        assert calculate_level(0) == 1.0
+        assert calculate_level(-5) == 1.0
+
+    def test_thresholds_start_a_level(self) -> None:
+        """Reaching a threshold exactly should land on the level it unlocks."""
+        assert calculate_level(int(_LEVEL_THRESHOLDS[0])) == 2.0
+        assert calculate_level(int(_LEVEL_THRESHOLDS[9])) == 11.0
+
+    def test_progress_is_interpolated(self) -> None:
+        """Scores between thresholds should carry fractional progress."""
+        previous, required = _LEVEL_THRESHOLDS[9], _LEVEL_THRESHOLDS[10]
+        midpoint = int((previous + required) // 2)
+
+        assert 11.0 < calculate_level(midpoint) < 12.0
+
+    def test_last_threshold(self) -> None:
+        """The final threshold should map to the level one past the cap."""
+        assert calculate_level(int(_LEVEL_THRESHOLDS[-1])) == 121.0